@@ -0,0 +1,135 @@
+"""Allocation strategy benchmark: utilization, rejections and decision latency.
+
+Every lot strategy replays the same seeded arrival/departure stream (cars,
+motorcycles, trucks and EVs) against a fresh lot. The report shows mean
+occupancy, rejected arrivals, mean distance to the entrance of each park, and
+p50/p99 latency of one allocate call. Level strategies are then compared on
+a multi-level Garage by latency and by how evenly the levels fill.
+
+Usage:
+    python scripts/bench_allocation_strategies.py [--slots 10000] [--events 200000] [--levels 5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.redesign.factories.vehicle_factory import create_electric, create_vehicle  # noqa: E402
+from src.redesign.models.garage import Garage  # noqa: E402
+from src.redesign.models.parking_lot import ParkingLot  # noqa: E402
+from src.redesign.models.vehicle import Vehicle  # noqa: E402
+from src.redesign.strategies.registry import create_level_strategy, create_strategy  # noqa: E402
+
+LOT_STRATEGIES = ("by_type", "ev_spillover", "nearest_entrance", "motorcycle_packing")
+
+
+def arrival(rng: random.Random, i: int) -> Vehicle:
+    r = rng.random()
+    reg = f"V{i}"
+    if r < 0.15:
+        return create_electric("car", reg, "Tesla", "Model 3", "White")
+    if r < 0.35:
+        return create_vehicle("motorcycle", reg, "Honda", "CBR", "Red")
+    if r < 0.45:
+        return create_vehicle("truck", reg, "Ford", "F-150", "Black")
+    return create_vehicle("car", reg, "Toyota", "Corolla", "Blue")
+
+
+def percentile(values: List[int], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))] / 1e3
+
+
+def run_lot(name: str, regular: int, ev: int, events: int, seed: int) -> Tuple[float, int, float, List[int]]:
+    entrance = regular // 2
+    kwargs: Dict[str, object] = {}
+    if name in ("nearest_entrance", "motorcycle_packing"):
+        # motorcycle_packing marks the fifth of the row furthest from the entrance as compact bays
+        kwargs = {"entrance": entrance}
+    strategy = create_strategy(name, **kwargs)
+    lot = ParkingLot(level=1, regular_capacity=regular, ev_capacity=ev)
+    rng = random.Random(seed)
+    parked: List[str] = []
+    latencies: List[int] = []
+    rejected = 0
+    occupancy = 0
+    distance = 0
+    capacity = regular + ev
+    for i in range(events):
+        # Arrivals outpace departures, so the lot saturates and strategies differ in what they reject
+        if not parked or rng.random() < 0.6:
+            vehicle = arrival(rng, i)
+            start = time.perf_counter_ns()
+            slot = strategy.allocate(lot, vehicle)
+            latencies.append(time.perf_counter_ns() - start)
+            if slot is None:
+                rejected += 1
+            else:
+                parked.append(vehicle.registration_number)
+                distance += abs(slot - entrance)
+        else:
+            reg = parked.pop(rng.randrange(len(parked)))
+            is_ev, slot = lot.find_by_registration(reg)  # type: ignore[misc]
+            lot.leave(slot, is_ev)
+        occupancy += capacity - lot.free_regular_count() - lot.free_ev_count()
+    parks = len(latencies) - rejected
+    return occupancy / events / capacity, rejected, distance / max(1, parks), latencies
+
+
+def run_garage(name: str, levels: int, slots: int, events: int, seed: int) -> Tuple[float, List[int]]:
+    garage = Garage()
+    for level in range(1, levels + 1):
+        garage.add_level(level, slots, 0)
+    strategy = create_level_strategy(name)
+    rng = random.Random(seed)
+    parked: List[str] = []
+    latencies: List[int] = []
+    spread = 0
+    for i in range(events):
+        # Hold the garage around half full, where level choice matters most
+        if len(parked) < levels * slots // 2 or rng.random() < 0.5:
+            vehicle = create_vehicle("car", f"G{i}", "Toyota", "Corolla", "Blue")
+            start = time.perf_counter_ns()
+            placed = strategy.allocate(garage, vehicle, False)
+            latencies.append(time.perf_counter_ns() - start)
+            if placed is not None:
+                parked.append(vehicle.registration_number)
+        elif parked:
+            reg = parked.pop(rng.randrange(len(parked)))
+            level, _, slot = garage.find_by_registration(reg)  # type: ignore[misc]
+            garage.leave(level, slot, False)
+        free = [garage.free_regular_count(level) for level in garage.levels]
+        spread += max(free) - min(free)
+    return spread / events, latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slots", type=int, default=10000, help="regular slots per lot (EV pool is 10%%)")
+    parser.add_argument("--events", type=int, default=200000)
+    parser.add_argument("--levels", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"lot: {args.slots:,} regular + {args.slots // 10:,} EV slots, {args.events:,} events")
+    print(f"  {'strategy':<20} {'occupancy':>9} {'rejected':>9} {'distance':>9} {'p50 us':>7} {'p99 us':>7}")
+    for name in LOT_STRATEGIES:
+        occupancy, rejected, distance, latencies = run_lot(name, args.slots, args.slots // 10, args.events, args.seed)
+        print(f"  {name:<20} {occupancy:>8.1%} {rejected:>9,} {distance:>9.0f} "
+              f"{percentile(latencies, 0.5):>7.2f} {percentile(latencies, 0.99):>7.2f}")
+
+    per_level = args.slots // args.levels
+    print(f"garage: {args.levels} levels x {per_level:,} slots, {args.events:,} events")
+    print(f"  {'strategy':<20} {'mean free spread':>16} {'p50 us':>7} {'p99 us':>7}")
+    for name in ("first_fit", "balanced"):
+        spread, latencies = run_garage(name, args.levels, per_level, args.events, args.seed)
+        print(f"  {name:<20} {spread:>16,.0f} {percentile(latencies, 0.5):>7.2f} "
+              f"{percentile(latencies, 0.99):>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Throughput of batched gate events: park_many/leave_many vs one park/leave per call.
+
+Each round parks a burst of vehicles into an empty lot and then releases them,
+so both paths allocate exactly the same slots.
+
+Usage:
+    python scripts/bench_bulk_park.py [--capacity 100000] [--batch 256] [--rounds 5]
+"""
+import argparse
+import os
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.redesign.controllers.parking_controller import ParkingController  # noqa: E402
+from src.redesign.factories.vehicle_factory import create_vehicle  # noqa: E402
+from src.redesign.models.parking_lot import ParkingLot  # noqa: E402
+from src.redesign.models.vehicle import Vehicle  # noqa: E402
+from src.redesign.strategies.allocation_strategy import RegularFirstStrategy  # noqa: E402
+
+
+def new_controller(capacity: int) -> ParkingController:
+    return ParkingController(
+        lot=ParkingLot(level=1, regular_capacity=capacity, ev_capacity=0),
+        allocation_strategy=RegularFirstStrategy(),
+    )
+
+
+def run_single(vehicles: List[Vehicle], capacity: int, batch: int, rounds: int) -> float:
+    ctl = new_controller(capacity)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for i in range(0, len(vehicles), batch):
+            slots = [ctl.park(v) for v in vehicles[i:i + batch]]
+        for i in range(0, len(vehicles), batch):
+            for slot in range(i + 1, min(i + batch, len(vehicles)) + 1):
+                ctl.leave(slot, is_ev=False)
+    assert slots[-1] == len(vehicles)
+    return time.perf_counter() - start
+
+
+def run_bulk(vehicles: List[Vehicle], capacity: int, batch: int, rounds: int) -> float:
+    ctl = new_controller(capacity)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for i in range(0, len(vehicles), batch):
+            slots = ctl.park_many(vehicles[i:i + batch])
+        for i in range(0, len(vehicles), batch):
+            ctl.leave_many(range(i + 1, min(i + batch, len(vehicles)) + 1), is_ev=False)
+    assert slots[-1] == len(vehicles)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--capacity", type=int, default=100000)
+    parser.add_argument("--batch", type=int, default=256)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    vehicles = [create_vehicle("car", f"REG{i}", "Toyota", "Corolla", "Blue") for i in range(args.capacity)]
+    events = 2 * args.capacity * args.rounds
+    single = run_single(vehicles, args.capacity, args.batch, args.rounds)
+    bulk = run_bulk(vehicles, args.capacity, args.batch, args.rounds)
+    print(f"{'mode':<8} {'events/sec':>12}")
+    print(f"{'single':<8} {events / single:>12,.0f}")
+    print(f"{'bulk':<8} {events / bulk:>12,.0f}")
+    print(f"speedup: {single / bulk:.2f}x (batch={args.batch})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Memory and create_lot time of ParkingSlot lists vs compact array-backed storage.
+
+Usage:
+    python scripts/bench_compact_storage.py [--slots 1000000] [--fill 0.5]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.redesign.controllers.parking_controller import ParkingController  # noqa: E402
+from src.redesign.factories.vehicle_factory import create_vehicle  # noqa: E402
+from src.redesign.models.parking_lot import ParkingLot  # noqa: E402
+from src.redesign.strategies.allocation_strategy import RegularFirstStrategy  # noqa: E402
+
+
+def new_controller(compact: bool) -> ParkingController:
+    return ParkingController(
+        lot=ParkingLot(level=1, regular_capacity=0, ev_capacity=0, compact=compact),
+        allocation_strategy=RegularFirstStrategy(),
+    )
+
+
+def measure(slots: int, fill: float, compact: bool) -> None:
+    # Timed without tracemalloc, which slows allocation-heavy code several-fold
+    gc.collect()
+    ctl = new_controller(compact)
+    start = time.perf_counter()
+    ctl.create_lot(1, slots, 0)
+    created = time.perf_counter() - start
+    del ctl
+
+    vehicles = [create_vehicle("car", f"REG{i}", "Toyota", "Corolla", "Blue") for i in range(int(slots * fill))]
+    gc.collect()
+    tracemalloc.start()
+    ctl = new_controller(compact)
+    ctl.create_lot(1, slots, 0)
+    empty_bytes, _ = tracemalloc.get_traced_memory()
+    ctl.park_many(vehicles)
+    filled_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    label = "compact" if compact else "objects"
+    print(f"{label:<8} {created:>12.3f} {empty_bytes / 2**20:>14.1f} {filled_bytes / 2**20:>15.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slots", type=int, default=1_000_000)
+    parser.add_argument("--fill", type=float, default=0.5, help="fraction of slots to occupy after creation")
+    args = parser.parse_args()
+
+    print(f"slots={args.slots:,} fill={args.fill:.0%}")
+    print(f"{'storage':<8} {'create_lot s':>12} {'empty lot MiB':>14} {'filled lot MiB':>15}")
+    measure(args.slots, args.fill, compact=False)
+    measure(args.slots, args.fill, compact=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Event bus benchmark: gate-path latency with a slow subscriber, called inline vs through the bus.
+
+The subscriber models a billing writer: every call costs --call-ms (a round
+trip) plus a little per event. Called inline as a ParkingListener it pays one
+round trip per park/leave on the gate path. On the EventBus the gate only
+enqueues, and the subscriber writes whole batches on its worker thread.
+Reports park+leave p50/p99 per operation, total time, and the subscription's
+backpressure counters.
+
+Usage:
+    python scripts/bench_event_bus.py [--ops 20000] [--call-ms 1.0] [--max-queue 100000]
+"""
+import argparse
+import os
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.redesign.controllers.parking_controller import ParkingController  # noqa: E402
+from src.redesign.factories.vehicle_factory import create_vehicle  # noqa: E402
+from src.redesign.models.parking_listener import ParkingListener  # noqa: E402
+from src.redesign.models.parking_lot import ParkingLot  # noqa: E402
+from src.redesign.services.event_bus import EventBus  # noqa: E402
+from src.redesign.strategies.registry import create_strategy  # noqa: E402
+
+
+class InlineBilling(ParkingListener):
+    def __init__(self, call_s: float) -> None:
+        self.call_s = call_s
+
+    def on_park(self, lot, vehicle, is_ev, slot_number) -> None:
+        time.sleep(self.call_s)
+
+    def on_leave(self, lot, vehicle, is_ev, slot_number) -> None:
+        time.sleep(self.call_s)
+
+
+def run(controller: ParkingController, ops: int) -> List[int]:
+    latencies = []
+    for i in range(ops // 2):
+        vehicle = create_vehicle("car", f"B{i}", "Make", "Model", "Blue")
+        start = time.perf_counter_ns()
+        slot = controller.park(vehicle)
+        controller.leave(slot, False)  # type: ignore[arg-type]
+        latencies.append(time.perf_counter_ns() - start)
+    return latencies
+
+
+def report(name: str, latencies: List[int], seconds: float) -> None:
+    ordered = sorted(latencies)
+    p50, p99 = ordered[len(ordered) // 2] / 2e3, ordered[int(0.99 * len(ordered))] / 2e3
+    print(f"  {name:<22} p50 {p50:>8.2f} us/op  p99 {p99:>8.2f} us/op  total {seconds:>6.2f} s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=20000, help="parks + leaves")
+    parser.add_argument("--call-ms", type=float, default=1.0, help="subscriber cost per call")
+    parser.add_argument("--max-queue", type=int, default=100000)
+    args = parser.parse_args()
+    call_s = args.call_ms / 1e3
+
+    def controller(**kwargs) -> ParkingController:
+        return ParkingController(lot=ParkingLot(level=1, regular_capacity=1000, ev_capacity=0),
+                                 allocation_strategy=create_strategy("by_type"), **kwargs)
+
+    print(f"{args.ops:,} operations, subscriber call {args.call_ms} ms")
+    start = time.perf_counter()
+    report("no subscriber", run(controller(), args.ops), time.perf_counter() - start)
+
+    # Inline calls would take ops * call_ms; a tenth of the ops shows the per-op cost
+    inline = controller()
+    inline.lot.listeners.append(InlineBilling(call_s))
+    start = time.perf_counter()
+    report("inline listener", run(inline, args.ops // 10), time.perf_counter() - start)
+
+    bus = EventBus()
+
+    def billing(batch) -> None:
+        time.sleep(call_s + 1e-6 * len(batch))
+
+    subscription = bus.subscribe(billing, max_queue=args.max_queue, batch_size=512)
+    start = time.perf_counter()
+    latencies = run(controller(event_bus=bus), args.ops)
+    gate = time.perf_counter() - start
+    bus.flush(timeout=60)
+    report("event bus", latencies, gate)
+    stats = subscription.stats()
+    print(f"  bus drained {time.perf_counter() - start - gate:.2f} s after the last gate op: "
+          f"{stats.delivered:,} delivered in {stats.batches:,} batches, {stats.dropped:,} dropped, "
+          f"high-water {stats.high_water:,}")
+    bus.close()
+
+
+if __name__ == "__main__":
+    main()
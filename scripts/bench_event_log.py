@@ -0,0 +1,87 @@
+"""Write-ahead log benchmark: append throughput per fsync policy and recovery time.
+
+Usage:
+    python scripts/bench_event_log.py [--events 50000] [--slots 100000] [--history 1000000]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from typing import Iterator
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.redesign.factories.vehicle_factory import create_vehicle  # noqa: E402
+from src.redesign.models.parking_lot import ParkingLot  # noqa: E402
+from src.redesign.services.event_log import FSYNC_POLICIES, WriteAheadLog, recover  # noqa: E402
+
+
+def churn(lot: ParkingLot, events: int, seed: int) -> Iterator[None]:
+    """Park/leave mix that keeps the lot around 90% full."""
+    rng = random.Random(seed)
+    capacity = len(lot.regular_slots)
+    parked = []
+    for i in range(events):
+        if parked and (len(parked) > capacity * 0.9 or rng.random() < 0.45):
+            lot.leave(parked.pop(rng.randrange(len(parked))), is_ev=False)
+        else:
+            slot = lot.park_regular(create_vehicle("car", f"R{i}", "Toyota", "Corolla", "Blue"))
+            if slot is not None:
+                parked.append(slot)
+        yield
+
+
+def append_rate(policy: str, events: int, slots: int, workdir: str) -> float:
+    lot = ParkingLot(level=1, regular_capacity=slots, ev_capacity=0)
+    wal = WriteAheadLog(os.path.join(workdir, policy), fsync=policy, snapshot_every=0)
+    wal.attach(lot)
+    start = time.perf_counter()
+    for _ in churn(lot, events, seed=1):
+        pass
+    wal.close()
+    return events / (time.perf_counter() - start)
+
+
+def recovery_time(history: int, slots: int, snapshot_every: int, workdir: str) -> float:
+    path = os.path.join(workdir, f"recover-{snapshot_every}")
+    lot = ParkingLot(level=1, regular_capacity=slots, ev_capacity=0)
+    wal = WriteAheadLog(path, fsync="none", snapshot_every=snapshot_every)
+    wal.attach(lot)
+    for _ in churn(lot, history, seed=2):
+        pass
+    wal.close()
+    start = time.perf_counter()
+    recovered = recover(path)
+    elapsed = time.perf_counter() - start
+    assert recovered.free_regular_count() == lot.free_regular_count()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=50000, help="events per fsync policy")
+    parser.add_argument("--always-events", type=int, default=2000, help="events for the fsync-per-record policy")
+    parser.add_argument("--slots", type=int, default=100000)
+    parser.add_argument("--history", type=int, default=1000000, help="events of history before recovery")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="parking-wal-")
+    try:
+        print(f"append throughput ({args.slots:,}-slot lot)")
+        for policy in FSYNC_POLICIES:
+            events = args.always_events if policy == "always" else args.events
+            print(f"  {policy:<7} {append_rate(policy, events, args.slots, workdir):>12,.0f} events/s")
+
+        print(f"recovery after {args.history:,} events")
+        for every in (0, 100000, 10000):
+            label = "no snapshots" if every == 0 else f"snapshot every {every:,}"
+            print(f"  {label:<22} {recovery_time(args.history, args.slots, every, workdir):>8.2f} s")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Forecast benchmark: rejections with fixed EV/regular pools vs forecast-driven convertible slots.
+
+Replays the same month of traffic, with a daytime regular peak and an
+evening EV peak, through VehicleTypeStrategy, EVSpilloverStrategy and
+ConvertibleSlotsStrategy. The convertible strategy runs twice: once with its
+--convertible regular slots fixed in EV mode, and once following a
+PartitionPlan that a DemandForecaster rebuilds every midnight from the days
+before (no plan during the first --warmup days).
+Reports rejected EVs and other vehicles after the warm-up, EVs parked on a
+slot without a charger (spillover onto ordinary regular slots), the time to
+build a plan, and the mean allocate latency.
+
+Usage:
+    python scripts/bench_forecast.py [--days 35] [--warmup 7] [--regular 600] [--ev 60] [--convertible 80]
+"""
+import argparse
+import heapq
+import math
+import os
+import random
+import sys
+import time
+from typing import List, Optional, Set, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.redesign.factories.vehicle_factory import create_electric, create_vehicle  # noqa: E402
+from src.redesign.models.parking_lot import ParkingLot  # noqa: E402
+from src.redesign.services.forecast import DAY, DemandForecaster  # noqa: E402
+from src.redesign.strategies.allocation_strategy import (  # noqa: E402
+    AllocationStrategy,
+    ConvertibleSlotsStrategy,
+    EVSpilloverStrategy,
+    PartitionPlan,
+    VehicleTypeStrategy,
+)
+
+
+def regular_rate(hour: float) -> float:
+    """Arrivals per hour: a daytime peak."""
+    return 20 + 230 * math.exp(-((hour - 11) / 3.0) ** 2)
+
+
+def ev_rate(hour: float) -> float:
+    """Arrivals per hour: an evening peak, when the daytime cars have gone."""
+    return 4 + 70 * math.exp(-((hour - 19) / 2.0) ** 2)
+
+
+def traffic(days: int, seed: int) -> List[Tuple[float, bool, float]]:
+    """(arrival second, is_ev, stay seconds), by thinning a Poisson stream at the peak rate."""
+    rng = random.Random(seed)
+    arrivals = []
+    for is_ev, rate, stay in ((False, regular_rate, 3.0), (True, ev_rate, 2.0)):
+        peak = max(rate(h / 10) for h in range(240))
+        at = 0.0
+        while True:
+            at += rng.expovariate(peak) * 3600
+            if at >= days * DAY:
+                break
+            if rng.random() < rate(at % DAY / 3600) / peak:
+                arrivals.append((at, is_ev, rng.expovariate(1 / stay) * 3600))
+    arrivals.sort()
+    return arrivals
+
+
+def run(strategy: AllocationStrategy, lot: ParkingLot, arrivals: List[Tuple[float, bool, float]],
+        clock: List[float], warmup: int, chargers: Set[int],
+        forecaster: Optional[DemandForecaster] = None) -> Tuple[int, int, int, float, float]:
+    """Returns (EVs rejected, others rejected, EVs without a charger, seconds per plan, seconds per allocate).
+
+    Counts start after the warm-up; ``chargers`` are the regular slots that have one.
+    """
+    departures: List[Tuple[float, int, bool]] = []
+    rejected = [0, 0]
+    uncharged = 0
+    plan_s = allocate_s = 0.0
+    plans = allocations = 0
+    day = 0
+    for i, (at, is_ev, stay) in enumerate(arrivals):
+        while departures and departures[0][0] <= at:
+            clock[0], slot, in_ev_pool = heapq.heappop(departures)
+            lot.leave(slot, in_ev_pool)
+        clock[0] = at
+        if int(at // DAY) != day:
+            day = int(at // DAY)
+            if forecaster is not None and day >= warmup:
+                start = time.perf_counter()
+                strategy.plan = forecaster.plan(lot, len(chargers))  # type: ignore[attr-defined]
+                plan_s += time.perf_counter() - start
+                plans += 1
+        vehicle = (create_electric("car", f"F{i}", "Make", "Model", "White") if is_ev
+                   else create_vehicle("car", f"F{i}", "Make", "Model", "White"))
+        start = time.perf_counter()
+        slot = strategy.allocate(lot, vehicle)
+        allocate_s += time.perf_counter() - start
+        allocations += 1
+        if slot is None:
+            if day >= warmup:
+                rejected[is_ev] += 1
+        else:
+            in_ev_pool = lot.find_by_registration(vehicle.registration_number)[0]  # type: ignore[index]
+            if is_ev and not in_ev_pool and slot not in chargers and day >= warmup:
+                uncharged += 1
+            heapq.heappush(departures, (at + stay, slot, in_ev_pool))
+    return rejected[1], rejected[0], uncharged, plan_s / max(plans, 1), allocate_s / allocations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=35)
+    parser.add_argument("--warmup", type=int, default=7)
+    parser.add_argument("--regular", type=int, default=600)
+    parser.add_argument("--ev", type=int, default=60)
+    parser.add_argument("--convertible", type=int, default=80, help="the last n regular slots are convertible")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    arrivals = traffic(args.days, args.seed)
+    evs = sum(1 for _, is_ev, _ in arrivals if is_ev)
+    print(f"{len(arrivals):,} arrivals ({evs:,} EV) over {args.days} days, {args.regular} regular "
+          f"({args.convertible} convertible) + {args.ev} EV slots; counting after day {args.warmup}")
+
+    def lot() -> ParkingLot:
+        return ParkingLot(level=1, regular_capacity=args.regular, ev_capacity=args.ev)
+
+    def report(name: str, ev_rejected: int, other_rejected: int, uncharged: int, allocate_s: float) -> None:
+        print(f"  {name:<18} EVs rejected {ev_rejected:>6,}  others rejected {other_rejected:>6,}  "
+              f"EVs without a charger {uncharged:>6,}  allocate {1e6 * allocate_s:>5.2f} us")
+
+    convertible = range(args.regular - args.convertible + 1, args.regular + 1)
+    chargers = set(convertible)
+    static = ConvertibleSlotsStrategy(convertible, plan=PartitionPlan(DAY, (args.convertible,)))
+    for name, strategy in (("by_type", VehicleTypeStrategy()), ("ev_spillover", EVSpilloverStrategy()),
+                           ("static EV mode", static)):
+        ev_rejected, other_rejected, uncharged, _, allocate_s = run(strategy, lot(), arrivals, [0.0],
+                                                                    args.warmup, chargers)
+        report(name, ev_rejected, other_rejected, uncharged, allocate_s)
+
+    clock = [0.0]
+    forecaster = DemandForecaster(clock=lambda: clock[0])
+    strategy = ConvertibleSlotsStrategy(convertible, clock=lambda: clock[0], on_reject=forecaster.record_rejected)
+    partitioned = lot()
+    forecaster.attach(partitioned)
+    ev_rejected, other_rejected, uncharged, plan_s, allocate_s = run(strategy, partitioned, arrivals, clock,
+                                                                     args.warmup, chargers, forecaster)
+    report("forecast partition", ev_rejected, other_rejected, uncharged, allocate_s)
+    print(f"  plan built in {1e3 * plan_s:.2f} ms")
+    plan = strategy.plan
+    if plan is not None:
+        hourly = [plan.ev_slots_at(hour * 3600) for hour in range(24)]
+        print(f"  convertible slots in EV mode by hour: {' '.join(str(n) for n in hourly)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Compare the old linear slot scan with the maintained free-slot index.
+
+Each lot is filled completely, then churned: a random slot leaves and the next
+arrival is parked. This is the near-full case where the scan was slowest.
+
+Usage:
+    python scripts/bench_free_slot_index.py [--ops 2000] [--sizes 1000,10000,100000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from typing import List, Optional
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.redesign.models.parking_lot import ParkingLot, ParkingSlot  # noqa: E402
+from src.redesign.models.vehicle import Car  # noqa: E402
+
+
+def scan_first_empty(slots: List[ParkingSlot]) -> Optional[int]:
+    # The allocation loop ParkingLot used before the free-slot index
+    for slot in slots:
+        if slot.is_empty():
+            return slot.index
+    return None
+
+
+def churn_scan(size: int, ops: int, seed: int) -> float:
+    lot = ParkingLot(level=1, regular_capacity=size, ev_capacity=0)
+    for i, slot in enumerate(lot.regular_slots):
+        slot.vehicle = Car(f"BENCH{i}", "Toyota", "Corolla", "Blue")
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    for _ in range(ops):
+        slot = lot.regular_slots[rng.randrange(size)]
+        car, slot.vehicle = slot.vehicle, None
+        idx = scan_first_empty(lot.regular_slots)
+        lot.regular_slots[idx].vehicle = car  # type: ignore[index]
+    return time.perf_counter() - start
+
+
+def churn_index(size: int, ops: int, seed: int) -> float:
+    lot = ParkingLot(level=1, regular_capacity=size, ev_capacity=0)
+    for i in range(size):
+        lot.park_regular(Car(f"BENCH{i}", "Toyota", "Corolla", "Blue"))
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    for _ in range(ops):
+        slot_number = rng.randrange(size) + 1
+        car = lot.regular_slots[slot_number - 1].vehicle
+        lot.leave(slot_number, is_ev=False)
+        lot.park_regular(car)  # type: ignore[arg-type]
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'slots':>8} {'scan us/op':>12} {'index us/op':>12} {'speedup':>9}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        scan = churn_scan(size, args.ops, args.seed)
+        index = churn_index(size, args.ops, args.seed)
+        print(f"{size:>8} {scan / args.ops * 1e6:>12.2f} {index / args.ops * 1e6:>12.2f} {scan / index:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Cold-start benchmark: deserializing snapshot vs memory-mapped snapshot.
+
+For each lot size, a half-full lot is saved both ways and reopened; the time
+to the first free-slot answer is reported, then the first registration lookup
+and the first park on the mapped lot (both served from the file's registration
+table), and the one-off cost of its first attribute query, which builds the
+attribute indexes.
+
+Usage:
+    python scripts/bench_mapped_snapshot.py [--sizes 10000 100000 1000000] [--fill 0.5]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.redesign.factories.vehicle_factory import create_vehicle  # noqa: E402
+from src.redesign.models.parking_lot import ParkingLot  # noqa: E402
+from src.redesign.services.event_log import read_snapshot, write_snapshot  # noqa: E402
+
+
+def build(slots: int, fill: float) -> ParkingLot:
+    lot = ParkingLot(level=1, regular_capacity=slots, ev_capacity=0, compact=True)
+    lot.park_regular_many([
+        create_vehicle("car", f"R{i}", "Toyota", "Corolla", ("Blue", "Red", "White")[i % 3])
+        for i in range(int(slots * fill))
+    ])
+    return lot
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--fill", type=float, default=0.5, help="fraction of slots occupied")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="parking-mmap-")
+    mapped_path = os.path.join(workdir, "lot.map")
+    try:
+        print(f"{'slots':>10} {'deserialize':>12} {'mmap open':>10} {'first lookup':>13} {'first park':>11} "
+              f"{'first query':>12}")
+        for slots in args.sizes:
+            lot = build(slots, args.fill)
+            write_snapshot(lot, workdir, next_segment=1)
+            lot.save_snapshot(mapped_path)
+            expected = lot.first_empty_regular()
+            del lot
+
+            start = time.perf_counter()
+            loaded, _ = read_snapshot(workdir, compact=True)
+            assert loaded.first_empty_regular() == expected
+            full = time.perf_counter() - start
+            del loaded
+
+            start = time.perf_counter()
+            mapped = ParkingLot.open_snapshot(mapped_path)
+            assert mapped.first_empty_regular() == expected
+            opened = time.perf_counter() - start
+
+            start = time.perf_counter()
+            assert mapped.find_by_registration("R0") == (False, 1)
+            lookup = time.perf_counter() - start
+
+            start = time.perf_counter()
+            assert mapped.park_regular(create_vehicle("car", "NEW", "Honda", "Civic", "Red")) == expected + 1
+            park = time.perf_counter() - start
+
+            start = time.perf_counter()
+            mapped.slots_with("color", "Red")
+            query = time.perf_counter() - start
+            print(f"{slots:>10,} {full * 1e3:>10.1f}ms {opened * 1e3:>8.2f}ms {lookup * 1e3:>11.3f}ms "
+                  f"{park * 1e3:>9.3f}ms {query * 1e3:>10.1f}ms")
+            del mapped
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
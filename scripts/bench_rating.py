@@ -0,0 +1,83 @@
+"""Rating benchmark: a day's closed tickets priced as one NumPy batch vs one call per ticket.
+
+Generates --tickets synthetic closed tickets (log-normal stays, a mix of
+vehicle kinds, energy on the EV tickets), prices them with
+RatingEngine.price and with a price_ticket loop, checks that both give the
+same totals to the cent, and reports the time per ticket.
+
+Usage:
+    python scripts/bench_rating.py [--tickets 1000000] [--loop 100000] [--seed 7]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.redesign.factories.vehicle_factory import PERSISTED_KINDS  # noqa: E402
+from src.redesign.services.billing import RatePlan, RatingEngine, TicketBatch  # noqa: E402
+
+
+def synthetic_day(count: int, seed: int) -> TicketBatch:
+    rng = np.random.default_rng(seed)
+    kind = rng.integers(0, len(PERSISTED_KINDS), count).astype(np.uint8)
+    is_ev = np.array([name.startswith("ev") for name in PERSISTED_KINDS])[kind]
+    entered = rng.uniform(0, 86400, count)
+    # Median stay of about 1.5 hours, with a long tail past a day
+    stay = rng.lognormal(np.log(5400), 1.0, count)
+    energy = np.where(is_ev, rng.uniform(0, 40, count), 0.0)
+    return TicketBatch(
+        registration=[f"R{i}" for i in range(count)],
+        level=np.ones(count, dtype=np.int64),
+        is_ev=is_ev,
+        kind=kind,
+        entered_at=entered,
+        left_at=entered + stay,
+        energy_kwh=energy,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickets", type=int, default=1_000_000)
+    parser.add_argument("--loop", type=int, default=100_000, help="tickets priced by the per-ticket loop")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    engine = RatingEngine(plans={
+        "motorcycle": RatePlan(tiers=((0.0, 1.0),), daily_cap=10.0),
+        "ev_bike": RatePlan(tiers=((0.0, 1.0),), daily_cap=10.0),
+        "truck": RatePlan(tiers=((0.0, 4.0), (4.0, 2.5)), daily_cap=60.0),
+    })
+    batch = synthetic_day(args.tickets, args.seed)
+    print(f"{args.tickets:,} closed tickets")
+
+    start = time.perf_counter()
+    totals = engine.price(batch).total
+    batch_s = time.perf_counter() - start
+    print(f"  batch       {batch_s:>7.3f} s  {1e9 * batch_s / args.tickets:>8.1f} ns/ticket  "
+          f"revenue {totals.sum():,.2f}")
+
+    count = min(args.loop, args.tickets)
+    start = time.perf_counter()
+    looped = [
+        engine.price_ticket(PERSISTED_KINDS[batch.kind[i]], batch.entered_at[i], batch.left_at[i],
+                            batch.energy_kwh[i])
+        for i in range(count)
+    ]
+    loop_s = time.perf_counter() - start
+    per_ticket = loop_s / count
+    print(f"  per ticket  {per_ticket * args.tickets:>7.3f} s  {1e9 * per_ticket:>8.1f} ns/ticket  "
+          f"(timed on {count:,}; {per_ticket * args.tickets / batch_s:.0f}x slower)")
+
+    mismatched = int(np.count_nonzero(np.abs(totals[:count] - np.array(looped)) > 0.005))
+    print(f"  totals match the per-ticket loop: {'yes' if not mismatched else f'NO ({mismatched} differ)'}")
+    if mismatched:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
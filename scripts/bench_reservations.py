@@ -0,0 +1,118 @@
+"""Reservation benchmark: 100k bookings over a week, bucket-mask search vs a per-slot scan.
+
+Books --bookings windows (log-normal lengths, median two hours, EV and
+mixed-size vehicles) at random times within a one-week horizon, in random
+order, on a lot with size classes. Each booking's slot comes from
+ReservationBook.find_slot; every --check-every'th request is also answered by
+scanning the slots in order with the per-slot bisect check, and the two must
+agree. Then a tenth of the bookings are cancelled. Reports time per booking,
+per scan, per cancellation, and the share of requests that found a slot.
+
+Usage:
+    python scripts/bench_reservations.py [--bookings 100000] [--regular 2000] [--ev 200] [--check-every 50]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.redesign.factories.vehicle_factory import create_electric, create_vehicle  # noqa: E402
+from src.redesign.models.electric_vehicle import ElectricVehicle  # noqa: E402
+from src.redesign.models.parking_lot import ParkingLot, fitting_sizes  # noqa: E402
+from src.redesign.models.reservations import ReservationBook  # noqa: E402
+from src.redesign.models.vehicle import Vehicle  # noqa: E402
+
+WEEK = 7 * 86400.0
+
+
+def requests(count: int, seed: int) -> List[Tuple[Vehicle, float, float]]:
+    rng = random.Random(seed)
+    made = []
+    for i in range(count):
+        r = rng.random()
+        if r < 0.1:
+            vehicle: Vehicle = create_electric("car", f"B{i}", "Tesla", "Model 3", "White")
+        elif r < 0.3:
+            vehicle = create_vehicle("motorcycle", f"B{i}", "Honda", "CBR", "Red")
+        elif r < 0.4:
+            vehicle = create_vehicle("truck", f"B{i}", "Ford", "F-150", "Black")
+        else:
+            vehicle = create_vehicle("car", f"B{i}", "Toyota", "Corolla", "Blue")
+        length = min(max(rng.lognormvariate(8.9, 0.8), 900.0), 86400.0)
+        start = rng.uniform(0, WEEK - length)
+        made.append((vehicle, start, start + length))
+    return made
+
+
+def scan(book: ReservationBook, slots: Dict[Tuple[bool, str], List[int]], vehicle: Vehicle,
+         start: float, end: float) -> Optional[int]:
+    """The same answer as find_slot, by checking every slot in order."""
+    is_ev = isinstance(vehicle, ElectricVehicle)
+    sizes = ("any",) if is_ev else fitting_sizes(vehicle)
+    for size in sizes:
+        for slot_number in slots[(is_ev, size)]:
+            if book.is_free(is_ev, slot_number, start, end):
+                return slot_number
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bookings", type=int, default=100_000)
+    parser.add_argument("--regular", type=int, default=2000)
+    parser.add_argument("--ev", type=int, default=200)
+    parser.add_argument("--check-every", type=int, default=50, help="cross-check every n-th request by scanning")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    small, large = args.regular // 5, args.regular // 10
+    lot = ParkingLot(level=1, regular_capacity=args.regular, ev_capacity=args.ev,
+                     small_capacity=small, large_capacity=large)
+    book = ReservationBook(lot)
+    slots = {(True, "any"): list(range(1, args.ev + 1))}
+    for size in ("small", "medium", "large"):
+        slots[(False, size)] = [n for n in range(1, args.regular + 1) if lot.slot_size(n) == size]
+    made = requests(args.bookings, args.seed)
+    print(f"{args.bookings:,} booking requests over one week, {args.regular:,} regular "
+          f"({small} small, {large} large) + {args.ev} EV slots")
+
+    booked = []
+    book_s = scan_s = 0.0
+    scans = mismatches = 0
+    for i, (vehicle, start, end) in enumerate(made):
+        if i % args.check_every == 0:
+            began = time.perf_counter()
+            expected = scan(book, slots, vehicle, start, end)
+            scan_s += time.perf_counter() - began
+            scans += 1
+        began = time.perf_counter()
+        reservation = book.reserve(vehicle, start, end)
+        book_s += time.perf_counter() - began
+        if i % args.check_every == 0 and expected != (reservation.slot_number if reservation else None):
+            mismatches += 1
+        if reservation is not None:
+            booked.append(reservation.reservation_id)
+
+    print(f"  reserve           {1e6 * book_s / len(made):>8.1f} us/booking  "
+          f"({len(booked) / len(made):.1%} of requests found a slot)")
+    print(f"  slot-by-slot scan {1e6 * scan_s / scans:>8.1f} us/search    (timed on {scans:,} requests)")
+
+    rng = random.Random(args.seed)
+    cancelled = rng.sample(booked, len(booked) // 10)
+    began = time.perf_counter()
+    for reservation_id in cancelled:
+        book.cancel(reservation_id)
+    cancel_s = time.perf_counter() - began
+    print(f"  cancel            {1e6 * cancel_s / max(len(cancelled), 1):>8.1f} us/booking  "
+          f"({len(book):,} bookings left)")
+    print(f"  find_slot matches the scan: {'yes' if not mismatches else f'NO ({mismatches} differ)'}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Garage traffic simulation and the standard performance regression benchmark.
+
+Runs the discrete-event simulator (src/redesign/services/simulator.py) on one
+lot and reports utilization, rejection rate and events/sec. With no options it
+runs the standard scenario: 1,000 regular + 100 EV slots, Poisson arrivals at
+400/h, log-normal dwell (mean 2.5 h), the default vehicle mix, seed 0, and
+1,000,000 events.
+
+As a regression check, --save-baseline FILE records the result and --baseline
+FILE compares against it. The event and rejection counts must match exactly,
+since a seeded run is deterministic. Events/sec may not fall more than
+--tolerance below the baseline. The script exits 1 on a regression.
+
+Usage:
+    python scripts/bench_simulation.py [--events 1000000] [--baseline FILE | --save-baseline FILE]
+    python scripts/bench_simulation.py --regular 2000 --ev 300 --interarrival exp:0.002 \\
+        --dwell lognormal:3:0.6 --mix car=0.6,ev_car=0.3,truck=0.1 --hours 720 --events 0
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.redesign.services.simulator import (  # noqa: E402
+    SimulationConfig,
+    parse_distribution,
+    parse_mix,
+    simulate,
+)
+from src.redesign.strategies.registry import strategy_names  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--regular", type=int, default=1000)
+    parser.add_argument("--ev", type=int, default=100)
+    parser.add_argument("--small", type=int, default=0)
+    parser.add_argument("--large", type=int, default=0)
+    parser.add_argument("--strategy", default="by_type",
+                        choices=strategy_names())
+    parser.add_argument("--interarrival", type=parse_distribution, default="exp:0.0025", help="hours")
+    parser.add_argument("--dwell", type=parse_distribution, default="lognormal:2.5:0.8", help="hours")
+    parser.add_argument("--mix", type=parse_mix, default=None, help="e.g. car=0.7,motorcycle=0.1,ev_car=0.2")
+    parser.add_argument("--hours", type=float, default=1e9, help="simulated hours to run")
+    parser.add_argument("--events", type=int, default=1_000_000, help="stop after this many events (0: no limit)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", help="compare with a result saved by --save-baseline")
+    parser.add_argument("--save-baseline", help="write this run's result as a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed events/sec drop (default 20%%)")
+    args = parser.parse_args()
+
+    config = SimulationConfig(
+        regular_capacity=args.regular, ev_capacity=args.ev, small_capacity=args.small, large_capacity=args.large,
+        strategy=args.strategy, interarrival=args.interarrival, dwell=args.dwell, hours=args.hours,
+        max_events=args.events or None, seed=args.seed,
+        **({"mix": tuple(args.mix.items())} if args.mix else {}),
+    )
+    result = simulate(config)
+    print(result.summary())
+
+    record = {
+        "config": repr(config),
+        "events": result.events,
+        "arrivals": result.arrivals,
+        "rejected": result.rejected,
+        "ops_per_sec": round(result.ops_per_sec),
+    }
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(record, f, indent=2)
+        print(f"baseline written to {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        failures = []
+        if baseline["config"] != record["config"]:
+            failures.append("scenario differs from the baseline's")
+        for key in ("events", "arrivals", "rejected"):
+            if baseline[key] != record[key]:
+                failures.append(f"{key} {record[key]:,} != baseline {baseline[key]:,}")
+        floor = baseline["ops_per_sec"] * (1 - args.tolerance)
+        change = record["ops_per_sec"] / baseline["ops_per_sec"] - 1
+        print(f"events/sec {record['ops_per_sec']:,} vs baseline {baseline['ops_per_sec']:,} ({change:+.1%})")
+        if record["ops_per_sec"] < floor:
+            failures.append(f"events/sec below {floor:,.0f}")
+        for failure in failures:
+            print(f"REGRESSION: {failure}")
+        if failures:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Parameter sweep benchmark: serial vs ProcessPoolExecutor runs of the lot simulator.
+
+Builds a grid over regular capacity, EV capacity and strategy, runs it once in
+this process and once across --workers processes, checks that every run's
+metrics are identical, and reports the speedup. Near-linear scaling needs as
+many free cores as workers.
+
+Usage:
+    python scripts/bench_sweep.py [--workers N] [--events 100000] [--table]
+"""
+import argparse
+import os
+import sys
+from dataclasses import replace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.redesign.services.simulator import SimulationConfig  # noqa: E402
+from src.redesign.services.sweep import grid, run_sweep  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--events", type=int, default=100_000, help="events per run")
+    parser.add_argument("--table", action="store_true", help="print every run's metrics")
+    args = parser.parse_args()
+
+    base = SimulationConfig(hours=1e9, max_events=args.events)
+    configs = grid(base, regular_capacity=(800, 1000, 1200), ev_capacity=(50, 100, 150, 200),
+                   strategy=("by_type", "ev_spillover", "nearest_entrance"))
+    print(f"{len(configs)} runs x {args.events:,} events, {os.cpu_count()} CPUs")
+
+    serial = run_sweep(configs, workers=1)
+    print(f"  serial        {serial.wall_seconds:>7.2f} s  {serial.ops_per_sec:>10,.0f} events/s")
+    parallel = run_sweep(configs, workers=args.workers)
+    print(f"  {args.workers} workers     {parallel.wall_seconds:>7.2f} s  {parallel.ops_per_sec:>10,.0f} events/s"
+          f"  ({serial.wall_seconds / parallel.wall_seconds:.2f}x)")
+
+    mismatched = [
+        config for (config, a), (_, b) in zip(serial.runs, parallel.runs)
+        if replace(a, wall_seconds=0.0) != replace(b, wall_seconds=0.0)
+    ]
+    print(f"  results identical to serial: {'yes' if not mismatched else f'NO ({len(mismatched)} runs differ)'}")
+    if args.table:
+        print(parallel.table("regular_capacity", "ev_capacity", "strategy"))
+    if mismatched:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Tk frame-time benchmark: per-row Text status listing vs the virtualized listing.
+
+Fills a lot with --vehicles occupied slots, then times one frame (the work
+plus ``update_idletasks``) for:
+  - the original approach: one Text insert per occupied vehicle
+  - the Status button with the virtualized Treeview listing
+  - scrolling the listing (median and worst of --scrolls frames)
+  - a burst of --messages log lines flushed in one tick
+
+Needs a display (on a headless Linux box run it under ``xvfb-run``).
+
+Usage:
+    python scripts/bench_tk_frame_time.py [--vehicles 20000] [--scrolls 200] [--messages 5000]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ["APP_SUPPRESS_DIALOGS"] = "1"
+
+import tkinter as tk  # noqa: E402
+
+from src.redesign.factories.vehicle_factory import create_vehicle  # noqa: E402
+
+
+def frame(root: tk.Tk, work) -> float:
+    start = time.perf_counter()
+    work()
+    root.update_idletasks()
+    return (time.perf_counter() - start) * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vehicles", type=int, default=20000)
+    parser.add_argument("--scrolls", type=int, default=200)
+    parser.add_argument("--messages", type=int, default=5000)
+    args = parser.parse_args()
+
+    from src.redesign.views.app_tk import create_app
+
+    try:
+        root, app = create_app()
+    except tk.TclError as e:
+        sys.exit(f"No display available ({e}); try: xvfb-run python {sys.argv[0]}")
+    app.controller.create_lot(1, args.vehicles, 0)
+    app.controller.park_many([
+        create_vehicle("car", f"R{i}", "Toyota", "Corolla", "Blue") for i in range(args.vehicles)
+    ])
+    app._flush_ui()
+    root.update()
+
+    def per_row_text() -> None:
+        # What the original status did: one insert per occupied slot
+        for slot_number, v in app.controller.lot.occupied(False):
+            app.text.insert(tk.END, f"{slot_number}\t1\t{v.registration_number}\t\t{v.color}\t\t{v.make}\t\t{v.model}\n")
+        app.text.see(tk.END)
+
+    print(f"{args.vehicles:,} occupied slots")
+    print(f"  per-row Text status      {frame(root, per_row_text):>9.1f} ms")
+    app.text.delete("1.0", tk.END)
+
+    def status() -> None:
+        app._status()
+        app._flush_ui()
+
+    print(f"  virtualized Status       {frame(root, status):>9.1f} ms")
+
+    times = []
+    for i in range(args.scrolls):
+        def scroll() -> None:
+            app._scroll_listing("moveto", str(i / args.scrolls))
+            app._flush_ui()
+        times.append(frame(root, scroll))
+    print(f"  scroll frame (median)    {statistics.median(times):>9.2f} ms")
+    print(f"  scroll frame (worst)     {max(times):>9.2f} ms")
+
+    def burst() -> None:
+        for i in range(args.messages):
+            app._println(f"message {i}")
+        app._flush_ui()
+
+    print(f"  {args.messages:,} log lines, one tick {frame(root, burst):>6.1f} ms")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
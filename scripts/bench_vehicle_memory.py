@@ -0,0 +1,75 @@
+"""Resident memory of a vehicle fleet: dict-backed dataclasses vs slotted, interned vehicles.
+
+Input strings are rebuilt per record, as they would be when parsed from a gate
+log or form, so the baseline pays for a separate make/model/color string each time.
+
+Usage:
+    python scripts/bench_vehicle_memory.py [--vehicles 300000]
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.redesign.factories.vehicle_factory import create_vehicle  # noqa: E402
+
+MAKES = [("Toyota", ["Corolla", "Camry", "Prius"]), ("Honda", ["Civic", "Accord"]), ("Ford", ["Focus", "F-150"])]
+COLORS = ["Blue", "Red", "White", "Black", "Silver", "Grey"]
+
+
+@dataclass
+class PlainCar:
+    # The Vehicle layout before slots/interning
+    registration_number: str
+    make: str
+    model: str
+    color: str
+
+
+def records(n: int) -> List[Tuple[str, str, str, str]]:
+    rng = random.Random(7)
+    rows = []
+    for i in range(n):
+        make, models = rng.choice(MAKES)
+        rows.append((f"REG{i:07d}", make, rng.choice(models), rng.choice(COLORS)))
+    return rows
+
+
+def fresh(s: str) -> str:
+    # A new, equal string object, as produced by parsing input
+    return "".join(list(s))
+
+
+def measure(rows: List[Tuple[str, str, str, str]], build: Callable[[str, str, str, str], object]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    fleet = [build(reg, fresh(make), fresh(model), fresh(color)) for reg, make, model, color in rows]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del fleet
+    return current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vehicles", type=int, default=300_000)
+    args = parser.parse_args()
+
+    rows = records(args.vehicles)
+    plain = measure(rows, PlainCar)
+    slotted = measure(rows, lambda reg, make, model, color: create_vehicle("car", reg, make, model, color))
+    print(f"vehicles={args.vehicles:,}")
+    print(f"{'layout':<18} {'MiB':>8} {'bytes/vehicle':>14}")
+    print(f"{'dict dataclass':<18} {plain / 2**20:>8.1f} {plain / args.vehicles:>14.0f}")
+    print(f"{'slots + interning':<18} {slotted / 2**20:>8.1f} {slotted / args.vehicles:>14.0f}")
+    print(f"saved: {1 - slotted / plain:.0%}")
+
+
+if __name__ == "__main__":
+    main()
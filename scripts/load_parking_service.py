@@ -0,0 +1,126 @@
+"""Load generator for the asyncio parking service: throughput and p50/p99 latency.
+
+By default a service is spawned on localhost for the run. Each connection sends
+a park/find/leave mix paced to --rate requests/sec in total; latency is measured
+from each request's scheduled send time, so a stalled server is not hidden by
+the client slowing down with it.
+
+Usage:
+    python scripts/load_parking_service.py [--rate 5000] [--seconds 10] [--connections 32]
+    python scripts/load_parking_service.py --no-spawn --port 8765
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from typing import List, Optional
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+async def connect(host: str, port: int, timeout: float = 10.0):  # type: ignore[no-untyped-def]
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return await asyncio.open_connection(host, port)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def call(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, request: dict) -> dict:
+    writer.write(json.dumps(request).encode() + b"\n")
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+async def client(cid: int, host: str, port: int, interval: float, stop_at: float, latencies: List[float]) -> int:
+    reader, writer = await connect(host, port)
+    rng = random.Random(cid)
+    parked: List[dict] = []
+    errors = 0
+    n = 0
+    next_send = time.perf_counter()
+    while next_send < stop_at:
+        delay = next_send - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        roll = rng.random()
+        if parked and roll < 0.35:
+            request = {"op": "leave", **parked.pop(rng.randrange(len(parked)))}
+        elif parked and roll < 0.55:
+            request = {"op": "find", "reg": f"C{cid}-{rng.randrange(n + 1)}"}
+        else:
+            is_ev = rng.random() < 0.2
+            request = {"op": "park", "reg": f"C{cid}-{n}", "make": "Toyota", "model": "Corolla",
+                       "color": rng.choice(["Red", "Blue"]), "ev": is_ev}
+        n += 1
+        response = await call(reader, writer, request)
+        latencies.append(time.perf_counter() - next_send)
+        if request["op"] == "park" and response.get("ok"):
+            parked.append({"slot": response["slot"], "ev": request["ev"]})
+        elif request["op"] != "find" and not response.get("ok"):
+            errors += 1
+        next_send += interval
+    writer.close()
+    return errors
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+async def run(args: argparse.Namespace) -> None:
+    reader, writer = await connect(args.host, args.port)
+    await call(reader, writer, {"op": "create_lot", "level": 1, "regular": args.regular, "ev": args.regular // 4})
+    writer.close()
+
+    latencies: List[float] = []
+    interval = args.connections / args.rate
+    start = time.perf_counter()
+    stop_at = start + args.seconds
+    errors = await asyncio.gather(*(client(c, args.host, args.port, interval, stop_at, latencies)
+                                    for c in range(args.connections)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"target rate:   {args.rate:,} req/s over {args.connections} connections")
+    print(f"achieved:      {len(latencies) / elapsed:,.0f} req/s ({len(latencies):,} requests in {elapsed:.1f}s)")
+    print(f"p50 latency:   {percentile(latencies, 0.50) * 1e3:.2f} ms")
+    print(f"p99 latency:   {percentile(latencies, 0.99) * 1e3:.2f} ms")
+    print(f"max latency:   {latencies[-1] * 1e3:.2f} ms")
+    print(f"failed writes: {sum(errors)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rate", type=int, default=5000, help="total requests per second")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--regular", type=int, default=100000, help="regular slots in the test lot")
+    parser.add_argument("--no-spawn", action="store_true", help="use an already running service")
+    args = parser.parse_args()
+
+    server: Optional[subprocess.Popen] = None
+    if not args.no_spawn:
+        server = subprocess.Popen(
+            [sys.executable, "-m", "src.redesign.services.parking_service", "--host", args.host, "--port", str(args.port)],
+            cwd=ROOT,
+        )
+    try:
+        asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
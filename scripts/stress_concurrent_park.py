@@ -0,0 +1,202 @@
+"""Stress the thread-safe controllers with thousands of parallel park/leave calls.
+
+Gate threads park and release vehicles at random against one shared lot, the
+same lot with EVSpilloverStrategy (EVs overflow into regular slots, so
+allocations cross pools), and a multi-level garage. Every granted slot is recorded in a holder table; a slot
+handed out while another vehicle still holds it is a double allocation. At the
+end the free counters, free indexes and registration index are checked against
+the actual slot contents. Exits non-zero on any violation.
+
+Usage:
+    python scripts/stress_concurrent_park.py [--threads 8] [--ops 5000]
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.redesign.controllers.concurrent_controller import (  # noqa: E402
+    ConcurrentGarageController,
+    ConcurrentParkingController,
+)
+from src.redesign.factories.vehicle_factory import create_electric, create_vehicle  # noqa: E402
+from src.redesign.models.parking_lot import DuplicateRegistrationError, ParkingLot  # noqa: E402
+from src.redesign.strategies.allocation_strategy import EVSpilloverStrategy, RegularFirstStrategy  # noqa: E402
+
+COLORS = ["Red", "Blue", "White"]
+MAKES = ["Toyota", "Honda", "Tesla"]
+
+
+class HolderTable:
+    """Test-side record of who was granted which slot."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.holders: Dict[Tuple, str] = {}
+        self.violations: List[str] = []
+
+    def grant(self, key: Tuple, reg: str) -> None:
+        with self._lock:
+            if key in self.holders:
+                self.violations.append(f"slot {key} given to {reg} while held by {self.holders[key]}")
+            self.holders[key] = reg
+
+    def release(self, key: Tuple) -> None:
+        with self._lock:
+            self.holders.pop(key, None)
+
+
+def gate(worker: int, ops: int, seed: int, table: HolderTable,
+         park: Callable[[bool, object], Optional[Tuple]], leave: Callable[[Tuple], bool]) -> None:
+    rng = random.Random(seed + worker)
+    mine: List[Tuple[Tuple, str]] = []
+    for i in range(ops):
+        if mine and rng.random() < 0.45:
+            key, _ = mine.pop(rng.randrange(len(mine)))
+            # Release our claim first: the slot cannot be re-granted until leave() frees it
+            table.release(key)
+            if not leave(key):
+                table.violations.append(f"leave of held slot {key} failed")
+            continue
+        is_ev = rng.random() < 0.3
+        # Plates collide across threads on purpose to exercise duplicate rejection
+        reg = f"P{rng.randrange(ops * 2)}"
+        if is_ev:
+            vehicle = create_electric("car", reg, rng.choice(MAKES), "M", rng.choice(COLORS))
+        else:
+            vehicle = create_vehicle("car", reg, rng.choice(MAKES), "M", rng.choice(COLORS))
+        try:
+            key = park(is_ev, vehicle)
+        except DuplicateRegistrationError:
+            continue
+        if key is not None:
+            table.grant(key, reg)
+            mine.append((key, reg))
+
+
+def check_lot(lot: ParkingLot, label: str) -> List[str]:
+    problems = []
+    parked = 0
+    for is_ev, slots, free_count in ((False, lot.regular_slots, lot.free_regular_count()),
+                                     (True, lot.ev_slots, lot.free_ev_count())):
+        occupied = [s for s in slots if not s.is_empty()]
+        parked += len(occupied)
+        if free_count != len(slots) - len(occupied):
+            problems.append(f"{label}: free counter {free_count} != {len(slots) - len(occupied)} empty slots (ev={is_ev})")
+        for s in occupied:
+            if lot.find_by_registration(s.vehicle.registration_number) != (is_ev, s.index + 1):
+                problems.append(f"{label}: registration index wrong for slot {s.index + 1} (ev={is_ev})")
+        first = next((s.index for s in slots if s.is_empty()), None)
+        head = lot.first_empty_ev() if is_ev else lot.first_empty_regular()
+        if head != first:
+            problems.append(f"{label}: free index head {head} != first empty slot {first} (ev={is_ev})")
+    if len(lot._by_registration) != parked:
+        problems.append(f"{label}: registration index has {len(lot._by_registration)} entries for {parked} vehicles")
+    for color in COLORS:
+        expected = {(is_ev, s.index + 1)
+                    for is_ev, slots in ((False, lot.regular_slots), (True, lot.ev_slots))
+                    for s in slots if s.vehicle is not None and s.vehicle.color == color}
+        if set(lot.slots_with("color", color)) != expected:
+            problems.append(f"{label}: color index for {color} is out of sync")
+    return problems
+
+
+def run_threads(threads: int, target: Callable[[int], None]) -> None:
+    workers = [threading.Thread(target=target, args=(w,)) for w in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+
+
+def stress_lot(args: argparse.Namespace) -> List[str]:
+    lot = ParkingLot(level=1, regular_capacity=args.capacity, ev_capacity=args.capacity // 4)
+    table = HolderTable()
+    ctl = ConcurrentParkingController(lot=lot, allocation_strategy=RegularFirstStrategy())
+
+    def park(is_ev: bool, vehicle) -> Optional[Tuple]:  # type: ignore[no-untyped-def]
+        slot = ctl.park_ev(vehicle) if is_ev else ctl.park(vehicle)
+        return None if slot is None else (is_ev, slot)
+
+    def leave(key: Tuple) -> bool:
+        return ctl.leave(key[1], is_ev=key[0])
+
+    run_threads(args.threads, lambda w: gate(w, args.ops, args.seed, table, park, leave))
+    return table.violations + check_lot(lot, "lot")
+
+
+def stress_spillover(args: argparse.Namespace) -> List[str]:
+    # A small EV pool, so EVs spill into the regular pool while regular arrivals park there
+    lot = ParkingLot(level=1, regular_capacity=args.capacity, ev_capacity=args.capacity // 20)
+    table = HolderTable()
+    spillover = EVSpilloverStrategy()
+    ctl = ConcurrentParkingController(lot=lot, allocation_strategy=spillover, ev_allocation_strategy=spillover)
+
+    def park(is_ev: bool, vehicle) -> Optional[Tuple]:  # type: ignore[no-untyped-def]
+        slot = ctl.park_ev(vehicle) if is_ev else ctl.park(vehicle)
+        # The plate is ours until we leave, so its pool cannot change under us
+        return None if slot is None else lot.find_by_registration(vehicle.registration_number)
+
+    def leave(key: Tuple) -> bool:
+        return ctl.leave(key[1], is_ev=key[0])
+
+    run_threads(args.threads, lambda w: gate(w, args.ops, args.seed, table, park, leave))
+    return table.violations + check_lot(lot, "spillover")
+
+
+def stress_garage(args: argparse.Namespace) -> List[str]:
+    ctl = ConcurrentGarageController()
+    for level in range(1, 4):
+        ctl.add_level(level, args.capacity // 3, args.capacity // 12)
+    table = HolderTable()
+
+    def park(is_ev: bool, vehicle) -> Optional[Tuple]:  # type: ignore[no-untyped-def]
+        placed = ctl.park_ev(vehicle) if is_ev else ctl.park(vehicle)
+        return None if placed is None else (placed[0], is_ev, placed[1])
+
+    def leave(key: Tuple) -> bool:
+        return ctl.leave(key[0], key[2], is_ev=key[1])
+
+    run_threads(args.threads, lambda w: gate(w, args.ops, args.seed, table, park, leave))
+    problems = list(table.violations)
+    garage = ctl.garage
+    for level, lot in garage.levels.items():
+        problems += check_lot(lot, f"level {level}")
+        if garage.free_regular_count(level) != lot.free_regular_count():
+            problems.append(f"level {level}: garage regular counter out of sync")
+        if garage.free_ev_count(level) != lot.free_ev_count():
+            problems.append(f"level {level}: garage EV counter out of sync")
+    parked = sum(len(lot._by_registration) for lot in garage.levels.values())
+    if len(garage._by_registration) != parked:
+        problems.append(f"garage registration index has {len(garage._by_registration)} entries for {parked} vehicles")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=5000, help="operations per thread")
+    parser.add_argument("--capacity", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    # Switch threads as often as possible so races surface quickly
+    sys.setswitchinterval(1e-6)
+    total = args.threads * args.ops
+    failures = 0
+    for name, run in (("lot", stress_lot), ("spillover", stress_spillover), ("garage", stress_garage)):
+        problems = run(args)
+        status = "OK" if not problems else f"FAILED ({len(problems)} problems)"
+        print(f"{name:<9} {args.threads} threads x {args.ops} ops = {total:,} operations: {status}")
+        for p in problems[:10]:
+            print(f"  {p}")
+        failures += bool(problems)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
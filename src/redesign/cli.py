@@ -0,0 +1,148 @@
+"""Headless batch mode: replay a command file through ParkingController.
+
+One command per line; blank lines and lines starting with '#' are skipped::
+
+    create_lot <level> <regular_slots> <ev_slots> [<small_slots> <large_slots>]
+    park <reg> <make> <model> <color> [car|motorcycle|truck]
+    park_ev <reg> <make> <model> <color> [car|bike]
+    leave <slot> [ev]
+    status
+
+Usage: python -m src.redesign.cli COMMANDS_FILE [-o OUTPUT] [--strategy NAME]   ('-' reads stdin)
+
+This module must not import tkinter so it runs on servers without a display.
+"""
+from __future__ import annotations
+import argparse
+import sys
+from typing import Callable, Dict, Iterable, List, Optional, TextIO
+
+from .controllers.parking_controller import ParkingController
+from .factories.vehicle_factory import create_electric, create_vehicle
+from .models.parking_lot import DuplicateRegistrationError, ParkingLot
+from .strategies.registry import create_strategy, strategy_names
+
+# Output lines are collected and written in chunks rather than one write per event
+FLUSH_EVERY = 8192
+
+
+class BatchRunner:
+    def __init__(self, controller: ParkingController, out: TextIO) -> None:
+        self.controller = controller
+        self.out = out
+        self._buffer: List[str] = []
+        self._commands: Dict[str, Callable[[List[str]], str]] = {
+            "create_lot": self._create_lot,
+            "park": self._park,
+            "park_ev": self._park_ev,
+            "leave": self._leave,
+            "status": self._status,
+        }
+
+    def run(self, lines: Iterable[str]) -> int:
+        """Execute every command; returns the number of lines that failed to parse or run."""
+        errors = 0
+        buffer = self._buffer
+        for line_no, line in enumerate(lines, 1):
+            parts = line.split()
+            if not parts or parts[0].startswith("#"):
+                continue
+            handler = self._commands.get(parts[0])
+            try:
+                if handler is None:
+                    raise ValueError(f"Unknown command: {parts[0]}")
+                buffer.append(handler(parts[1:]))
+            except ValueError as e:
+                errors += 1
+                buffer.append(f"line {line_no}: {e}")
+            except IndexError:
+                errors += 1
+                buffer.append(f"line {line_no}: missing argument for {parts[0]}")
+            if len(buffer) >= FLUSH_EVERY:
+                self.flush()
+        self.flush()
+        return errors
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._buffer.append("")
+            self.out.write("\n".join(self._buffer))
+            self._buffer.clear()
+
+    def _create_lot(self, args: List[str]) -> str:
+        level, regular, ev = int(args[0]), int(args[1]), int(args[2])
+        small, large = (int(args[3]), int(args[4])) if len(args) > 4 else (0, 0)
+        self.controller.create_lot(level, regular, ev, small, large)
+        if small or large:
+            return (f"Created lot on level {level} with {regular} regular ({small} small, {large} large)"
+                    f" and {ev} ev slots")
+        return f"Created lot on level {level} with {regular} regular and {ev} ev slots"
+
+    def _park(self, args: List[str]) -> str:
+        kind = args[4] if len(args) > 4 else "car"
+        try:
+            slot = self.controller.park(create_vehicle(kind, args[0], args[1], args[2], args[3]))  # type: ignore[arg-type]
+        except DuplicateRegistrationError as e:
+            return str(e)
+        return _allocated(slot)
+
+    def _park_ev(self, args: List[str]) -> str:
+        kind = args[4] if len(args) > 4 else "car"
+        vehicle = create_electric(kind, args[0], args[1], args[2], args[3])  # type: ignore[arg-type]
+        try:
+            slot = self.controller.park_ev(vehicle)
+        except DuplicateRegistrationError as e:
+            return str(e)
+        return _allocated(slot)
+
+    def _leave(self, args: List[str]) -> str:
+        slot = int(args[0])
+        is_ev = len(args) > 1 and args[1].lower() == "ev"
+        if self.controller.leave(slot, is_ev=is_ev):
+            return f"Slot number {slot} is free"
+        return f"Unable to remove a vehicle from slot {slot}"
+
+    def _status(self, args: List[str]) -> str:
+        lot = self.controller.lot
+        regular, ev = len(lot.regular_slots), len(lot.ev_slots)
+        return (
+            f"Level {lot.level}: {regular - lot.free_regular_count()}/{regular} regular slots occupied, "
+            f"{ev - lot.free_ev_count()}/{ev} ev slots occupied"
+        )
+
+
+def _allocated(slot: object) -> str:
+    if slot is None:
+        return "Sorry, parking is full for that type"
+    return f"Allocated slot number: {slot}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay a parking command file without the Tk UI")
+    parser.add_argument("commands", help="command file, or '-' for stdin")
+    parser.add_argument("-o", "--output", help="write results here instead of stdout")
+    parser.add_argument("--strategy", default="by_type",
+                        choices=strategy_names(),
+                        help="allocation strategy (default: by_type)")
+    args = parser.parse_args(argv)
+
+    controller = ParkingController(
+        lot=ParkingLot(level=1, regular_capacity=0, ev_capacity=0),
+        allocation_strategy=create_strategy(args.strategy),
+    )
+    src = sys.stdin if args.commands == "-" else open(args.commands, encoding="utf-8")
+    out = sys.stdout if args.output is None else open(args.output, "w", encoding="utf-8", buffering=1 << 20)
+    try:
+        errors = BatchRunner(controller, out).run(src)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if out is not sys.stdout:
+            out.close()
+    if errors:
+        print(f"{errors} command(s) failed", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+from __future__ import annotations
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from ..models.garage import Garage
+from ..models.parking_lot import DuplicateRegistrationError, ParkingLot
+from ..models.vehicle import Vehicle
+from ..models.electric_vehicle import ElectricVehicle
+from ..strategies.allocation_strategy import AllocationStrategy, ElectricOnlyStrategy
+from ..services.status_view import StatusViewModel
+from .parking_controller import ParkingController
+
+
+class _PlateRegistry:
+    """Short critical section that claims a plate before any pool lock is taken.
+
+    A plate is "in flight" from reservation until its park call returns, so two
+    gates cannot park the same registration into different pools or levels at once.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pending: Set[str] = set()
+
+    def reserve(self, registration_number: str, is_parked: Callable[[str], bool]) -> None:
+        with self._lock:
+            if registration_number in self._pending or is_parked(registration_number):
+                raise DuplicateRegistrationError(f"Vehicle {registration_number} is already parked")
+            self._pending.add(registration_number)
+
+    def reserve_many(self, vehicles: Sequence[Vehicle], is_parked: Callable[[str], bool]) -> List[bool]:
+        accepted: List[bool] = []
+        with self._lock:
+            for vehicle in vehicles:
+                reg = vehicle.registration_number
+                ok = reg not in self._pending and not is_parked(reg)
+                if ok:
+                    self._pending.add(reg)
+                accepted.append(ok)
+        return accepted
+
+    def release(self, registrations: Iterable[str]) -> None:
+        with self._lock:
+            self._pending.difference_update(registrations)
+
+
+@dataclass
+class ConcurrentParkingController(ParkingController):
+    """ParkingController that is safe to call from several gate threads.
+
+    The regular and EV pools are striped under separate locks, so a regular
+    arrival never waits on an EV arrival. park/park_many allocate with
+    ``allocation_strategy`` under the regular lock and park_ev/park_ev_many
+    with ``ev_allocation_strategy`` under the EV lock; the strategy is not
+    swapped per call as the single-threaded view does. A strategy that may
+    reach the other pool (``spans_pools``, e.g. spillover or vehicle-type
+    routing) allocates with both locks held, so only RegularFirstStrategy and
+    ElectricOnlyStrategy get the striping.
+    """
+
+    ev_allocation_strategy: AllocationStrategy = field(default_factory=ElectricOnlyStrategy)
+    _regular_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _ev_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _plates: _PlateRegistry = field(default_factory=_PlateRegistry, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        # A deferred index build would walk both pools while only one pool lock is held
+        self.lot.ensure_indexes()
+
+    def _pool_lock(self, is_ev: bool) -> threading.Lock:
+        return self._ev_lock if is_ev else self._regular_lock
+
+    @contextmanager
+    def _allocation_locks(self, strategy: AllocationStrategy, is_ev: bool) -> Iterator[None]:
+        if strategy.spans_pools:
+            # Lock order is always regular then EV
+            with self._regular_lock, self._ev_lock:
+                yield
+        else:
+            with self._pool_lock(is_ev):
+                yield
+
+    def _is_parked(self, registration_number: str) -> bool:
+        return self.lot.find_by_registration(registration_number) is not None
+
+    @contextmanager
+    def quiesced(self) -> Iterator[None]:
+        """Hold both pool locks, so no park or leave is in flight while inside.
+
+        Pass it as WriteAheadLog.attach's ``quiesced``.
+        """
+        # Lock order is always regular then EV
+        with self._regular_lock, self._ev_lock:
+            yield
+
+    def create_lot(self, level: int, regular_capacity: int, ev_capacity: int,
+                   small_capacity: int = 0, large_capacity: int = 0) -> None:
+        with self.quiesced():
+            super().create_lot(level, regular_capacity, ev_capacity, small_capacity, large_capacity)
+            self.lot.ensure_indexes()
+
+    def status_view(self) -> StatusViewModel:
+        # Seeding reads both pools, so it runs with both locks held
+        with self.quiesced():
+            return super().status_view()
+
+    def park(self, vehicle: Vehicle) -> Optional[int]:
+        return self._park(vehicle, is_ev=False)
+
+    def park_ev(self, vehicle: ElectricVehicle) -> Optional[int]:
+        return self._park(vehicle, is_ev=True)
+
+    def _park(self, vehicle: Vehicle, is_ev: bool) -> Optional[int]:
+        reg = vehicle.registration_number
+        self._plates.reserve(reg, self._is_parked)
+        try:
+            strategy = self.ev_allocation_strategy if is_ev else self.allocation_strategy
+            with self._allocation_locks(strategy, is_ev):
+                return strategy.allocate(self.lot, vehicle)
+        finally:
+            self._plates.release((reg,))
+
+    def park_many(self, vehicles: Sequence[Vehicle]) -> List[Optional[int]]:
+        return self._park_many(vehicles, is_ev=False)
+
+    def park_ev_many(self, vehicles: Sequence[ElectricVehicle]) -> List[Optional[int]]:
+        return self._park_many(vehicles, is_ev=True)
+
+    def _park_many(self, vehicles: Sequence[Vehicle], is_ev: bool) -> List[Optional[int]]:
+        accepted = self._plates.reserve_many(vehicles, self._is_parked)
+        batch = [v for v, ok in zip(vehicles, accepted) if ok]
+        try:
+            strategy = self.ev_allocation_strategy if is_ev else self.allocation_strategy
+            with self._allocation_locks(strategy, is_ev):
+                slots = iter(strategy.allocate_many(self.lot, batch))
+        finally:
+            self._plates.release(v.registration_number for v in batch)
+        return [next(slots) if ok else None for ok in accepted]
+
+    def leave(self, slot_number: int, is_ev: bool) -> bool:
+        with self._pool_lock(is_ev):
+            return self.lot.leave(slot_number, is_ev)
+
+    def leave_many(self, slot_numbers: Iterable[int], is_ev: bool) -> List[bool]:
+        with self._pool_lock(is_ev):
+            return self.lot.leave_many(slot_numbers, is_ev)
+
+
+@dataclass
+class ConcurrentGarageController:
+    """Thread-safe front for a multi-level Garage with one lock per (level, pool).
+
+    Arrivals walk the levels that still report capacity and lock only the level
+    they try, so gates filling different levels or pools never contend.
+    """
+
+    garage: Garage = field(default_factory=Garage)
+    _level_locks: Dict[Tuple[int, bool], threading.Lock] = field(default_factory=dict, init=False, repr=False)
+    _setup_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _plates: _PlateRegistry = field(default_factory=_PlateRegistry, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        for level in self.garage.levels:
+            self._add_locks(level)
+
+    def _add_locks(self, level: int) -> None:
+        self._level_locks[(level, False)] = threading.Lock()
+        self._level_locks[(level, True)] = threading.Lock()
+
+    def add_level(self, level: int, regular_capacity: int, ev_capacity: int, compact: bool = False,
+                  small_capacity: int = 0, large_capacity: int = 0) -> ParkingLot:
+        with self._setup_lock:
+            # Locks must exist before the level becomes visible to arrivals
+            if level not in self.garage.levels:
+                self._add_locks(level)
+            return self.garage.add_level(level, regular_capacity, ev_capacity, compact=compact,
+                                         small_capacity=small_capacity, large_capacity=large_capacity)
+
+    def _is_parked(self, registration_number: str) -> bool:
+        return self.garage.find_by_registration(registration_number) is not None
+
+    def park(self, vehicle: Vehicle) -> Optional[Tuple[int, int]]:
+        return self._park(vehicle, is_ev=False)
+
+    def park_ev(self, vehicle: ElectricVehicle) -> Optional[Tuple[int, int]]:
+        return self._park(vehicle, is_ev=True)
+
+    def _park(self, vehicle: Vehicle, is_ev: bool) -> Optional[Tuple[int, int]]:
+        reg = vehicle.registration_number
+        self._plates.reserve(reg, self._is_parked)
+        try:
+            # Counters are read unlocked as a hint; park_on_level re-checks under the level lock
+            for level in self.garage.levels_with_capacity(is_ev):
+                with self._level_locks[(level, is_ev)]:
+                    slot = self.garage.park_on_level(level, vehicle, is_ev)
+                if slot is not None:
+                    return level, slot
+            return None
+        finally:
+            self._plates.release((reg,))
+
+    def leave(self, level: int, slot_number: int, is_ev: bool) -> bool:
+        lock = self._level_locks.get((level, is_ev))
+        if lock is None:
+            return False
+        with lock:
+            return self.garage.leave(level, slot_number, is_ev)
@@ -1,22 +1,52 @@
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Sequence
 
 from ..models.parking_lot import ParkingLot
 from ..models.vehicle import Vehicle
 from ..models.electric_vehicle import ElectricVehicle
 from ..strategies.allocation_strategy import AllocationStrategy
+from ..services.event_bus import EventBus, EventPublisher
+from ..services.repository import ParkingLotRepository, RepositoryWriter
+from ..services.status_view import StatusViewModel
 
 
 @dataclass
 class ParkingController:
     lot: ParkingLot
     allocation_strategy: AllocationStrategy
+    # When set, the lot layout is saved on create_lot and every park/leave is mirrored into it
+    repository: Optional[ParkingLotRepository] = None
+    # When set, every park/leave publishes VehicleParked/VehicleLeft on it
+    event_bus: Optional[EventBus] = None
+    _status: Optional[StatusViewModel] = field(default=None, init=False, repr=False)
 
-    def create_lot(self, level: int, regular_capacity: int, ev_capacity: int) -> None:
-        self.lot.level = level
-        self.lot.regular_capacity = regular_capacity
-        self.lot.ev_capacity = ev_capacity
-        self.lot.__post_init__()
+    def __post_init__(self) -> None:
+        if self.repository is not None:
+            self.lot.listeners.append(RepositoryWriter(self.repository))
+        if self.event_bus is not None:
+            self.lot.listeners.append(EventPublisher(self.event_bus))
+
+    @classmethod
+    def from_repository(cls, repository: ParkingLotRepository, level: int,
+                        allocation_strategy: AllocationStrategy, compact: bool = False, **kwargs):
+        """Controller over the lot stored for ``level``, or an empty lot if none is stored yet."""
+        lot = repository.load_lot(level, compact=compact)
+        if lot is None:
+            lot = ParkingLot(level=level, regular_capacity=0, ev_capacity=0, compact=compact)
+        return cls(lot=lot, allocation_strategy=allocation_strategy, repository=repository, **kwargs)
+
+    def create_lot(self, level: int, regular_capacity: int, ev_capacity: int,
+                   small_capacity: int = 0, large_capacity: int = 0) -> None:
+        self.lot.reset(level, regular_capacity, ev_capacity, small_capacity, large_capacity)
+        if self.repository is not None:
+            self.repository.save_lot(self.lot)
+
+    def status_view(self) -> StatusViewModel:
+        """Status report kept current by park/leave; seeded from the lot on first use."""
+        if self._status is None:
+            self._status = StatusViewModel()
+            self._status.attach(self.lot)
+        return self._status
 
     def park(self, vehicle: Vehicle) -> Optional[int]:
         return self.allocation_strategy.allocate(self.lot, vehicle)  # type: ignore[arg-type]
@@ -26,3 +56,10 @@ class ParkingController:
 
     def leave(self, slot_number: int, is_ev: bool) -> bool:
         return self.lot.leave(slot_number, is_ev)
+
+    def park_many(self, vehicles: Sequence[Vehicle]) -> List[Optional[int]]:
+        """Park a burst of vehicles with one strategy dispatch; None marks a rejected vehicle."""
+        return self.allocation_strategy.allocate_many(self.lot, vehicles)
+
+    def leave_many(self, slot_numbers: Iterable[int], is_ev: bool) -> List[bool]:
+        return self.lot.leave_many(slot_numbers, is_ev)
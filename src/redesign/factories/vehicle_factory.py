@@ -1,3 +1,4 @@
+import sys
 from typing import Literal
 from ..models.vehicle import Car, Motorcycle, Truck, Vehicle
 from ..models.electric_vehicle import ElectricBike, ElectricCar, ElectricVehicle
@@ -5,9 +6,14 @@ from ..models.electric_vehicle import ElectricBike, ElectricCar, ElectricVehicle
 
 VehicleKind = Literal["car", "motorcycle", "truck"]
 
+# make/model/color repeat heavily across a fleet, so every vehicle shares one
+# interned copy of each value; registration numbers are unique and left alone
+_intern = sys.intern
+
 
 def create_vehicle(kind: VehicleKind, reg: str, make: str, model: str, color: str) -> Vehicle:
     k = kind.lower()
+    make, model, color = _intern(make), _intern(model), _intern(color)
     if k == "car":
         return Car(registration_number=reg, make=make, model=model, color=color)
     if k == "motorcycle":
@@ -19,8 +25,34 @@ def create_vehicle(kind: VehicleKind, reg: str, make: str, model: str, color: st
 
 def create_electric(kind: Literal["car", "bike"], reg: str, make: str, model: str, color: str) -> ElectricVehicle:
     k = kind.lower()
+    make, model, color = _intern(make), _intern(model), _intern(color)
     if k == "car":
         return ElectricCar(registration_number=reg, make=make, model=model, color=color)
     if k == "bike":
         return ElectricBike(registration_number=reg, make=make, model=model, color=color)
     raise ValueError(f"Unsupported electric vehicle kind: {kind}")
+
+
+# Stable kind codes for persistence: position in this tuple is the on-disk code
+PERSISTED_KINDS = ("car", "motorcycle", "truck", "ev_car", "ev_bike")
+_KIND_BY_TYPE = {
+    "Car": "car",
+    "Motorcycle": "motorcycle",
+    "Truck": "truck",
+    "ElectricCar": "ev_car",
+    "ElectricBike": "ev_bike",
+}
+
+
+def kind_of(vehicle: Vehicle) -> str:
+    """Persisted kind of a vehicle, the inverse of create_from_kind."""
+    try:
+        return _KIND_BY_TYPE[vehicle.get_type()]
+    except KeyError:
+        raise ValueError(f"Cannot persist vehicle type: {vehicle.get_type()}") from None
+
+
+def create_from_kind(kind: str, reg: str, make: str, model: str, color: str) -> Vehicle:
+    if kind.startswith("ev_"):
+        return create_electric(kind[3:], reg, make, model, color)  # type: ignore[arg-type]
+    return create_vehicle(kind, reg, make, model, color)  # type: ignore[arg-type]
@@ -0,0 +1,132 @@
+from __future__ import annotations
+from array import array
+from typing import Iterator, List, Optional, Sequence, Tuple, Union, overload
+
+from .vehicle import Vehicle
+from .free_slot_index import BitmapFreeIndex
+
+
+class CompactSlotView:
+    """On-demand ParkingSlot stand-in that reads and writes through to a CompactSlots store."""
+
+    __slots__ = ("_store", "index")
+
+    def __init__(self, store: "CompactSlots", index: int) -> None:
+        self._store = store
+        self.index = index
+
+    @property
+    def is_electric(self) -> bool:
+        return self._store.is_electric
+
+    @property
+    def size(self) -> str:
+        return self._store.size_of(self.index)
+
+    @property
+    def vehicle(self) -> Optional[Vehicle]:
+        return self._store.get_vehicle(self.index)
+
+    @vehicle.setter
+    def vehicle(self, vehicle: Optional[Vehicle]) -> None:
+        self._store.set_vehicle(self.index, vehicle)
+
+    def is_empty(self) -> bool:
+        return not self._store.is_occupied(self.index)
+
+    def __repr__(self) -> str:
+        return (f"CompactSlotView(index={self.index}, is_electric={self.is_electric}, vehicle={self.vehicle!r}, "
+                f"size={self.size!r})")
+
+
+class CompactSlots(Sequence[CompactSlotView]):
+    """Array-backed slot storage: an occupancy bitmap plus a parallel vehicle-id array.
+
+    Only occupied slots hold a Python object (the vehicle itself), so an empty
+    lot costs one bit plus four bytes per slot instead of one dataclass each.
+    """
+
+    def __init__(self, capacity: int, is_electric: bool) -> None:
+        self.is_electric = is_electric
+        self._capacity = capacity
+        self._occupied = bytearray((capacity + 7) // 8)
+        # 0 means empty; other ids index into the _vehicles table
+        self._vehicle_ids = array("I", bytes(4 * capacity))
+        self._vehicles: List[Optional[Vehicle]] = [None]
+        self._free_ids: List[int] = []
+        self._count = 0
+        # Leading small and trailing large slots; set by the owning ParkingLot
+        self.small = 0
+        self.large = 0
+
+    def __len__(self) -> int:
+        return self._capacity
+
+    @overload
+    def __getitem__(self, idx: int) -> CompactSlotView: ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> List[CompactSlotView]: ...
+
+    def __getitem__(self, idx: Union[int, slice]) -> Union[CompactSlotView, List[CompactSlotView]]:
+        if isinstance(idx, slice):
+            return [CompactSlotView(self, i) for i in range(*idx.indices(self._capacity))]
+        if idx < 0:
+            idx += self._capacity
+        if not 0 <= idx < self._capacity:
+            raise IndexError("slot index out of range")
+        return CompactSlotView(self, idx)
+
+    def size_of(self, idx: int) -> str:
+        if idx < self.small:
+            return "small"
+        return "large" if idx >= self._capacity - self.large else "medium"
+
+    def is_occupied(self, idx: int) -> bool:
+        return bool(self._occupied[idx >> 3] & (1 << (idx & 7)))
+
+    def get_vehicle(self, idx: int) -> Optional[Vehicle]:
+        vid = self._vehicle_ids[idx]
+        return self._vehicles[vid] if vid else None
+
+    def set_vehicle(self, idx: int, vehicle: Optional[Vehicle]) -> None:
+        old = self._vehicle_ids[idx]
+        if old:
+            self._vehicles[old] = None
+            self._free_ids.append(old)
+            self._count -= 1
+        if vehicle is None:
+            self._vehicle_ids[idx] = 0
+            self._occupied[idx >> 3] &= ~(1 << (idx & 7)) & 0xFF
+            return
+        if self._free_ids:
+            vid = self._free_ids.pop()
+            self._vehicles[vid] = vehicle
+        else:
+            vid = len(self._vehicles)
+            self._vehicles.append(vehicle)
+        self._count += 1
+        self._vehicle_ids[idx] = vid
+        self._occupied[idx >> 3] |= 1 << (idx & 7)
+
+    def free_index(self, start: int = 0, stop: Optional[int] = None) -> BitmapFreeIndex:
+        """Free-slot index over this store's occupancy bitmap, shared rather than copied.
+
+        With ``start``/``stop`` only the slots in that range are handed out.
+        """
+        stop = self._capacity if stop is None else stop
+        free = self._capacity - self._count if start == 0 and stop == self._capacity else None
+        return BitmapFreeIndex(self._occupied, start, stop, free=free)
+
+    def occupied(self) -> Iterator[Tuple[int, Vehicle]]:
+        """Yield (index, vehicle) for every occupied slot in index order."""
+        if not self._count:
+            return
+        ids = self._vehicle_ids
+        for byte_no, byte in enumerate(self._occupied):
+            if not byte:
+                continue
+            base = byte_no << 3
+            for bit in range(8):
+                if byte & (1 << bit):
+                    yield base + bit, self._vehicles[ids[base + bit]]  # type: ignore[misc]
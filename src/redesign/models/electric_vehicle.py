@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from .vehicle import Vehicle
 
 
-@dataclass
+@dataclass(slots=True)
 class ElectricVehicle(Vehicle):
     charge_percent: int = 0
 
@@ -10,13 +10,13 @@ class ElectricVehicle(Vehicle):
         return "ElectricVehicle"
 
 
-@dataclass
+@dataclass(slots=True)
 class ElectricCar(ElectricVehicle):
     def get_type(self) -> str:
         return "ElectricCar"
 
 
-@dataclass
+@dataclass(slots=True)
 class ElectricBike(ElectricVehicle):
     def get_type(self) -> str:
         return "ElectricBike"
@@ -0,0 +1,169 @@
+from __future__ import annotations
+import heapq
+import re
+from typing import Iterable, List, Optional, Set, Union
+
+
+class FreeSlotIndex:
+    """Min-heap of free slot indices so the lowest free slot is found in O(log n).
+
+    discard() removes an arbitrary index lazily: it is remembered and skipped
+    when it reaches the top of the heap, so every operation stays O(log n).
+    """
+
+    def __init__(self, free: Iterable[int] = ()) -> None:
+        self._heap: List[int] = list(free)
+        heapq.heapify(self._heap)
+        # Indices still in the heap that are no longer free
+        self._removed: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._heap) - len(self._removed)
+
+    def _skip_removed(self) -> None:
+        heap, removed = self._heap, self._removed
+        while heap and heap[0] in removed:
+            removed.remove(heapq.heappop(heap))
+
+    def peek(self) -> Optional[int]:
+        if self._removed:
+            self._skip_removed()
+        return self._heap[0] if self._heap else None
+
+    def pop(self) -> Optional[int]:
+        if self._removed:
+            self._skip_removed()
+        if not self._heap:
+            return None
+        return heapq.heappop(self._heap)
+
+    def push(self, idx: int) -> None:
+        if idx in self._removed:
+            # Still physically in the heap; just make it visible again
+            self._removed.remove(idx)
+        else:
+            heapq.heappush(self._heap, idx)
+
+    def discard(self, idx: int) -> None:
+        """Mark a free index as taken without popping it."""
+        self._removed.add(idx)
+
+    def pop_many(self, count: int) -> List[int]:
+        """Remove and return up to ``count`` lowest free indices in ascending order."""
+        if self._removed:
+            self._heap = [i for i in self._heap if i not in self._removed]
+            heapq.heapify(self._heap)
+            self._removed.clear()
+        heap = self._heap
+        if count >= len(heap) // 8:
+            # One sort beats many heappops for large runs; a sorted list is still a valid heap
+            heap.sort()
+            run = heap[:count]
+            del heap[:count]
+            return run
+        pop = heapq.heappop
+        return [pop(heap) for _ in range(count)]
+
+
+# First byte of a bitmap that still has a zero (free) bit
+_FREE_BYTE = re.compile(rb"[^\xff]")
+
+
+class BitmapFreeIndex:
+    """Free-slot index over a slot store's taken-bitmap: one bit per slot instead of one int object.
+
+    The bitmap is the store's own (a bytearray, or a view into a mapped
+    snapshot), shared rather than copied: pop and discard set a slot's bit and
+    push clears it, as the store itself does when the slot changes. Only
+    slots in [start, stop) are handed out. The lowest free slot is found with
+    a C-level byte search from a low-water mark, and the free count is taken
+    word by word on first use, so opening an index reads nothing up front.
+    """
+
+    def __init__(self, taken: Union[bytearray, memoryview], start: int, stop: int,
+                 free: Optional[int] = None) -> None:
+        self._taken = taken
+        self._start = start
+        self._stop = stop
+        self._end = (stop + 7) >> 3
+        # Bits of the first and last byte that lie outside the range count as taken
+        self._start_byte = start >> 3
+        self._start_mask = (1 << (start & 7)) - 1
+        self._stop_byte = stop >> 3 if stop & 7 else -1
+        self._stop_mask = (0xFF << (stop & 7)) & 0xFF
+        # Callers that already track the occupied count pass it to skip the count
+        self._free = free
+        self._low = self._start_byte
+
+    def __len__(self) -> int:
+        if self._free is None:
+            self._free = self._count_free()
+        return self._free
+
+    def _count_free(self) -> int:
+        start, stop = self._start, self._stop
+        lo, hi = (start + 7) >> 3, stop >> 3
+        if lo >= hi:
+            edges: Iterable[int] = range(start, stop)
+            taken = 0
+        else:
+            edges = [*range(start, lo << 3), *range(hi << 3, stop)]
+            body = memoryview(self._taken)[lo:hi]
+            words = len(body) & ~7
+            taken = sum(map(int.bit_count, body[:words].cast("Q"))) + sum(map(int.bit_count, body[words:]))
+        bitmap = self._taken
+        taken += sum(1 for idx in edges if bitmap[idx >> 3] & (1 << (idx & 7)))
+        return stop - start - taken
+
+    def peek(self) -> Optional[int]:
+        taken = self._taken
+        pos = self._low
+        while True:
+            match = _FREE_BYTE.search(taken, pos, self._end)
+            if match is None:
+                self._low = self._end
+                return None
+            byte_no = match.start()
+            byte = taken[byte_no]
+            if byte_no == self._start_byte:
+                byte |= self._start_mask
+            if byte_no == self._stop_byte:
+                byte |= self._stop_mask
+            if byte != 0xFF:
+                self._low = byte_no
+                return (byte_no << 3) + (((byte + 1) & ~byte).bit_length() - 1)
+            # Only bits outside the range were free here
+            pos = byte_no + 1
+
+    def pop(self) -> Optional[int]:
+        idx = self.peek()
+        if idx is not None:
+            self._taken[idx >> 3] |= 1 << (idx & 7)
+            if self._free is not None:
+                self._free -= 1
+        return idx
+
+    def push(self, idx: int) -> None:
+        self._taken[idx >> 3] &= ~(1 << (idx & 7)) & 0xFF
+        if self._free is not None:
+            self._free += 1
+        if idx >> 3 < self._low:
+            self._low = idx >> 3
+
+    def discard(self, idx: int) -> None:
+        """Mark a free index as taken without popping it."""
+        self._taken[idx >> 3] |= 1 << (idx & 7)
+        if self._free is not None:
+            self._free -= 1
+
+    def pop_many(self, count: int) -> List[int]:
+        run: List[int] = []
+        for _ in range(count):
+            idx = self.pop()
+            if idx is None:
+                break
+            run.append(idx)
+        return run
+
+
+FreeIndex = Union[FreeSlotIndex, BitmapFreeIndex]
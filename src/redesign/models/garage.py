@@ -0,0 +1,131 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .vehicle import Vehicle
+from .electric_vehicle import ElectricVehicle
+from .parking_listener import ListenerError
+from .parking_lot import DuplicateRegistrationError, ParkingLot
+
+
+@dataclass
+class Garage:
+    """Multi-level aggregate: one ParkingLot per level plus per-level free counters.
+
+    Levels must be mutated through the Garage so the counters and the global
+    registration index stay in step with the lots. Each counter is only touched
+    by operations on its own level and pool, which is what lets the concurrent
+    controller lock per level instead of per garage.
+    """
+
+    levels: Dict[int, ParkingLot] = field(default_factory=dict)
+    # level -> free slot count, per slot type
+    _free_regular: Dict[int, int] = field(default_factory=dict, init=False, repr=False)
+    _free_ev: Dict[int, int] = field(default_factory=dict, init=False, repr=False)
+    # Level numbers in allocation order (lowest level first)
+    _order: List[int] = field(default_factory=list, init=False, repr=False)
+    # registration_number -> (level, is_ev, slot_number)
+    _by_registration: Dict[str, Tuple[int, bool, int]] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        levels, self.levels = self.levels, {}
+        for lot in levels.values():
+            self._attach(lot)
+
+    def add_level(self, level: int, regular_capacity: int, ev_capacity: int, compact: bool = False,
+                  small_capacity: int = 0, large_capacity: int = 0) -> ParkingLot:
+        if level in self.levels:
+            raise ValueError(f"Level {level} already exists")
+        lot = ParkingLot(level=level, regular_capacity=regular_capacity, ev_capacity=ev_capacity, compact=compact,
+                         small_capacity=small_capacity, large_capacity=large_capacity)
+        self._attach(lot)
+        return lot
+
+    def _attach(self, lot: ParkingLot) -> None:
+        for is_ev in (False, True):
+            for slot_number, vehicle in lot.occupied(is_ev):
+                self._check_not_parked(vehicle)
+                self._claim(vehicle, lot.level, is_ev, slot_number)
+        self.levels[lot.level] = lot
+        self._order = sorted(self.levels)
+        self._free_regular[lot.level] = lot.free_regular_count()
+        self._free_ev[lot.level] = lot.free_ev_count()
+
+    def free_regular_count(self, level: Optional[int] = None) -> int:
+        return sum(self._free_regular.values()) if level is None else self._free_regular[level]
+
+    def free_ev_count(self, level: Optional[int] = None) -> int:
+        return sum(self._free_ev.values()) if level is None else self._free_ev[level]
+
+    def find_by_registration(self, registration_number: str) -> Optional[Tuple[int, bool, int]]:
+        """Return (level, is_ev, slot_number) for a parked registration, or None."""
+        return self._by_registration.get(registration_number)
+
+    def _check_not_parked(self, vehicle: Vehicle) -> None:
+        if vehicle.registration_number in self._by_registration:
+            raise DuplicateRegistrationError(f"Vehicle {vehicle.registration_number} is already parked")
+
+    def _claim(self, vehicle: Vehicle, level: int, is_ev: bool, slot_number: int) -> None:
+        self._by_registration[vehicle.registration_number] = (level, is_ev, slot_number)
+
+    def levels_with_capacity(self, is_ev: bool) -> Iterator[int]:
+        """Yield level numbers with a free slot of the given type, lowest level first."""
+        free = self._free_ev if is_ev else self._free_regular
+        for level in self._order:
+            if free[level]:
+                yield level
+
+    def park_on_level(self, level: int, vehicle: Vehicle, is_ev: bool) -> Optional[int]:
+        """Park on one specific level and pool; returns the slot number or None if that pool is full."""
+        self._check_not_parked(vehicle)
+        lot = self.levels[level]
+        try:
+            slot = lot.park_ev(vehicle) if is_ev else lot.park_regular(vehicle)  # type: ignore[arg-type]
+        except ListenerError as e:
+            # The vehicle is parked; keep the counters in step before reporting the listener failure
+            self._parked(vehicle, level, is_ev, e.result)
+            raise
+        if slot is None:
+            return None
+        self._parked(vehicle, level, is_ev, slot)
+        return slot
+
+    def _parked(self, vehicle: Vehicle, level: int, is_ev: bool, slot: int) -> None:
+        self._claim(vehicle, level, is_ev, slot)
+        (self._free_ev if is_ev else self._free_regular)[level] -= 1
+
+    def park_regular(self, vehicle: Vehicle) -> Optional[Tuple[int, int]]:
+        """Park on the lowest level with a free regular slot; returns (level, slot_number)."""
+        return self._park_first_fit(vehicle, is_ev=False)
+
+    def park_ev(self, vehicle: ElectricVehicle) -> Optional[Tuple[int, int]]:
+        """Park on the lowest level with a free EV slot; returns (level, slot_number)."""
+        return self._park_first_fit(vehicle, is_ev=True)
+
+    def _park_first_fit(self, vehicle: Vehicle, is_ev: bool) -> Optional[Tuple[int, int]]:
+        self._check_not_parked(vehicle)
+        for level in self.levels_with_capacity(is_ev):
+            slot = self.park_on_level(level, vehicle, is_ev)
+            if slot is not None:
+                return level, slot
+        return None
+
+    def leave(self, level: int, slot_number: int, is_ev: bool) -> bool:
+        lot = self.levels.get(level)
+        if lot is None:
+            return False
+        vehicle = lot.vehicle_at(slot_number, is_ev)
+        if vehicle is None:
+            return False
+        try:
+            if not lot.leave(slot_number, is_ev):
+                return False
+        except ListenerError:
+            self._left(vehicle, level, is_ev)
+            raise
+        self._left(vehicle, level, is_ev)
+        return True
+
+    def _left(self, vehicle: Vehicle, level: int, is_ev: bool) -> None:
+        del self._by_registration[vehicle.registration_number]
+        (self._free_ev if is_ev else self._free_regular)[level] += 1
@@ -0,0 +1,209 @@
+"""Fixed-layout lot snapshot that is opened with mmap instead of deserialized.
+
+File layout (little-endian, every section 8-byte aligned)::
+
+    header           magic, level, capacities, per-pool vehicle counts, small/large
+                     regular slot counts, section offsets
+    regular bitmap   one occupancy bit per regular slot
+    ev bitmap        one occupancy bit per EV slot
+    regular ids      u32 per regular slot: 0 = empty, k = vehicle record k
+    ev ids           u32 per EV slot
+    vehicle table    fixed records: kind, then pool offsets of reg, make, model, color
+    registration     open-addressing hash table, a power of two of (vehicle id,
+    table            slot index << 1 | is_ev) entries at least twice the vehicle
+                     count, probed linearly from crc32(reg) (0 = empty)
+    string pool      u8-length-prefixed UTF-8 strings, each distinct string stored once
+
+The file is mapped copy-on-write, so a lot opened from it can keep parking and
+leaving without touching the file: only the pages it writes are copied. Free
+slot and occupancy queries read the mapped bitmaps and id arrays directly, and
+a vehicle record is decoded only when that slot's vehicle is first asked for.
+A registration lookup probes the hash table and compares the registration
+bytes in the string pool, so it decodes nothing either.
+"""
+from __future__ import annotations
+import mmap
+import os
+import struct
+import sys
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..factories.vehicle_factory import PERSISTED_KINDS, create_from_kind, kind_of
+from .compact_slots import CompactSlots
+from .vehicle import Vehicle
+
+_MAGIC = b"PLMMAP03"
+# magic, level, regular/ev capacity, regular/ev vehicle count, small/large regular slots,
+# seven section offsets, file size
+_HEADER = struct.Struct("<8sqIIIIII8Q")
+_RECORD = struct.Struct("<B3x4I")
+# Registration table entry: vehicle id, slot index << 1 | is_ev
+_ENTRY = struct.Struct("<II")
+
+Occupied = Iterable[Tuple[int, Vehicle]]
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def _table_size(vehicles: int) -> int:
+    """Registration table entries: a power of two, at most half full."""
+    return 1 << (2 * vehicles).bit_length()
+
+
+def _layout(regular: int, ev: int, vehicles: int) -> List[int]:
+    """Section offsets: regular bitmap, ev bitmap, regular ids, ev ids, vehicle table, registration table, pool."""
+    offsets = [_align(_HEADER.size)]
+    for size in ((regular + 7) // 8, (ev + 7) // 8, 4 * regular, 4 * ev, _RECORD.size * vehicles,
+                 _ENTRY.size * _table_size(vehicles)):
+        offsets.append(_align(offsets[-1] + size))
+    return offsets
+
+
+def write_snapshot(path: str, level: int, regular_capacity: int, ev_capacity: int,
+                   regular: Occupied, ev: Occupied, small_capacity: int = 0, large_capacity: int = 0) -> None:
+    """Atomically write a mapped snapshot from (slot index, vehicle) pairs of each pool."""
+    pools = (list(regular), list(ev))
+    count = len(pools[0]) + len(pools[1])
+    offsets = _layout(regular_capacity, ev_capacity, count)
+    pool = bytearray()
+    interned: Dict[str, int] = {}
+
+    def pooled(value: str) -> int:
+        pos = interned.get(value)
+        if pos is None:
+            raw = value.encode("utf-8")
+            if len(raw) > 255:
+                raise ValueError(f"Field too long to snapshot: {value[:20]}...")
+            pos = interned[value] = len(pool)
+            pool.append(len(raw))
+            pool.extend(raw)
+        return pos
+
+    buf = bytearray(offsets[6])
+    records = bytearray()
+    mask = _table_size(count) - 1
+    vid = 0
+    sections = ((offsets[0], offsets[2]), (offsets[1], offsets[3]))
+    for is_ev, (bitmap_at, ids_at), occupied in zip((0, 1), sections, pools):
+        for idx, vehicle in occupied:
+            vid += 1
+            buf[bitmap_at + (idx >> 3)] |= 1 << (idx & 7)
+            struct.pack_into("<I", buf, ids_at + 4 * idx, vid)
+            records += _RECORD.pack(PERSISTED_KINDS.index(kind_of(vehicle)), pooled(vehicle.registration_number),
+                                    pooled(vehicle.make), pooled(vehicle.model), pooled(vehicle.color))
+            pos = zlib.crc32(vehicle.registration_number.encode("utf-8")) & mask
+            while struct.unpack_from("<I", buf, offsets[5] + _ENTRY.size * pos)[0]:
+                pos = (pos + 1) & mask
+            _ENTRY.pack_into(buf, offsets[5] + _ENTRY.size * pos, vid, idx << 1 | is_ev)
+    buf[offsets[4]:offsets[4] + len(records)] = records
+    buf += pool
+    _HEADER.pack_into(buf, 0, _MAGIC, level, regular_capacity, ev_capacity, len(pools[0]), len(pools[1]),
+                      small_capacity, large_capacity, *offsets, len(buf))
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(buf)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class _MappedVehicleTable:
+    """Vehicle table for MappedSlots: file records are decoded on first access.
+
+    Supports the list operations CompactSlots uses; vehicles parked after the
+    file was opened, and decoded records, live in an overlay dict.
+    """
+
+    def __init__(self, buf: mmap.mmap, records_at: int, table_at: int, pool_at: int, count: int) -> None:
+        self._buf = buf
+        self._records_at = records_at
+        self._table_at = table_at
+        self._mask = _table_size(count) - 1
+        self._pool_at = pool_at
+        self._overlay: Dict[int, Optional[Vehicle]] = {}
+        self._next = count + 1
+
+    def __len__(self) -> int:
+        return self._next
+
+    def __getitem__(self, vid: int) -> Optional[Vehicle]:
+        try:
+            return self._overlay[vid]
+        except KeyError:
+            vehicle = self._overlay[vid] = self._decode(vid)
+            return vehicle
+
+    def __setitem__(self, vid: int, vehicle: Optional[Vehicle]) -> None:
+        self._overlay[vid] = vehicle
+
+    def append(self, vehicle: Optional[Vehicle]) -> None:
+        self._overlay[self._next] = vehicle
+        self._next += 1
+
+    def locate(self, registration_number: str) -> Optional[Tuple[bool, int]]:
+        """(is_ev, slot_number) the registration was parked at when the file was written, or None."""
+        raw = registration_number.encode("utf-8")
+        buf, mask = self._buf, self._mask
+        pos = zlib.crc32(raw) & mask
+        while True:
+            vid, location = _ENTRY.unpack_from(buf, self._table_at + _ENTRY.size * pos)
+            if not vid:
+                return None
+            start = self._pool_at + _RECORD.unpack_from(buf, self._records_at + _RECORD.size * (vid - 1))[1]
+            if buf[start + 1:start + 1 + buf[start]] == raw:
+                return bool(location & 1), (location >> 1) + 1
+            pos = (pos + 1) & mask
+
+    def _decode(self, vid: int) -> Vehicle:
+        kind, *positions = _RECORD.unpack_from(self._buf, self._records_at + _RECORD.size * (vid - 1))
+        fields = []
+        for pos in positions:
+            start = self._pool_at + pos
+            fields.append(self._buf[start + 1:start + 1 + self._buf[start]].decode("utf-8"))
+        return create_from_kind(PERSISTED_KINDS[kind], *fields)
+
+
+class MappedSlots(CompactSlots):
+    """CompactSlots whose occupancy bitmap and vehicle-id array are views into a mapped snapshot."""
+
+    def __init__(self, buf: mmap.mmap, capacity: int, is_electric: bool, bitmap_at: int, ids_at: int,
+                 count: int, table: _MappedVehicleTable) -> None:
+        self.is_electric = is_electric
+        self._capacity = capacity
+        view = memoryview(buf)
+        self._occupied = view[bitmap_at:bitmap_at + (capacity + 7) // 8]  # type: ignore[assignment]
+        self._vehicle_ids = view[ids_at:ids_at + 4 * capacity].cast("I")  # type: ignore[assignment]
+        # The regular and EV pools share one table, so vehicle ids stay unique across both
+        self._vehicles = table  # type: ignore[assignment]
+        self._free_ids = []
+        self._count = count
+        self.small = 0
+        self.large = 0
+
+    def snapshot_location(self, registration_number: str) -> Optional[Tuple[bool, int]]:
+        """Where the file put a registration, in either pool; the slot may have changed since."""
+        return self._vehicles.locate(registration_number)  # type: ignore[attr-defined]
+
+
+def open_snapshot(path: str) -> Tuple[int, MappedSlots, MappedSlots]:
+    """Map a snapshot copy-on-write; returns (level, regular slots, ev slots).
+
+    The regular slots carry the snapshot's small/large counts for the lot to lay out.
+    """
+    if sys.byteorder != "little":
+        raise ValueError("Mapped snapshots require a little-endian host")
+    with open(path, "rb") as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    if buf[:8] != _MAGIC or len(buf) < _HEADER.size:
+        raise ValueError("Not a mapped parking lot snapshot")
+    _, level, regular, ev, regular_count, ev_count, small, large, *offsets, size = _HEADER.unpack_from(buf)
+    count = regular_count + ev_count
+    if size != len(buf) or offsets != _layout(regular, ev, count):
+        raise ValueError("Mapped snapshot is truncated or corrupt")
+    table = _MappedVehicleTable(buf, offsets[4], offsets[5], offsets[6], count)
+    regular_slots = MappedSlots(buf, regular, False, offsets[0], offsets[2], regular_count, table)
+    regular_slots.small, regular_slots.large = small, large
+    return level, regular_slots, MappedSlots(buf, ev, True, offsets[1], offsets[3], ev_count, table)
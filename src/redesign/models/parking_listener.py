@@ -0,0 +1,40 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, List
+
+from .vehicle import Vehicle
+
+if TYPE_CHECKING:
+    from .parking_lot import ParkingLot
+
+
+class ListenerError(RuntimeError):
+    """One or more listeners raised after a park, leave or reset had already happened.
+
+    Every listener was still notified. ``errors`` holds what they raised, in
+    listener order, and ``result`` what the call would have returned.
+    """
+
+    def __init__(self, errors: List[Exception], result: Any) -> None:
+        super().__init__(f"{len(errors)} listener(s) failed: {errors[0]!r}")
+        self.errors = errors
+        self.result = result
+
+
+class ParkingListener:
+    """Observer notified after every successful park and leave on a ParkingLot.
+
+    on_reset follows ParkingLot.reset, once the lot holds its new, empty slots.
+    All hooks default to no-ops so listeners override only what they need.
+    They run synchronously on the caller's path, so keep them cheap. A hook
+    that raises does not stop the others; the lot raises ListenerError once
+    all have run.
+    """
+
+    def on_park(self, lot: "ParkingLot", vehicle: Vehicle, is_ev: bool, slot_number: int) -> None:
+        pass
+
+    def on_leave(self, lot: "ParkingLot", vehicle: Vehicle, is_ev: bool, slot_number: int) -> None:
+        pass
+
+    def on_reset(self, lot: "ParkingLot") -> None:
+        pass
@@ -1,9 +1,42 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import AbstractSet, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 from .vehicle import Vehicle
 from .electric_vehicle import ElectricVehicle
+from .free_slot_index import FreeIndex, FreeSlotIndex
+from .compact_slots import CompactSlots
+from .mapped_slots import MappedSlots, open_snapshot, write_snapshot
+from .parking_listener import ListenerError, ParkingListener
+
+
+# Vehicle attributes with a value -> {(is_ev, slot_number)} index on the lot
+INDEXED_ATTRIBUTES = ("color", "make", "model")
+
+# Slot size classes, smallest first; a vehicle fits its own class and every larger one
+SLOT_SIZES = ("small", "medium", "large")
+# get_type() -> smallest class the vehicle fits; types not listed need a medium slot
+_SIZE_BY_TYPE = {"Motorcycle": "small", "ElectricBike": "small", "Truck": "large"}
+_FITTING_SIZES = {size: SLOT_SIZES[i:] for i, size in enumerate(SLOT_SIZES)}
+
+
+def size_class(vehicle: Vehicle) -> str:
+    """Smallest slot size class the vehicle fits."""
+    return _SIZE_BY_TYPE.get(vehicle.get_type(), "medium")
+
+
+def fitting_sizes(vehicle: Vehicle) -> Tuple[str, ...]:
+    """Slot size classes the vehicle fits, smallest first."""
+    return _FITTING_SIZES[size_class(vehicle)]
+
+
+def check_size_capacities(regular_capacity: int, small_capacity: int, large_capacity: int) -> None:
+    if small_capacity < 0 or large_capacity < 0 or small_capacity + large_capacity > regular_capacity:
+        raise ValueError("Small and large slots must fit in the regular capacity")
+
+
+class DuplicateRegistrationError(ValueError):
+    """Raised when a registration number is already parked in the lot."""
 
 
 @dataclass
@@ -11,55 +44,408 @@ class ParkingSlot:
     index: int
     is_electric: bool
     vehicle: Optional[Vehicle] = None
+    size: str = "medium"
 
     def is_empty(self) -> bool:
         return self.vehicle is None
 
 
+def _free_index(slots: Sequence[ParkingSlot]) -> FreeIndex:
+    if isinstance(slots, CompactSlots):
+        return slots.free_index()
+    return FreeSlotIndex(s.index for s in slots if s.is_empty())
+
+
+def _occupied(slots: Sequence[ParkingSlot]) -> Iterator[Tuple[int, Vehicle]]:
+    if isinstance(slots, CompactSlots):
+        return slots.occupied()
+    return ((s.index, s.vehicle) for s in slots if s.vehicle is not None)
+
+
 @dataclass
 class ParkingLot:
     level: int
     regular_capacity: int
     ev_capacity: int
-    regular_slots: List[ParkingSlot] = field(default_factory=list)
-    ev_slots: List[ParkingSlot] = field(default_factory=list)
+    # With compact=True the slot lists are CompactSlots (bitmap + vehicle-id array)
+    # that hand out slot views on demand instead of holding one ParkingSlot each
+    regular_slots: Sequence[ParkingSlot] = field(default_factory=list)
+    ev_slots: Sequence[ParkingSlot] = field(default_factory=list)
+    compact: bool = False
+    # Regular slots are laid out small, then medium, then large. With both left at 0
+    # the lot has no size classes and every slot takes any vehicle
+    small_capacity: int = 0
+    large_capacity: int = 0
+    listeners: List[ParkingListener] = field(default_factory=list, repr=False, compare=False)
+    # Free-slot indexes are maintained by park_*/leave so allocation never scans the slot lists
+    _free_regular: FreeIndex = field(default_factory=FreeSlotIndex, init=False, repr=False)
+    _free_ev: FreeIndex = field(default_factory=FreeSlotIndex, init=False, repr=False)
+    # size class -> free regular slots of that class; None for a lot without size classes.
+    # A free sized slot is in both its class index and _free_regular
+    _free_by_size: Optional[Dict[str, FreeIndex]] = field(default=None, init=False, repr=False)
+    # registration_number -> (is_ev, slot_number)
+    _by_registration: Dict[str, Tuple[bool, int]] = field(default_factory=dict, init=False, repr=False)
+    # (is_ev, attribute) -> value -> {(is_ev, slot_number)}; one bucket per pool, so a
+    # lookup in one pool never walks the other's vehicles
+    _by_attribute: Dict[Tuple[bool, str], Dict[str, Set[Tuple[bool, int]]]] = field(
+        default_factory=dict, init=False, repr=False)
+    # False until the two lookup indexes above are built; lots opened from a mapped
+    # snapshot defer that, since it would decode every vehicle in the file
+    _indexed: bool = field(default=False, init=False, repr=False)
+    # While deferred, registrations are looked up in the snapshot's own hash table, and
+    # _by_registration holds only the vehicles parked since the file was opened
+    _snapshot_lookup: Optional[Callable[[str], Optional[Tuple[bool, int]]]] = field(
+        default=None, init=False, repr=False)
 
     def __post_init__(self) -> None:
+        check_size_capacities(self.regular_capacity, self.small_capacity, self.large_capacity)
         if not self.regular_slots:
-            self.regular_slots = [ParkingSlot(i, is_electric=False) for i in range(self.regular_capacity)]
+            self.regular_slots = self._new_slots(self.regular_capacity, is_electric=False)
         if not self.ev_slots:
-            self.ev_slots = [ParkingSlot(i, is_electric=True) for i in range(self.ev_capacity)]
+            self.ev_slots = self._new_slots(self.ev_capacity, is_electric=True)
+        self._free_regular = _free_index(self.regular_slots)
+        self._free_ev = _free_index(self.ev_slots)
+        self._free_by_size = self._size_indexes() if self.small_capacity or self.large_capacity else None
+        self._indexed = False
+        self._by_registration = {}
+        if isinstance(self.regular_slots, MappedSlots):
+            self._snapshot_lookup = self.regular_slots.snapshot_location
+        elif isinstance(self.ev_slots, MappedSlots):
+            self._snapshot_lookup = self.ev_slots.snapshot_location
+        else:
+            self._snapshot_lookup = None
+            self.ensure_indexes()
+
+    def reset(self, level: int, regular_capacity: int, ev_capacity: int,
+              small_capacity: int = 0, large_capacity: int = 0) -> None:
+        """Replace every slot with an empty layout of the given size; listeners stay attached.
+
+        A listener may detach itself from ``listeners`` in its on_reset.
+        """
+        check_size_capacities(regular_capacity, small_capacity, large_capacity)
+        self.level = level
+        self.regular_capacity = regular_capacity
+        self.ev_capacity = ev_capacity
+        self.small_capacity = small_capacity
+        self.large_capacity = large_capacity
+        self.regular_slots = self._new_slots(regular_capacity, is_electric=False)
+        self.ev_slots = self._new_slots(ev_capacity, is_electric=True)
+        self.__post_init__()
+        errors: List[Exception] = []
+        for listener in list(self.listeners):
+            try:
+                listener.on_reset(self)
+            except Exception as e:
+                errors.append(e)
+        if errors:
+            raise ListenerError(errors, None) from errors[0]
+
+    @classmethod
+    def open_snapshot(cls, path: str) -> "ParkingLot":
+        """Open a lot from a mapped snapshot without reading its slots.
+
+        Free-slot, occupancy and registration queries, and parking, are served
+        from the mapped file at once; the attribute indexes are built on first use.
+        """
+        level, regular, ev = open_snapshot(path)
+        return cls(level=level, regular_capacity=len(regular), ev_capacity=len(ev),
+                   regular_slots=regular, ev_slots=ev, compact=True,  # type: ignore[arg-type]
+                   small_capacity=regular.small, large_capacity=regular.large)
+
+    def save_snapshot(self, path: str) -> None:
+        """Write the lot as a mapped snapshot that open_snapshot can map back in."""
+        small, large = self.size_capacities()
+        write_snapshot(path, self.level, len(self.regular_slots), len(self.ev_slots),
+                       _occupied(self.regular_slots), _occupied(self.ev_slots), small, large)
+
+    def ensure_indexes(self) -> None:
+        """Build the registration and attribute indexes if they have been deferred."""
+        if self._indexed:
+            return
+        self._by_registration = {}
+        self._by_attribute = {(is_ev, attr): {} for is_ev in (False, True) for attr in INDEXED_ATTRIBUTES}
+        # Set first so _index fills every index
+        self._indexed = True
+        self._snapshot_lookup = None
+        for is_ev, slots in ((False, self.regular_slots), (True, self.ev_slots)):
+            for idx, vehicle in _occupied(slots):
+                self._index(vehicle, is_ev, idx + 1)
+
+    def _new_slots(self, capacity: int, is_electric: bool) -> Sequence[ParkingSlot]:
+        if self.compact:
+            return CompactSlots(capacity, is_electric)  # type: ignore[return-value]
+        return [ParkingSlot(i, is_electric=is_electric) for i in range(capacity)]
+
+    def size_capacities(self) -> Tuple[int, int]:
+        """(small, large) slot counts of the regular pool as laid out; (0, 0) without size classes."""
+        if self._free_by_size is None:
+            return 0, 0
+        return self.small_capacity, self.large_capacity
+
+    def _size_indexes(self) -> Dict[str, FreeIndex]:
+        slots = self.regular_slots
+        check_size_capacities(len(slots), self.small_capacity, self.large_capacity)
+        small_end = self.small_capacity
+        large_start = len(slots) - self.large_capacity
+        bounds = {"small": (0, small_end), "medium": (small_end, large_start), "large": (large_start, len(slots))}
+        if isinstance(slots, CompactSlots):
+            slots.small, slots.large = self.small_capacity, self.large_capacity
+            return {size: slots.free_index(start, stop) for size, (start, stop) in bounds.items()}
+        indexes: Dict[str, FreeIndex] = {}
+        for size, (start, stop) in bounds.items():
+            run = slots[start:stop]
+            for slot in run:
+                slot.size = size
+            indexes[size] = FreeSlotIndex(s.index for s in run if s.is_empty())
+        return indexes
+
+    def has_size_classes(self) -> bool:
+        return self._free_by_size is not None
+
+    def slot_size(self, slot_number: int, is_ev: bool = False) -> str:
+        """Size class of a slot; EV slots and the slots of a lot without size classes are medium."""
+        if is_ev or self._free_by_size is None:
+            return "medium"
+        idx = slot_number - 1
+        if idx < self.small_capacity:
+            return "small"
+        return "large" if idx >= len(self.regular_slots) - self.large_capacity else "medium"
+
+    def free_by_size(self) -> Dict[str, int]:
+        """Free regular slots per size class; empty for a lot without size classes."""
+        if self._free_by_size is None:
+            return {}
+        return {size: len(index) for size, index in self._free_by_size.items()}
 
     def first_empty_regular(self) -> Optional[int]:
-        for slot in self.regular_slots:
-            if slot.is_empty():
-                return slot.index
-        return None
+        return self._free_regular.peek()
 
     def first_empty_ev(self) -> Optional[int]:
-        for slot in self.ev_slots:
-            if slot.is_empty():
-                return slot.index
+        return self._free_ev.peek()
+
+    def free_regular_count(self) -> int:
+        return len(self._free_regular)
+
+    def free_ev_count(self) -> int:
+        return len(self._free_ev)
+
+    def find_by_registration(self, registration_number: str) -> Optional[Tuple[bool, int]]:
+        """Return (is_ev, slot_number) for a parked registration, or None."""
+        key = self._by_registration.get(registration_number)
+        if key is None and self._snapshot_lookup is not None:
+            return self._in_snapshot(registration_number)
+        return key
+
+    def _in_snapshot(self, registration_number: str) -> Optional[Tuple[bool, int]]:
+        """The registration's slot from the snapshot's table, if the vehicle has not left it since."""
+        key = self._snapshot_lookup(registration_number)  # type: ignore[misc]
+        if key is None:
+            return None
+        vehicle = self.vehicle_at(key[1], key[0])
+        return key if vehicle is not None and vehicle.registration_number == registration_number else None
+
+    def slots_with(self, attribute: str, value: str, is_ev: Optional[bool] = None) -> AbstractSet[Tuple[bool, int]]:
+        """Return the (is_ev, slot_number) keys whose vehicle has attribute == value.
+
+        For one pool this is the live index bucket, returned without copying;
+        treat it as read-only. Without ``is_ev`` the two pools' buckets are joined.
+        """
+        if not self._indexed:
+            self.ensure_indexes()
+        if is_ev is not None:
+            return self._by_attribute[(is_ev, attribute)].get(value, frozenset())
+        return (self._by_attribute[(False, attribute)].get(value, frozenset())
+                | self._by_attribute[(True, attribute)].get(value, frozenset()))
+
+    def occupied(self, is_ev: bool) -> Iterator[Tuple[int, Vehicle]]:
+        """Yield (slot_number, vehicle) for every occupied slot of one type, in slot order."""
+        for idx, vehicle in _occupied(self.ev_slots if is_ev else self.regular_slots):
+            yield idx + 1, vehicle
+
+    def vehicle_at(self, slot_number: int, is_ev: bool) -> Optional[Vehicle]:
+        slots = self.ev_slots if is_ev else self.regular_slots
+        idx = slot_number - 1
+        if 0 <= idx < len(slots):
+            return slots[idx].vehicle
         return None
 
+    def _check_not_parked(self, vehicle: Vehicle) -> None:
+        reg = vehicle.registration_number
+        if reg in self._by_registration or (self._snapshot_lookup is not None and self._in_snapshot(reg)):
+            raise DuplicateRegistrationError(f"Vehicle {vehicle.registration_number} is already parked")
+
+    def _index(self, vehicle: Vehicle, is_ev: bool, slot_number: int) -> None:
+        key = (is_ev, slot_number)
+        self._by_registration[vehicle.registration_number] = key
+        if not self._indexed:
+            # ensure_indexes() will find the vehicle in its slot
+            return
+        for attr in INDEXED_ATTRIBUTES:
+            self._by_attribute[(is_ev, attr)].setdefault(getattr(vehicle, attr), set()).add(key)
+
+    def _unindex(self, vehicle: Vehicle, is_ev: bool, slot_number: int) -> None:
+        key = (is_ev, slot_number)
+        if not self._indexed:
+            # Vehicles that came from the snapshot are only in its table
+            self._by_registration.pop(vehicle.registration_number, None)
+            return
+        del self._by_registration[vehicle.registration_number]
+        # Empty buckets are kept: the value set is small, and never deleting them keeps
+        # each index update a single dict/set operation on the pool's own buckets, so
+        # regular and EV pools can be mutated under separate locks (see ConcurrentParkingController)
+        for attr in INDEXED_ATTRIBUTES:
+            self._by_attribute[(is_ev, attr)][getattr(vehicle, attr)].discard(key)
+
     def park_regular(self, vehicle: Vehicle) -> Optional[int]:
-        idx = self.first_empty_regular()
+        self._check_not_parked(vehicle)
+        if self._free_by_size is None:
+            idx = self._free_regular.pop()
+        else:
+            idx = self._pop_fitting(vehicle)
         if idx is None:
             return None
         self.regular_slots[idx].vehicle = vehicle
+        self._index(vehicle, False, idx + 1)
+        errors = self._notify_park(vehicle, False, idx + 1)
+        if errors:
+            raise ListenerError(errors, idx + 1) from errors[0]
         return idx + 1
 
+    def _pop_fitting(self, vehicle: Vehicle) -> Optional[int]:
+        """Take the lowest free regular slot of the smallest class the vehicle fits."""
+        for size in fitting_sizes(vehicle):
+            idx = self._free_by_size[size].pop()  # type: ignore[index]
+            if idx is not None:
+                self._free_regular.discard(idx)
+                return idx
+        return None
+
     def park_ev(self, vehicle: ElectricVehicle) -> Optional[int]:
-        idx = self.first_empty_ev()
+        self._check_not_parked(vehicle)
+        idx = self._free_ev.pop()
         if idx is None:
             return None
         self.ev_slots[idx].vehicle = vehicle
+        self._index(vehicle, True, idx + 1)
+        errors = self._notify_park(vehicle, True, idx + 1)
+        if errors:
+            raise ListenerError(errors, idx + 1) from errors[0]
         return idx + 1
 
+    def park_at(self, vehicle: Vehicle, is_ev: bool, slot_number: int) -> bool:
+        """Park in one specific free slot, for strategies that choose their own slot.
+
+        Returns False if the slot does not exist, is occupied or is too small.
+        """
+        self._check_not_parked(vehicle)
+        slots = self.ev_slots if is_ev else self.regular_slots
+        idx = slot_number - 1
+        if not (0 <= idx < len(slots) and slots[idx].is_empty()):
+            return False
+        if is_ev:
+            self._free_ev.discard(idx)
+        else:
+            if self._free_by_size is not None:
+                size = self.slot_size(slot_number)
+                if size not in fitting_sizes(vehicle):
+                    return False
+                self._free_by_size[size].discard(idx)
+            self._free_regular.discard(idx)
+        slots[idx].vehicle = vehicle
+        self._index(vehicle, is_ev, slot_number)
+        errors = self._notify_park(vehicle, is_ev, slot_number)
+        if errors:
+            raise ListenerError(errors, True) from errors[0]
+        return True
+
+    def park_regular_many(self, vehicles: Sequence[Vehicle]) -> List[Optional[int]]:
+        return self._park_many(vehicles, is_ev=False)
+
+    def park_ev_many(self, vehicles: Sequence[ElectricVehicle]) -> List[Optional[int]]:
+        return self._park_many(vehicles, is_ev=True)
+
+    def _park_many(self, vehicles: Sequence[Vehicle], is_ev: bool) -> List[Optional[int]]:
+        """Park a batch in arrival order, reserving the run of free slots in one pass.
+
+        Returns one slot number per vehicle; vehicles that are already parked
+        (in the lot or earlier in the batch) or that do not fit get None.
+        """
+        results: List[Optional[int]] = [None] * len(vehicles)
+        errors: List[Exception] = []
+        accepted: List[int] = []
+        seen: Set[str] = set()
+        for i, vehicle in enumerate(vehicles):
+            reg = vehicle.registration_number
+            if reg not in seen and self.find_by_registration(reg) is None:
+                seen.add(reg)
+                accepted.append(i)
+        slots = self.ev_slots if is_ev else self.regular_slots
+        if is_ev or self._free_by_size is None:
+            free = self._free_ev if is_ev else self._free_regular
+            picks: Sequence[Optional[int]] = free.pop_many(len(accepted))
+        else:
+            # Each vehicle needs the smallest class it fits, so there is no single run to reserve
+            picks = [self._pop_fitting(vehicles[i]) for i in accepted]
+        for i, idx in zip(accepted, picks):
+            if idx is None:
+                continue
+            vehicle = vehicles[i]
+            slots[idx].vehicle = vehicle
+            self._index(vehicle, is_ev, idx + 1)
+            results[i] = idx + 1
+            failed = self._notify_park(vehicle, is_ev, idx + 1)
+            if failed:
+                errors.extend(failed)
+        # A failing listener does not stop the batch; its errors are reported once every vehicle is parked
+        if errors:
+            raise ListenerError(errors, results) from errors[0]
+        return results
+
+    def leave_many(self, slot_numbers: Iterable[int], is_ev: bool) -> List[bool]:
+        results: List[bool] = []
+        errors: List[Exception] = []
+        for slot_number in slot_numbers:
+            try:
+                results.append(self.leave(slot_number, is_ev))
+            except ListenerError as e:
+                results.append(True)
+                errors.extend(e.errors)
+        if errors:
+            raise ListenerError(errors, results) from errors[0]
+        return results
+
     def leave(self, slot_number: int, is_ev: bool) -> bool:
         slots = self.ev_slots if is_ev else self.regular_slots
         idx = slot_number - 1
         if 0 <= idx < len(slots) and not slots[idx].is_empty():
+            vehicle = slots[idx].vehicle
             slots[idx].vehicle = None
+            self._unindex(vehicle, is_ev, slot_number)  # type: ignore[arg-type]
+            if is_ev:
+                self._free_ev.push(idx)
+            else:
+                self._free_regular.push(idx)
+                if self._free_by_size is not None:
+                    self._free_by_size[self.slot_size(slot_number)].push(idx)
+            errors: Optional[List[Exception]] = None
+            for listener in self.listeners:
+                try:
+                    listener.on_leave(self, vehicle, is_ev, slot_number)  # type: ignore[arg-type]
+                except Exception as e:
+                    errors = errors or []
+                    errors.append(e)
+            if errors:
+                raise ListenerError(errors, True) from errors[0]
             return True
         return False
+
+    def _notify_park(self, vehicle: Vehicle, is_ev: bool, slot_number: int) -> Optional[List[Exception]]:
+        """Call every listener's on_park; returns what they raised, or None."""
+        errors: Optional[List[Exception]] = None
+        for listener in self.listeners:
+            try:
+                listener.on_park(self, vehicle, is_ev, slot_number)
+            except Exception as e:
+                errors = errors or []
+                errors.append(e)
+        return errors
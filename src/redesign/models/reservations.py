@@ -0,0 +1,296 @@
+from __future__ import annotations
+import bisect
+import heapq
+import itertools
+import math
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .electric_vehicle import ElectricVehicle
+from .parking_listener import ParkingListener
+from .parking_lot import ParkingLot, fitting_sizes
+from .vehicle import Vehicle
+
+
+@dataclass(frozen=True)
+class Reservation:
+    reservation_id: int
+    registration_number: str
+    is_ev: bool
+    slot_number: int
+    start: float
+    end: float
+
+
+# Slots per bitmask word: slot number n is bit n % _BLOCK_SLOTS of block n // _BLOCK_SLOTS,
+# so no mask grows with the lot's capacity
+_BLOCK_SLOTS = 1024
+
+
+def _range_mask(first: int, last: int) -> int:
+    """Bits first..last inclusive."""
+    if last < first:
+        return 0
+    return ((1 << (last + 1)) - 1) ^ ((1 << first) - 1)
+
+
+def _block_masks(first: int, last: int) -> Iterator[Tuple[int, int]]:
+    """(block, mask) pairs covering slot numbers first..last inclusive, in ascending order."""
+    for block in range(first // _BLOCK_SLOTS, last // _BLOCK_SLOTS + 1):
+        base = block * _BLOCK_SLOTS
+        yield block, _range_mask(max(first, base) - base, min(last, base + _BLOCK_SLOTS - 1) - base)
+
+
+class _SlotBookings:
+    """One slot's reservations: disjoint windows sorted by start, so ends are sorted too."""
+
+    __slots__ = ("starts", "ends", "ids")
+
+    def __init__(self) -> None:
+        self.starts: List[float] = []
+        self.ends: List[float] = []
+        self.ids: List[int] = []
+
+    def overlapping(self, start: float, end: float) -> Optional[int]:
+        """Position of a booking overlapping [start, end), or None."""
+        i = bisect.bisect_right(self.ends, start)
+        if i < len(self.starts) and self.starts[i] < end:
+            return i
+        return None
+
+
+class ReservationBook(ParkingListener):
+    """Future bookings of one lot's slots, checked for conflicts per slot and across the lot.
+
+    Each slot keeps its bookings sorted, so checking one slot is a bisect. To
+    find a slot for a window without visiting every slot, time is cut into
+    ``bucket_seconds`` buckets, each with bitmasks of the slots booked at
+    some point inside it, one per block of 1024 slots. Slots whose bit is
+    clear in every bucket the window covers are free for it outright; only
+    slots booked in the two partly covered end buckets need the per-slot
+    check. The book also follows the lot's parks and leaves, so walk-in
+    searches can skip occupied slots and a vehicle that leaves after
+    check_in() frees the rest of its booking. Slot ranges are read from the
+    lot, so they follow create_lot; bookings of slots the new layout no
+    longer has are dropped then.
+
+    Times are epoch seconds from ``clock``.
+    """
+
+    def __init__(self, lot: ParkingLot, bucket_seconds: float = 900.0,
+                 clock: Callable[[], float] = time.time) -> None:
+        if bucket_seconds <= 0:
+            raise ValueError("Bucket length must be positive")
+        self.lot = lot
+        self.bucket_seconds = bucket_seconds
+        self.clock = clock
+        self._ids = itertools.count(1)
+        self._reservations: Dict[int, Reservation] = {}
+        # registration_number -> ids of its reservations
+        self._by_registration: Dict[str, List[int]] = {}
+        # (is_ev, slot_number) -> bookings
+        self._slots: Dict[Tuple[bool, int], _SlotBookings] = {}
+        # per pool (index is_ev): block -> bucket -> slots of the block booked in the bucket
+        self._buckets: Tuple[Dict[int, Dict[int, int]], Dict[int, Dict[int, int]]] = ({}, {})
+        # per pool: block -> its slots occupied right now
+        self._occupied: Tuple[Dict[int, int], Dict[int, int]] = ({}, {})
+        # registration_number -> id of the reservation it is parked under
+        self._checked_in: Dict[str, int] = {}
+        # (end, id), for prune(); ids of cancelled reservations are skipped
+        self._ends: List[Tuple[float, int]] = []
+        for is_ev in (False, True):
+            for slot_number, _ in lot.occupied(is_ev):
+                self._set_occupied(is_ev, slot_number, True)
+        lot.listeners.append(self)
+
+    def detach(self) -> None:
+        if self in self.lot.listeners:
+            self.lot.listeners.remove(self)
+
+    def _set_occupied(self, is_ev: bool, slot_number: int, occupied: bool) -> None:
+        block, bit = divmod(slot_number, _BLOCK_SLOTS)
+        masks = self._occupied[is_ev]
+        mask = masks.get(block, 0) | 1 << bit if occupied else masks.get(block, 0) & ~(1 << bit)
+        if mask:
+            masks[block] = mask
+        else:
+            masks.pop(block, None)
+
+    def on_park(self, lot: ParkingLot, vehicle: Vehicle, is_ev: bool, slot_number: int) -> None:
+        self._set_occupied(is_ev, slot_number, True)
+
+    def on_leave(self, lot: ParkingLot, vehicle: Vehicle, is_ev: bool, slot_number: int) -> None:
+        self._set_occupied(is_ev, slot_number, False)
+        # A booked vehicle leaving early releases the rest of its booking
+        reservation_id = self._checked_in.pop(vehicle.registration_number, None)
+        if reservation_id is not None:
+            self.cancel(reservation_id)
+
+    def on_reset(self, lot: ParkingLot) -> None:
+        # The new layout starts empty; bookings of slots it still has are kept
+        self._occupied = ({}, {})
+        self._checked_in.clear()
+        capacity = (lot.regular_capacity, lot.ev_capacity)
+        for reservation in list(self._reservations.values()):
+            if reservation.slot_number > capacity[reservation.is_ev]:
+                self.cancel(reservation.reservation_id)
+
+    def __len__(self) -> int:
+        return len(self._reservations)
+
+    def _bucket_span(self, start: float, end: float) -> Tuple[int, int]:
+        """First and last bucket that [start, end) touches."""
+        return int(start // self.bucket_seconds), math.ceil(end / self.bucket_seconds) - 1
+
+    def _pool_ranges(self, vehicle: Vehicle, is_ev: bool) -> List[Tuple[int, int]]:
+        """First and last slot number of each slot class the vehicle may book, smallest first."""
+        lot = self.lot
+        if is_ev:
+            return [(1, lot.ev_capacity)]
+        regular = lot.regular_capacity
+        if not lot.has_size_classes():
+            return [(1, regular)]
+        small, large = lot.size_capacities()
+        ranges = {"small": (1, small), "medium": (small + 1, regular - large), "large": (regular - large + 1, regular)}
+        return [ranges[size] for size in fitting_sizes(vehicle)]
+
+    def is_free(self, is_ev: bool, slot_number: int, start: float, end: float) -> bool:
+        bookings = self._slots.get((is_ev, slot_number))
+        return bookings is None or bookings.overlapping(start, end) is None
+
+    def find_slot(self, vehicle: Vehicle, start: float, end: float, is_ev: Optional[bool] = None,
+                  free_now: bool = False) -> Optional[int]:
+        """Lowest slot the vehicle fits with no booking overlapping [start, end), smallest class first.
+
+        ``free_now`` also skips slots that are occupied at the moment.
+        """
+        if is_ev is None:
+            is_ev = isinstance(vehicle, ElectricVehicle)
+        buckets = self._buckets[is_ev]
+        occupied = self._occupied[is_ev]
+        first, last = self._bucket_span(start, end)
+        for low, high in self._pool_ranges(vehicle, is_ev):
+            for block, pool in _block_masks(low, high):
+                booked = buckets.get(block, {})
+                blocked = occupied.get(block, 0) if free_now else 0
+                for bucket in range(first + 1, last):
+                    blocked |= booked.get(bucket, 0)
+                candidates = pool & ~blocked
+                if not candidates:
+                    continue
+                edges = booked.get(first, 0) | booked.get(last, 0)
+                while candidates:
+                    lowest = candidates & -candidates
+                    slot_number = block * _BLOCK_SLOTS + lowest.bit_length() - 1
+                    if not edges & lowest or self.is_free(is_ev, slot_number, start, end):
+                        return slot_number
+                    candidates ^= lowest
+        return None
+
+    def reserve(self, vehicle: Vehicle, start: float, end: float,
+                slot_number: Optional[int] = None) -> Optional[Reservation]:
+        """Book a slot for [start, end); returns None if no fitting slot (or not ``slot_number``) is free."""
+        if end <= start:
+            raise ValueError("A reservation must end after it starts")
+        is_ev = isinstance(vehicle, ElectricVehicle)
+        if slot_number is None:
+            slot_number = self.find_slot(vehicle, start, end, is_ev)
+            if slot_number is None:
+                return None
+        elif not (any(low <= slot_number <= high for low, high in self._pool_ranges(vehicle, is_ev))
+                  and self.is_free(is_ev, slot_number, start, end)):
+            return None
+        reservation = Reservation(next(self._ids), vehicle.registration_number, is_ev, slot_number, start, end)
+        self._add(reservation)
+        return reservation
+
+    def _add(self, reservation: Reservation) -> None:
+        key = (reservation.is_ev, reservation.slot_number)
+        bookings = self._slots.get(key)
+        if bookings is None:
+            bookings = self._slots[key] = _SlotBookings()
+        i = bisect.bisect_left(bookings.starts, reservation.start)
+        bookings.starts.insert(i, reservation.start)
+        bookings.ends.insert(i, reservation.end)
+        bookings.ids.insert(i, reservation.reservation_id)
+        block, bit = divmod(reservation.slot_number, _BLOCK_SLOTS)
+        booked = self._buckets[reservation.is_ev].setdefault(block, {})
+        first, last = self._bucket_span(reservation.start, reservation.end)
+        for bucket in range(first, last + 1):
+            booked[bucket] = booked.get(bucket, 0) | 1 << bit
+        self._reservations[reservation.reservation_id] = reservation
+        self._by_registration.setdefault(reservation.registration_number, []).append(reservation.reservation_id)
+        heapq.heappush(self._ends, (reservation.end, reservation.reservation_id))
+
+    def cancel(self, reservation_id: int) -> bool:
+        reservation = self._reservations.pop(reservation_id, None)
+        if reservation is None:
+            return False
+        ids = self._by_registration[reservation.registration_number]
+        ids.remove(reservation_id)
+        if not ids:
+            del self._by_registration[reservation.registration_number]
+        key = (reservation.is_ev, reservation.slot_number)
+        bookings = self._slots[key]
+        i = bisect.bisect_left(bookings.starts, reservation.start)
+        del bookings.starts[i], bookings.ends[i], bookings.ids[i]
+        first, last = self._bucket_span(reservation.start, reservation.end)
+        # Only the neighbouring bookings can share an end bucket; the inner buckets were this one's alone
+        if i > 0 and self._bucket_span(bookings.starts[i - 1], bookings.ends[i - 1])[1] == first:
+            first += 1
+        if i < len(bookings.starts) and self._bucket_span(bookings.starts[i], bookings.ends[i])[0] == last:
+            last -= 1
+        if not bookings.starts:
+            del self._slots[key]
+        block, bit = divmod(reservation.slot_number, _BLOCK_SLOTS)
+        clear = ~(1 << bit)
+        booked = self._buckets[reservation.is_ev][block]
+        for bucket in range(first, last + 1):
+            mask = booked[bucket] & clear
+            if mask:
+                booked[bucket] = mask
+            else:
+                del booked[bucket]
+        return True
+
+    def get(self, reservation_id: int) -> Optional[Reservation]:
+        return self._reservations.get(reservation_id)
+
+    def reservations_for(self, registration_number: str) -> List[Reservation]:
+        ids = self._by_registration.get(registration_number, ())
+        return sorted((self._reservations[i] for i in ids), key=lambda r: r.start)
+
+    def reservation_at(self, registration_number: str, at: float, early_seconds: float = 0.0) -> Optional[Reservation]:
+        """The registration's booking whose window, opened ``early_seconds`` early, contains ``at``."""
+        for reservation in self.reservations_for(registration_number):
+            if reservation.start - early_seconds <= at < reservation.end:
+                return reservation
+        return None
+
+    def check_in(self, reservation: Reservation) -> None:
+        """Record that the booked vehicle has parked under ``reservation``."""
+        self._checked_in[reservation.registration_number] = reservation.reservation_id
+
+    def move(self, reservation: Reservation, start: float, vehicle: Vehicle) -> Optional[Reservation]:
+        """Rebook the rest of a reservation, from ``start``, on a slot that is free now; None if there is none."""
+        slot_number = self.find_slot(vehicle, start, reservation.end, reservation.is_ev, free_now=True)
+        if slot_number is None:
+            return None
+        self.cancel(reservation.reservation_id)
+        moved = Reservation(reservation.reservation_id, reservation.registration_number, reservation.is_ev,
+                            slot_number, start, reservation.end)
+        self._add(moved)
+        return moved
+
+    def prune(self, before: Optional[float] = None) -> int:
+        """Drop reservations that ended at or before ``before`` (default: now); returns how many."""
+        before = self.clock() if before is None else before
+        dropped = 0
+        while self._ends and self._ends[0][0] <= before:
+            _, reservation_id = heapq.heappop(self._ends)
+            reservation = self._reservations.get(reservation_id)
+            # A moved reservation has a newer heap entry with the same end
+            if reservation is not None and reservation.end <= before and self.cancel(reservation_id):
+                dropped += 1
+        return dropped
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Vehicle:
     registration_number: str
     make: str
@@ -12,19 +12,19 @@ class Vehicle:
         return "Vehicle"
 
 
-@dataclass
+@dataclass(slots=True)
 class Car(Vehicle):
     def get_type(self) -> str:
         return "Car"
 
 
-@dataclass
+@dataclass(slots=True)
 class Truck(Vehicle):
     def get_type(self) -> str:
         return "Truck"
 
 
-@dataclass
+@dataclass(slots=True)
 class Motorcycle(Vehicle):
     def get_type(self) -> str:
         return "Motorcycle"
@@ -0,0 +1,258 @@
+"""Occupancy time series per level and slot type, with rolling aggregates."""
+from __future__ import annotations
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from ..models.parking_listener import ParkingListener
+from ..models.parking_lot import ParkingLot
+from ..models.vehicle import Vehicle
+from .event_bus import Event, VehicleParked
+
+
+@dataclass(frozen=True)
+class RollingStats:
+    """Aggregates over the last ``minutes`` closed minutes (fewer if the series is younger)."""
+
+    minutes: int
+    average_occupancy: float
+    utilization: float
+    peak: int
+    arrivals: int
+    departures: int
+    # Departures per slot over the window
+    turnover: float
+
+
+class OccupancyAnalytics(ParkingListener):
+    """Per-minute occupancy counters with O(1) rolling average, peak and turnover.
+
+    Register each lot with attach() (listener) or track() (counts only, for
+    feeding events from a bus through consume()); the lots' slots are never
+    read. Each (level, is_ev) series keeps ring buffers of ``history_minutes``
+    per-minute counters, and every rolling window a running sum and peak
+    queue updated once per closed minute. Times are epoch seconds from
+    ``clock``; minutes are epoch minutes, so hourly and daily buckets line up
+    with UTC hours and days.
+    """
+
+    def __init__(self, history_minutes: int = 7 * 1440, windows: Sequence[int] = (60, 1440),
+                 clock: Callable[[], float] = time.time) -> None:
+        if history_minutes < 1 or any(w < 1 or w > history_minutes for w in windows):
+            raise ValueError("Rolling windows must be between 1 minute and history_minutes")
+        self.history_minutes = history_minutes
+        self.windows = tuple(windows)
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._rows: Dict[Tuple[int, bool], int] = {}
+        self._keys: List[Tuple[int, bool]] = []
+        self._capacity: List[int] = []
+        self._start: List[int] = []
+        # Rings, one row per series; minute m lives in column m % history_minutes
+        self._seconds = np.zeros((0, history_minutes))
+        self._peak = np.zeros((0, history_minutes), dtype=np.int32)
+        self._arrivals = np.zeros((0, history_minutes), dtype=np.int32)
+        self._departures = np.zeros((0, history_minutes), dtype=np.int32)
+        # The open minute of each series, not yet in the rings
+        self._minute: List[int] = []
+        self._occupancy: List[int] = []
+        self._since: List[float] = []
+        self._open_seconds: List[float] = []
+        self._open_peak: List[int] = []
+        self._open_arrivals: List[int] = []
+        self._open_departures: List[int] = []
+        # Per series, per window: running sums and (minute, peak) with peaks decreasing
+        self._window_sums: List[List[List[float]]] = []
+        self._window_peaks: List[List[Deque[Tuple[int, int]]]] = []
+
+    def track(self, lot: ParkingLot) -> None:
+        """Start the lot's regular and EV series at its current occupancy, from the free counts."""
+        now = self.clock()
+        with self._lock:
+            for is_ev, capacity, free in ((False, lot.regular_capacity, lot.free_regular_count()),
+                                          (True, lot.ev_capacity, lot.free_ev_count())):
+                if (lot.level, is_ev) not in self._rows:
+                    self._add_series(lot.level, is_ev, capacity, capacity - free, now)
+
+    def attach(self, lot: ParkingLot) -> None:
+        self.track(lot)
+        lot.listeners.append(self)
+
+    def _add_series(self, level: int, is_ev: bool, capacity: int, occupancy: int, now: float) -> None:
+        self._rows[(level, is_ev)] = len(self._keys)
+        self._keys.append((level, is_ev))
+        self._capacity.append(capacity)
+        minute = int(now // 60)
+        self._start.append(minute)
+        for name in ("_seconds", "_peak", "_arrivals", "_departures"):
+            ring = getattr(self, name)
+            setattr(self, name, np.vstack([ring, np.zeros((1, self.history_minutes), dtype=ring.dtype)]))
+        self._minute.append(minute)
+        self._occupancy.append(occupancy)
+        self._since.append(now)
+        self._open_seconds.append(0.0)
+        self._open_peak.append(occupancy)
+        self._open_arrivals.append(0)
+        self._open_departures.append(0)
+        self._window_sums.append([[0.0, 0, 0] for _ in self.windows])
+        self._window_peaks.append([deque() for _ in self.windows])
+
+    def on_park(self, lot: ParkingLot, vehicle: Vehicle, is_ev: bool, slot_number: int) -> None:
+        self._record(lot.level, is_ev, self.clock(), 1)
+
+    def on_leave(self, lot: ParkingLot, vehicle: Vehicle, is_ev: bool, slot_number: int) -> None:
+        self._record(lot.level, is_ev, self.clock(), -1)
+
+    def consume(self, events: Sequence[Event]) -> None:
+        """EventBus handler: ``bus.subscribe(analytics.consume)``. Events of untracked levels are ignored."""
+        for event in events:
+            self._record(event.level, event.is_ev, event.at, 1 if isinstance(event, VehicleParked) else -1)
+
+    def _record(self, level: int, is_ev: bool, at: float, delta: int) -> None:
+        with self._lock:
+            row = self._rows.get((level, is_ev))
+            if row is None:
+                return
+            # Events from several publishing threads may arrive slightly out of order
+            at = max(at, self._since[row])
+            self._roll(row, int(at // 60))
+            occupancy = self._occupancy[row]
+            self._open_seconds[row] += occupancy * (at - self._since[row])
+            self._since[row] = at
+            occupancy += delta
+            self._occupancy[row] = occupancy
+            if delta > 0:
+                self._open_arrivals[row] += 1
+                if occupancy > self._open_peak[row]:
+                    self._open_peak[row] = occupancy
+            else:
+                self._open_departures[row] += 1
+
+    def _roll(self, row: int, minute: int) -> None:
+        """Close the open minute and any idle minutes before ``minute``."""
+        current = self._minute[row]
+        if minute <= current:
+            return
+        occupancy = self._occupancy[row]
+        seconds = self._open_seconds[row] + occupancy * ((current + 1) * 60 - self._since[row])
+        self._push(row, current, 1, seconds, self._open_peak[row], self._open_arrivals[row],
+                   self._open_departures[row])
+        if minute - current > 1:
+            self._push(row, current + 1, minute - current - 1, occupancy * 60.0, occupancy, 0, 0)
+        self._minute[row] = minute
+        self._since[row] = minute * 60.0
+        self._open_seconds[row] = 0.0
+        self._open_peak[row] = occupancy
+        self._open_arrivals[row] = 0
+        self._open_departures[row] = 0
+
+    def _push(self, row: int, first: int, count: int, seconds: float, peak: int, arrivals: int,
+              departures: int) -> None:
+        """Close ``count`` minutes from ``first`` that all have the same counters into the rings."""
+        last = first + count - 1
+        history = self.history_minutes
+        values = (seconds, arrivals, departures)
+        rings = (self._seconds, self._arrivals, self._departures)
+        for sums, peaks, window in zip(self._window_sums[row], self._window_peaks[row], self.windows):
+            if count >= window:
+                sums[:] = [value * window for value in values]
+                peaks.clear()
+            else:
+                # Minutes first - window .. last - window drop out; read them before the ring overwrites them.
+                # Most calls close a single minute, where scalar reads beat array calls
+                if count == 1:
+                    column = (first - window) % history
+                    for i, (value, ring) in enumerate(zip(values, rings)):
+                        sums[i] += value - ring.item(row, column)
+                else:
+                    leaving = np.arange(first - window, last - window + 1) % history
+                    for i, (value, ring) in enumerate(zip(values, rings)):
+                        sums[i] += value * count - ring[row, leaving].sum().item()
+                while peaks and peaks[-1][1] <= peak:
+                    peaks.pop()
+                while peaks and peaks[0][0] <= last - window:
+                    peaks.popleft()
+            # A run of equal peaks only needs its last minute
+            peaks.append((last, peak))
+        columns = last % history if count == 1 else np.arange(last - min(count, history) + 1, last + 1) % history
+        self._seconds[row, columns] = seconds
+        self._peak[row, columns] = peak
+        self._arrivals[row, columns] = arrivals
+        self._departures[row, columns] = departures
+
+    def rolling(self, level: int, is_ev: bool, window: int) -> RollingStats:
+        """Aggregates over one of the configured ``windows`` (minutes), up to the current minute."""
+        if window not in self.windows:
+            raise ValueError(f"Window {window} is not one of {self.windows}")
+        w = self.windows.index(window)
+        with self._lock:
+            row = self._row(level, is_ev)
+            self._roll(row, int(self.clock() // 60))
+            minutes = min(window, self._minute[row] - self._start[row])
+            seconds, arrivals, departures = self._window_sums[row][w]
+            peaks = self._window_peaks[row][w]
+            peak = peaks[0][1] if peaks else 0
+            capacity = self._capacity[row]
+        average = float(seconds) / (60 * minutes) if minutes else 0.0
+        return RollingStats(minutes, average, average / capacity if capacity else 0.0, int(peak),
+                            int(arrivals), int(departures), int(departures) / capacity if capacity else 0.0)
+
+    def _row(self, level: int, is_ev: bool) -> int:
+        row = self._rows.get((level, is_ev))
+        if row is None:
+            raise ValueError(f"Level {level} {'EV' if is_ev else 'regular'} slots are not tracked")
+        return row
+
+    def occupancy(self, level: int, is_ev: bool) -> int:
+        return self._occupancy[self._row(level, is_ev)]
+
+    def _columns(self, rows: Sequence[int]) -> Dict[str, np.ndarray]:
+        """Closed minutes of the given series as columns; the caller holds the lock."""
+        now = int(self.clock() // 60)
+        columns: Dict[str, List[np.ndarray]] = {name: [] for name in (
+            "level", "is_ev", "capacity", "minute", "occupied_seconds", "peak", "arrivals", "departures")}
+        for row in rows:
+            level, is_ev = self._keys[row]
+            self._roll(row, now)
+            first = max(self._start[row], now - self.history_minutes)
+            minutes = np.arange(first, now, dtype=np.int64)
+            ring = minutes % self.history_minutes
+            columns["level"].append(np.full(len(minutes), level, dtype=np.int64))
+            columns["is_ev"].append(np.full(len(minutes), is_ev))
+            columns["capacity"].append(np.full(len(minutes), self._capacity[row], dtype=np.int64))
+            columns["minute"].append(minutes)
+            columns["occupied_seconds"].append(self._seconds[row, ring])
+            columns["peak"].append(self._peak[row, ring])
+            columns["arrivals"].append(self._arrivals[row, ring])
+            columns["departures"].append(self._departures[row, ring])
+        return {name: np.concatenate(parts) if parts else np.zeros(0) for name, parts in columns.items()}
+
+    def history(self, level: int, is_ev: bool) -> Dict[str, np.ndarray]:
+        """The closed minutes of one series, oldest first, as columns."""
+        with self._lock:
+            return self._columns([self._row(level, is_ev)])
+
+    def utilization(self, level: int, is_ev: bool, bucket_minutes: int = 60) -> Tuple[np.ndarray, np.ndarray]:
+        """(bucket start minute, average utilization) per bucket, e.g. 60 for hourly or 1440 for daily."""
+        columns = self.history(level, is_ev)
+        if not len(columns["minute"]):
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        buckets = columns["minute"] // bucket_minutes
+        offset = buckets[0]
+        seconds = np.bincount(buckets - offset, weights=columns["occupied_seconds"])
+        minutes = np.bincount(buckets - offset)
+        capacity = columns["capacity"][0]
+        used = minutes > 0
+        starts = (np.arange(len(minutes), dtype=np.int64) + offset) * bucket_minutes
+        return starts[used], seconds[used] / (60 * minutes[used] * max(capacity, 1))
+
+    def export(self, path: str) -> None:
+        """Write every series' closed minutes to a .npz file, one array per column."""
+        with self._lock:
+            columns = self._columns(range(len(self._keys)))
+        # Compression runs outside the lock so parks and leaves are not held up
+        np.savez_compressed(path, **columns)
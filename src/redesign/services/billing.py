@@ -0,0 +1,151 @@
+"""A rating engine for parking time and charging energy, pricing the repository's tickets."""
+from __future__ import annotations
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..factories.vehicle_factory import PERSISTED_KINDS
+from .repository import Ticket
+
+
+@dataclass(frozen=True)
+class RatePlan:
+    """Tiered hourly parking rates.
+
+    ``tiers`` are (hour the tier starts, price per hour), ascending from hour 0.
+    Stays up to ``grace_minutes`` are free; longer ones are billed in whole
+    ``increment_minutes``. The tiers restart every 24 hours, and each day costs
+    at most ``daily_cap``.
+    """
+
+    tiers: Tuple[Tuple[float, float], ...] = ((0.0, 2.0), (2.0, 3.0), (8.0, 1.0))
+    grace_minutes: float = 10.0
+    increment_minutes: float = 15.0
+    daily_cap: Optional[float] = 30.0
+
+    def __post_init__(self) -> None:
+        starts = [start for start, _ in self.tiers]
+        if not starts or starts[0] != 0 or starts != sorted(starts):
+            raise ValueError("Rate tiers must start at hour 0 and be in ascending order")
+
+    def _spans(self) -> List[Tuple[float, float, float]]:
+        ends = [start for start, _ in self.tiers[1:]] + [math.inf]
+        return [(start, end - start, rate) for (start, rate), end in zip(self.tiers, ends)]
+
+    def _billed_hours(self, minutes: float) -> float:
+        if minutes <= self.grace_minutes:
+            return 0.0
+        return math.ceil(minutes / self.increment_minutes) * self.increment_minutes / 60
+
+    def _day_cost(self, hours: float) -> float:
+        cost = sum(rate * min(max(hours - start, 0.0), width) for start, width, rate in self._spans())
+        return cost if self.daily_cap is None else min(cost, self.daily_cap)
+
+    def fee(self, seconds: float) -> float:
+        hours = self._billed_hours(seconds / 60)
+        days = math.floor(hours / 24)
+        return round(days * self._day_cost(24.0) + self._day_cost(hours - 24 * days), 2)
+
+    def fees(self, seconds: np.ndarray) -> np.ndarray:
+        """fee() for an array of stay lengths."""
+        minutes = seconds / 60
+        step = self.increment_minutes
+        hours = np.where(minutes <= self.grace_minutes, 0.0, np.ceil(minutes / step) * step / 60)
+        days = np.floor(hours / 24)
+        rest = hours - 24 * days
+        cost = np.zeros_like(rest)
+        for start, width, rate in self._spans():
+            cost += rate * np.clip(rest - start, 0.0, width)
+        if self.daily_cap is not None:
+            np.minimum(cost, self.daily_cap, out=cost)
+        return np.round(days * self._day_cost(24.0) + cost, 2)
+
+
+@dataclass(frozen=True)
+class EnergyTariff:
+    """Charging price: a per-session fee plus a price per kWh, for sessions that drew energy."""
+
+    price_per_kwh: float = 0.35
+    session_fee: float = 1.0
+
+    def charge(self, kwh: float) -> float:
+        return round(self.session_fee + kwh * self.price_per_kwh, 2) if kwh > 0 else 0.0
+
+    def charges(self, kwh: np.ndarray) -> np.ndarray:
+        return np.where(kwh > 0, np.round(self.session_fee + kwh * self.price_per_kwh, 2), 0.0)
+
+
+@dataclass
+class TicketBatch:
+    """Tickets as columns; ``kind`` holds PERSISTED_KINDS codes."""
+
+    registration: List[str]
+    level: np.ndarray
+    is_ev: np.ndarray
+    kind: np.ndarray
+    entered_at: np.ndarray
+    left_at: np.ndarray
+    energy_kwh: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.registration)
+
+    @classmethod
+    def from_tickets(cls, tickets: Sequence[Ticket]) -> "TicketBatch":
+        """Columns of repository tickets, e.g. ``repository.closed_tickets(since, until)``; open ones get NaN."""
+        return cls(
+            registration=[t.registration_number for t in tickets],
+            level=np.fromiter((t.level for t in tickets), dtype=np.int64, count=len(tickets)),
+            is_ev=np.fromiter((t.is_ev for t in tickets), dtype=bool, count=len(tickets)),
+            kind=np.fromiter((PERSISTED_KINDS.index(t.kind) for t in tickets), dtype=np.uint8, count=len(tickets)),
+            entered_at=np.fromiter((t.entered_at for t in tickets), dtype=float, count=len(tickets)),
+            left_at=np.fromiter((math.nan if t.left_at is None else t.left_at for t in tickets), dtype=float,
+                                count=len(tickets)),
+            energy_kwh=np.fromiter((t.energy_kwh for t in tickets), dtype=float, count=len(tickets)),
+        )
+
+
+@dataclass
+class Charges:
+    parking: np.ndarray
+    energy: np.ndarray
+
+    @property
+    def total(self) -> np.ndarray:
+        return self.parking + self.energy
+
+
+@dataclass
+class RatingEngine:
+    """Prices a TicketBatch with array operations, one pass per distinct rate plan.
+
+    price_ticket gives the same amount for a single ticket, e.g. at the exit gate.
+    """
+
+    # Persisted kind ("car", "ev_car", ...) -> plan; kinds without one use default_plan
+    plans: Dict[str, RatePlan] = field(default_factory=dict)
+    default_plan: RatePlan = field(default_factory=RatePlan)
+    tariff: EnergyTariff = field(default_factory=EnergyTariff)
+
+    def plan_for(self, kind: str) -> RatePlan:
+        return self.plans.get(kind, self.default_plan)
+
+    def price_ticket(self, kind: str, entered_at: float, left_at: float, energy_kwh: float = 0.0) -> float:
+        return round(self.plan_for(kind).fee(left_at - entered_at) + self.tariff.charge(energy_kwh), 2)
+
+    def price(self, batch: TicketBatch) -> Charges:
+        """Price every ticket of a closed batch."""
+        seconds = batch.left_at - batch.entered_at
+        parking = np.zeros(len(batch))
+        # Group kind codes by plan so each distinct plan runs once over its tickets
+        codes_by_plan: Dict[int, Tuple[RatePlan, List[int]]] = {}
+        for code, kind in enumerate(PERSISTED_KINDS):
+            plan = self.plan_for(kind)
+            codes_by_plan.setdefault(id(plan), (plan, []))[1].append(code)
+        for plan, codes in codes_by_plan.values():
+            mask = np.isin(batch.kind, codes)
+            if mask.any():
+                parking[mask] = plan.fees(seconds[mask])
+        return Charges(parking, self.tariff.charges(batch.energy_kwh))
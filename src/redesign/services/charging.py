@@ -0,0 +1,226 @@
+"""EV charging sessions advanced on a simulated clock."""
+from __future__ import annotations
+import heapq
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..models.electric_vehicle import ElectricVehicle
+from ..models.parking_listener import ParkingListener
+from ..models.parking_lot import ParkingLot
+from ..models.vehicle import Vehicle
+
+# get_type() -> (battery kWh, max charge kW); other EV types use the ElectricVehicle entry
+VEHICLE_PROFILES: Dict[str, Tuple[float, float]] = {
+    "ElectricVehicle": (50.0, 50.0),
+    "ElectricCar": (60.0, 150.0),
+    "ElectricBike": (0.5, 0.5),
+}
+
+# Same columns as the original charge status printout
+_HEADER = "Electric Vehicle Charge Levels\nSlot\tFloor\tReg No.\t\tCharge %\n"
+
+
+class ChargingEngine(ParkingListener):
+    """Charging sessions for the EV slots of one lot, keyed by slot number.
+
+    ``chargers`` maps EV slot numbers to charger ratings in kW; slots without a
+    charger do not charge. Attached to a lot, a session starts when an EV parks
+    on a charger slot and ends when it leaves. The clock is in hours and moves
+    only through advance(). ``charge_percent`` on the vehicles is written when a
+    session completes or ends, or by sync_vehicles(). ``on_session_end`` is
+    called with (registration number, kWh delivered) as each session ends.
+
+    Each session draws up to its charger's rating, capped by the vehicle's
+    maximum; over ``site_cap_kw`` every session is scaled down by the same
+    factor. Progress is kept in full-power hours (that factor integrated over
+    time), in which a session's completion point never moves, so completions
+    sit in a heap and advance() touches only the sessions that finish.
+    """
+
+    def __init__(self, site_cap_kw: float, chargers: Dict[int, float], target_percent: float = 100.0,
+                 on_session_end: Optional[Callable[[str, float], None]] = None) -> None:
+        if site_cap_kw <= 0:
+            raise ValueError("Site power cap must be positive")
+        if any(kw <= 0 for kw in chargers.values()):
+            raise ValueError("Charger ratings must be positive")
+        self.site_cap_kw = site_cap_kw
+        self.chargers = dict(chargers)
+        self.target_percent = target_percent
+        self.on_session_end = on_session_end
+        self.lot: Optional[ParkingLot] = None
+        self.now = 0.0
+        # Energy of sessions that have ended, kWh
+        self.delivered_kwh = 0.0
+        self._progress = 0.0
+        # Full-power draw of the sessions still charging
+        self._demand_kw = 0.0
+        # One row per session; rows of ended sessions are reused
+        self._energy = np.zeros(0)      # kWh when _since was recorded
+        self._since = np.zeros(0)       # progress when _energy was recorded
+        self._rate = np.zeros(0)        # full-power kW; 0 once the target is reached
+        self._battery = np.ones(0)      # kWh
+        self._target = np.zeros(0)      # kWh at which the session completes
+        self._initial = np.zeros(0)     # kWh at plug-in
+        self._active = np.zeros(0, dtype=bool)
+        self._slot_of = np.zeros(0, dtype=np.int64)
+        self._vehicles: List[Optional[ElectricVehicle]] = []
+        self._generation: List[int] = []
+        self._free_rows: List[int] = []
+        self._rows: Dict[int, int] = {}
+        # (completion progress, row, generation); entries of ended sessions are skipped when they surface
+        self._heap: List[Tuple[float, int, int]] = []
+
+    def attach(self, lot: ParkingLot) -> None:
+        """Start sessions for EVs already on charger slots, then follow the lot's parks and leaves."""
+        self.lot = lot
+        for slot_number, vehicle in lot.occupied(True):
+            if slot_number in self.chargers and slot_number not in self._rows:
+                self.start(vehicle, slot_number)  # type: ignore[arg-type]
+        lot.listeners.append(self)
+
+    def detach(self) -> None:
+        if self.lot is not None and self in self.lot.listeners:
+            self.lot.listeners.remove(self)
+        self.lot = None
+
+    def on_park(self, lot: ParkingLot, vehicle: Vehicle, is_ev: bool, slot_number: int) -> None:
+        if is_ev and slot_number in self.chargers and isinstance(vehicle, ElectricVehicle):
+            self.start(vehicle, slot_number)
+
+    def on_leave(self, lot: ParkingLot, vehicle: Vehicle, is_ev: bool, slot_number: int) -> None:
+        if is_ev and slot_number in self._rows:
+            self.stop(slot_number)
+
+    def _scale(self) -> float:
+        if self._demand_kw <= self.site_cap_kw:
+            return 1.0
+        return self.site_cap_kw / self._demand_kw
+
+    def _grow(self) -> None:
+        old = len(self._active)
+        new = max(16, 2 * old)
+        for name in ("_energy", "_since", "_rate", "_battery", "_target", "_initial", "_active", "_slot_of"):
+            array = getattr(self, name)
+            grown = np.zeros(new, dtype=array.dtype)
+            grown[:old] = array
+            setattr(self, name, grown)
+        self._battery[old:] = 1.0
+        self._vehicles.extend([None] * (new - old))
+        self._generation.extend([0] * (new - old))
+        self._free_rows.extend(range(new - 1, old - 1, -1))
+
+    def start(self, vehicle: ElectricVehicle, slot_number: int) -> None:
+        """Plug a vehicle into the charger of an EV slot at the current clock."""
+        if slot_number not in self.chargers:
+            raise ValueError(f"EV slot {slot_number} has no charger")
+        if slot_number in self._rows:
+            raise ValueError(f"EV slot {slot_number} already has a charging session")
+        if not self._free_rows:
+            self._grow()
+        row = self._free_rows.pop()
+        battery, max_kw = VEHICLE_PROFILES.get(vehicle.get_type(), VEHICLE_PROFILES["ElectricVehicle"])
+        energy = battery * min(max(vehicle.charge_percent, 0), 100) / 100
+        target = max(energy, battery * self.target_percent / 100)
+        rate = min(self.chargers[slot_number], max_kw) if energy < target else 0.0
+        self._energy[row] = self._initial[row] = energy
+        self._since[row] = self._progress
+        self._rate[row] = rate
+        self._battery[row] = battery
+        self._target[row] = target
+        self._active[row] = True
+        self._slot_of[row] = slot_number
+        self._vehicles[row] = vehicle
+        self._rows[slot_number] = row
+        if rate:
+            self._demand_kw += rate
+            heapq.heappush(self._heap, (self._progress + (target - energy) / rate, row, self._generation[row]))
+
+    def stop(self, slot_number: int) -> float:
+        """End the session on an EV slot; returns the kWh it delivered."""
+        row = self._rows.pop(slot_number)
+        energy = self._energy_at(row)
+        delivered = energy - self._initial[row]
+        self.delivered_kwh += delivered
+        if self._rate[row]:
+            self._demand_kw = max(0.0, self._demand_kw - self._rate[row])
+        vehicle = self._vehicles[row]
+        vehicle.charge_percent = int(100 * energy / self._battery[row])  # type: ignore[union-attr]
+        self._rate[row] = 0.0
+        self._active[row] = False
+        self._vehicles[row] = None
+        # Invalidates the row's heap entry
+        self._generation[row] += 1
+        self._free_rows.append(row)
+        if len(self._heap) > 2 * len(self._rows) + 64:
+            self._heap = [entry for entry in self._heap if entry[2] == self._generation[entry[1]]]
+            heapq.heapify(self._heap)
+        if self.on_session_end is not None:
+            self.on_session_end(vehicle.registration_number, float(delivered))  # type: ignore[union-attr]
+        return float(delivered)
+
+    def _energy_at(self, row: int) -> float:
+        return float(min(self._energy[row] + self._rate[row] * (self._progress - self._since[row]), self._target[row]))
+
+    def _complete(self, row: int) -> None:
+        self._energy[row] = self._target[row]
+        self._since[row] = self._progress
+        self._demand_kw = max(0.0, self._demand_kw - self._rate[row])
+        self._rate[row] = 0.0
+        self._vehicles[row].charge_percent = int(100 * self._target[row] / self._battery[row])  # type: ignore[union-attr]
+
+    def advance(self, hours: float) -> int:
+        """Move the clock forward; returns the number of sessions that reached their target."""
+        end = self.now + hours
+        heap = self._heap
+        completed = 0
+        while heap:
+            key, row, generation = heap[0]
+            if generation != self._generation[row]:
+                heapq.heappop(heap)
+                continue
+            at = self.now + (key - self._progress) / self._scale()
+            if at > end:
+                break
+            heapq.heappop(heap)
+            self.now, self._progress = max(self.now, at), key
+            self._complete(row)
+            completed += 1
+        self._progress += (end - self.now) * self._scale()
+        self.now = end
+        return completed
+
+    def power_kw(self) -> float:
+        """Current draw of the whole site."""
+        return min(self._demand_kw, self.site_cap_kw)
+
+    def active_sessions(self) -> int:
+        return len(self._rows)
+
+    def levels(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(slot numbers, charge percent) of every session, in row order."""
+        active = self._active
+        energy = np.minimum(self._energy + self._rate * (self._progress - self._since), self._target)
+        return self._slot_of[active], (100 * energy / self._battery)[active]
+
+    def charge_percent(self, slot_number: int) -> Optional[float]:
+        row = self._rows.get(slot_number)
+        if row is None:
+            return None
+        return 100 * self._energy_at(row) / float(self._battery[row])
+
+    def sync_vehicles(self) -> None:
+        """Write the current level into every plugged-in vehicle's charge_percent."""
+        for slot_number, percent in zip(*self.levels()):
+            self._vehicles[self._rows[int(slot_number)]].charge_percent = int(percent)  # type: ignore[union-attr]
+
+    def charge_status(self) -> str:
+        """Charge levels in the original printout's format, in slot order."""
+        slots, percents = self.levels()
+        order = np.argsort(slots)
+        level = self.lot.level if self.lot is not None else 1
+        lines = [_HEADER]
+        for slot_number, percent in zip(slots[order], percents[order]):
+            vehicle = self._vehicles[self._rows[int(slot_number)]]
+            lines.append(f"{slot_number}\t{level}\t{vehicle.registration_number}\t\t{int(percent)}\n")  # type: ignore[union-attr]
+        return "".join(lines)
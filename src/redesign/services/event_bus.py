@@ -0,0 +1,279 @@
+"""In-process domain event bus: VehicleParked / VehicleLeft for billing, charging and notifications.
+
+Publishing only appends the event to each subscriber's bounded queue, so it
+never waits on a consumer. Every subscription drains its own queue in
+batches, either on a worker thread (subscribe) or as an asyncio task
+(subscribe_async), so a slow subscriber delays only itself. A full queue
+drops events instead of blocking the publisher: the oldest queued ones by
+default, or the incoming one with ``drop="newest"``. Each subscription keeps
+counters (published, delivered, dropped, high-water depth, batches, handler
+errors) for monitoring backpressure.
+
+ParkingController takes an optional ``event_bus`` and publishes through an
+EventPublisher listener on its lot.
+"""
+from __future__ import annotations
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Sequence, Tuple, Type, Union
+
+from ..models.parking_listener import ParkingListener
+from ..models.parking_lot import ParkingLot
+from ..models.vehicle import Vehicle
+
+
+@dataclass(frozen=True, slots=True)
+class VehicleParked:
+    level: int
+    is_ev: bool
+    slot_number: int
+    vehicle: Vehicle
+    at: float
+
+
+@dataclass(frozen=True, slots=True)
+class VehicleLeft:
+    level: int
+    is_ev: bool
+    slot_number: int
+    vehicle: Vehicle
+    at: float
+
+
+Event = Union[VehicleParked, VehicleLeft]
+EVENT_TYPES: Tuple[Type[Any], ...] = (VehicleParked, VehicleLeft)
+
+
+@dataclass(frozen=True)
+class SubscriptionStats:
+    name: str
+    published: int
+    delivered: int
+    dropped: int
+    depth: int
+    high_water: int
+    batches: int
+    errors: int
+
+
+class Subscription:
+    """One subscriber's bounded queue, drained in batches by a worker thread.
+
+    Counters are updated without locks; with several publishing threads
+    (ConcurrentParkingController) they are approximate, the queue is not.
+    """
+
+    def __init__(self, name: str, handler: Callable[[List[Event]], Any], max_queue: int,
+                 batch_size: int, drop: str, interval: float) -> None:
+        if drop not in ("oldest", "newest"):
+            raise ValueError(f"Unknown drop policy: {drop}")
+        if max_queue < 1 or batch_size < 1:
+            raise ValueError("max_queue and batch_size must be positive")
+        self.name = name
+        self.handler = handler
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.drop = drop
+        self.interval = interval
+        # With drop="oldest" the deque itself evicts from the left when full
+        self._queue: Deque[Event] = deque(maxlen=max_queue if drop == "oldest" else None)
+        self._wake = threading.Event()
+        self._closing = False
+        self._busy = False
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.high_water = 0
+        self.batches = 0
+        self.errors = 0
+        self.last_error: Optional[BaseException] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name=f"event-bus-{self.name}", daemon=True)
+        self._thread.start()
+
+    def offer(self, event: Event) -> None:
+        """Publisher side: enqueue without blocking, dropping per policy when full."""
+        queue = self._queue
+        depth = len(queue)
+        if depth >= self.max_queue:
+            self.dropped += 1
+            if self.drop == "newest":
+                return
+        else:
+            depth += 1
+            if depth > self.high_water:
+                self.high_water = depth
+        queue.append(event)
+        self.published += 1
+        # Wake the worker early once a full batch is waiting; otherwise it polls every interval
+        if depth == self.batch_size:
+            self._wake.set()
+
+    def _take_batch(self) -> List[Event]:
+        queue = self._queue
+        # Only this consumer removes events and evictions keep the length, so popleft cannot underrun
+        return [queue.popleft() for _ in range(min(len(queue), self.batch_size))]
+
+    def _deliver(self, batch: List[Event], error: Optional[BaseException]) -> None:
+        self.delivered += len(batch)
+        self.batches += 1
+        if error is not None:
+            self.errors += 1
+            self.last_error = error
+
+    def _run(self) -> None:
+        queue = self._queue
+        while True:
+            if not queue:
+                if self._closing:
+                    return
+                self._wake.wait(self.interval)
+                self._wake.clear()
+                continue
+            self._busy = True
+            batch = self._take_batch()
+            error = None
+            try:
+                self.handler(batch)
+            except Exception as e:  # a failing subscriber must not stop its worker
+                error = e
+            self._deliver(batch, error)
+            self._busy = False
+
+    def idle(self) -> bool:
+        return not self._queue and not self._busy
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Deliver what is queued, then stop the worker."""
+        self._closing = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self) -> SubscriptionStats:
+        return SubscriptionStats(self.name, self.published, self.delivered, self.dropped, len(self._queue),
+                                 self.high_water, self.batches, self.errors)
+
+
+class AsyncSubscription(Subscription):
+    """Subscription drained by an asyncio task on the loop it was created in; the handler is a coroutine."""
+
+    def __init__(self, name: str, handler: Callable[[List[Event]], Awaitable[Any]], max_queue: int,
+                 batch_size: int, drop: str, interval: float) -> None:
+        super().__init__(name, handler, max_queue, batch_size, drop, interval)  # type: ignore[arg-type]
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run_async())
+
+    async def _run_async(self) -> None:
+        queue = self._queue
+        while True:
+            if not queue:
+                if self._closing:
+                    return
+                # Publishers may be other threads, so the task polls instead of waiting on a loop primitive
+                await asyncio.sleep(self.interval)
+                continue
+            self._busy = True
+            batch = self._take_batch()
+            error = None
+            try:
+                await self.handler(batch)  # type: ignore[misc]
+            except Exception as e:
+                error = e
+            self._deliver(batch, error)
+            self._busy = False
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        self._closing = True
+
+    async def aclose(self) -> None:
+        """Deliver what is queued, then let the task finish."""
+        self._closing = True
+        if self._task is not None:
+            await self._task
+
+
+class EventBus:
+    def __init__(self) -> None:
+        self._subscriptions: List[Subscription] = []
+        # event type -> subscriptions; replaced, never mutated, so publish reads it without a lock
+        self._routes: Dict[type, Tuple[Subscription, ...]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, handler: Callable[[List[Event]], Any], name: Optional[str] = None,
+                  event_types: Sequence[Type[Any]] = EVENT_TYPES, max_queue: int = 10000,
+                  batch_size: int = 256, drop: str = "oldest", interval: float = 0.005) -> Subscription:
+        """Call ``handler(batch)`` on a worker thread with lists of up to ``batch_size`` events."""
+        subscription = Subscription(name or getattr(handler, "__name__", "subscriber"), handler, max_queue,
+                                    batch_size, drop, interval)
+        self._add(subscription, event_types)
+        return subscription
+
+    def subscribe_async(self, handler: Callable[[List[Event]], Awaitable[Any]], name: Optional[str] = None,
+                        event_types: Sequence[Type[Any]] = EVENT_TYPES, max_queue: int = 10000,
+                        batch_size: int = 256, drop: str = "oldest", interval: float = 0.005) -> AsyncSubscription:
+        """Like subscribe, but ``await handler(batch)`` runs in a task; call from inside the event loop."""
+        subscription = AsyncSubscription(name or getattr(handler, "__name__", "subscriber"), handler, max_queue,
+                                         batch_size, drop, interval)
+        self._add(subscription, event_types)
+        return subscription
+
+    def _add(self, subscription: Subscription, event_types: Sequence[Type[Any]]) -> None:
+        subscription.start()
+        with self._lock:
+            self._subscriptions.append(subscription)
+            routes = dict(self._routes)
+            for event_type in event_types:
+                routes[event_type] = routes.get(event_type, ()) + (subscription,)
+            self._routes = routes
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions.remove(subscription)
+            self._routes = {t: tuple(s for s in subs if s is not subscription) for t, subs in self._routes.items()}
+        subscription.close()
+
+    def publish(self, event: Event) -> None:
+        for subscription in self._routes.get(type(event), ()):
+            subscription.offer(event)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every thread subscription has handled its queue; False on timeout."""
+        deadline = time.monotonic() + timeout
+        for subscription in self._subscriptions:
+            if isinstance(subscription, AsyncSubscription):
+                continue
+            subscription._wake.set()
+            while not subscription.idle():
+                if time.monotonic() > deadline:
+                    return False
+                time.sleep(0.001)
+        return True
+
+    def close(self) -> None:
+        for subscription in list(self._subscriptions):
+            subscription.close()
+
+    def stats(self) -> List[SubscriptionStats]:
+        return [subscription.stats() for subscription in self._subscriptions]
+
+
+class EventPublisher(ParkingListener):
+    """Turns a lot's parks and leaves into VehicleParked / VehicleLeft events on a bus."""
+
+    def __init__(self, bus: EventBus, clock: Callable[[], float] = time.time) -> None:
+        self.bus = bus
+        self.clock = clock
+
+    def on_park(self, lot: ParkingLot, vehicle: Vehicle, is_ev: bool, slot_number: int) -> None:
+        self.bus.publish(VehicleParked(lot.level, is_ev, slot_number, vehicle, self.clock()))
+
+    def on_leave(self, lot: ParkingLot, vehicle: Vehicle, is_ev: bool, slot_number: int) -> None:
+        self.bus.publish(VehicleLeft(lot.level, is_ev, slot_number, vehicle, self.clock()))
@@ -0,0 +1,396 @@
+"""Append-only write-ahead log with periodic snapshots for ParkingLot persistence.
+
+Layout of a log directory::
+
+    snapshot.bin        full lot state plus the first log segment it does not cover
+    wal-000001.log      park/leave records appended after that snapshot
+    wal-000002.log      ...
+
+Every record is ``<length:u16><crc32:u32><payload>``. The payload is
+``<op:u8><is_ev:u8><slot:u32>``; a park record also carries
+``<kind:u8>`` and four length-prefixed UTF-8 strings (reg, make, model, color).
+Recovery loads the snapshot and replays only the segments written after it,
+so its cost is bounded by the snapshot interval, not by the lot's history.
+Re-creating the lot (ParkingLot.reset) starts a new generation: a snapshot of
+the new layout that supersedes every earlier segment.
+A record with a bad CRC or a short read is a torn write and ends its segment.
+"""
+from __future__ import annotations
+import os
+import struct
+import threading
+import time
+import zlib
+from contextlib import nullcontext
+from typing import BinaryIO, Callable, ContextManager, Iterable, Iterator, List, Optional, Tuple
+
+from ..factories.vehicle_factory import PERSISTED_KINDS, create_from_kind, kind_of
+from ..models.parking_listener import ParkingListener
+from ..models.parking_lot import ParkingLot
+from ..models.vehicle import Vehicle
+
+FSYNC_POLICIES = ("always", "group", "none")
+
+OP_PARK = 1
+OP_LEAVE = 2
+
+_RECORD_HEADER = struct.Struct("<HI")
+_EVENT = struct.Struct("<BBI")
+_SNAPSHOT_MAGIC = b"PLSNAP02"
+# magic, level, regular, ev, small, large, next_segment, vehicle count
+_SNAPSHOT_HEADER = struct.Struct("<8sqIIIIIQ")
+_SLOT = struct.Struct("<BI")
+SNAPSHOT_FILE = "snapshot.bin"
+
+
+def _encode_vehicle(vehicle: Vehicle) -> bytes:
+    parts = [bytes((PERSISTED_KINDS.index(kind_of(vehicle)),))]
+    for value in (vehicle.registration_number, vehicle.make, vehicle.model, vehicle.color):
+        raw = value.encode("utf-8")
+        if len(raw) > 255:
+            raise ValueError(f"Field too long to log: {value[:20]}...")
+        parts.append(bytes((len(raw),)))
+        parts.append(raw)
+    return b"".join(parts)
+
+
+def _decode_vehicle(buf: bytes, pos: int) -> Tuple[Vehicle, int]:
+    kind = PERSISTED_KINDS[buf[pos]]
+    pos += 1
+    fields: List[str] = []
+    for _ in range(4):
+        n = buf[pos]
+        fields.append(buf[pos + 1:pos + 1 + n].decode("utf-8"))
+        pos += 1 + n
+    return create_from_kind(kind, *fields), pos
+
+
+def _frame(payload: bytes) -> bytes:
+    return _RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _segment_name(segment: int) -> str:
+    return f"wal-{segment:06d}.log"
+
+
+def _segments(directory: str) -> List[int]:
+    found = []
+    for name in os.listdir(directory):
+        if name.startswith("wal-") and name.endswith(".log"):
+            found.append(int(name[4:-4]))
+    return sorted(found)
+
+
+def _fsync_dir(directory: str) -> None:
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def read_records(path: str) -> Iterator[Tuple[int, bool, int, Optional[Vehicle]]]:
+    """Yield (op, is_ev, slot_number, vehicle) from one segment, stopping at a torn record."""
+    with open(path, "rb") as f:
+        data = f.read()
+    pos = 0
+    while pos + _RECORD_HEADER.size <= len(data):
+        length, crc = _RECORD_HEADER.unpack_from(data, pos)
+        start = pos + _RECORD_HEADER.size
+        payload = data[start:start + length]
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            return
+        op, is_ev, slot = _EVENT.unpack_from(payload)
+        vehicle = _decode_vehicle(payload, _EVENT.size)[0] if op == OP_PARK else None
+        yield op, bool(is_ev), slot, vehicle
+        pos = start + length
+
+
+# level, regular, ev, small, large: what a snapshot needs of the lot besides its vehicles
+_Layout = Tuple[int, int, int, int, int]
+# (is_ev, slot_number, vehicle)
+_Parked = Tuple[bool, int, Vehicle]
+
+
+def _capture(lot: ParkingLot) -> Tuple[_Layout, List[_Parked]]:
+    """The lot's layout and vehicles, cheap to take on the mutation path and encoded later."""
+    small, large = lot.size_capacities()
+    parked = [(is_ev, slot_number, vehicle) for is_ev in (False, True) for slot_number, vehicle in lot.occupied(is_ev)]
+    return (lot.level, len(lot.regular_slots), len(lot.ev_slots), small, large), parked
+
+
+def write_snapshot(lot: ParkingLot, directory: str, next_segment: int) -> None:
+    """Atomically replace the directory's snapshot with the lot's current state."""
+    layout, parked = _capture(lot)
+    _write_snapshot(directory, layout, parked, next_segment)
+
+
+def _write_snapshot(directory: str, layout: _Layout, parked: Iterable[_Parked], next_segment: int) -> None:
+    body = []
+    count = 0
+    for is_ev, slot_number, vehicle in parked:
+        body.append(_SLOT.pack(is_ev, slot_number))
+        body.append(_encode_vehicle(vehicle))
+        count += 1
+    header = _SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, *layout, next_segment, count)
+    payload = header + b"".join(body)
+    tmp = os.path.join(directory, SNAPSHOT_FILE + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(payload)
+        f.write(struct.pack("<I", zlib.crc32(payload)))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, os.path.join(directory, SNAPSHOT_FILE))
+    _fsync_dir(directory)
+
+
+def read_snapshot(directory: str, compact: bool = False) -> Tuple[ParkingLot, int]:
+    """Load the snapshot into a new ParkingLot; returns (lot, first segment to replay)."""
+    with open(os.path.join(directory, SNAPSHOT_FILE), "rb") as f:
+        data = f.read()
+    payload, (crc,) = data[:-4], struct.unpack("<I", data[-4:])
+    if zlib.crc32(payload) != crc:
+        raise ValueError("Snapshot is corrupt")
+    if payload[:8] != _SNAPSHOT_MAGIC:
+        raise ValueError("Not a parking lot snapshot")
+    _, level, regular, ev, small, large, next_segment, count = _SNAPSHOT_HEADER.unpack_from(payload)
+    lot = ParkingLot(level=level, regular_capacity=regular, ev_capacity=ev, compact=compact,
+                     small_capacity=small, large_capacity=large)
+    pos = _SNAPSHOT_HEADER.size
+    for _ in range(count):
+        is_ev, slot_number = _SLOT.unpack_from(payload, pos)
+        vehicle, pos = _decode_vehicle(payload, pos + _SLOT.size)
+        slots = lot.ev_slots if is_ev else lot.regular_slots
+        slots[slot_number - 1].vehicle = vehicle
+    # Rebuild free and lookup indexes from the restored slots
+    lot.__post_init__()
+    return lot, next_segment
+
+
+def recover(directory: str, compact: bool = False) -> ParkingLot:
+    """Rebuild a lot from its latest snapshot plus the log segments written after it."""
+    lot, first_segment = read_snapshot(directory, compact=compact)
+    for segment in _segments(directory):
+        if segment < first_segment:
+            continue
+        for op, is_ev, slot_number, vehicle in read_records(os.path.join(directory, _segment_name(segment))):
+            if op == OP_PARK:
+                # Replay into the logged slot: allocation strategies need not pick the lowest one
+                if not lot.park_at(vehicle, is_ev, slot_number):  # type: ignore[arg-type]
+                    raise ValueError(f"Log replay diverged: slot {slot_number} is not free")
+            elif not lot.leave(slot_number, is_ev):
+                raise ValueError(f"Log replay diverged: slot {slot_number} is already empty")
+    return lot
+
+
+class WriteAheadLog(ParkingListener):
+    """ParkingListener that appends every park/leave of a lot to the log directory.
+
+    fsync policies:
+      - "always": fsync after every record (each event durable before park/leave returns)
+      - "group":  group commit, one fsync per ``group_size`` records or once
+                  ``group_interval`` seconds have passed since the last sync;
+                  a background thread syncs a tail left by a burst, so every
+                  record is durable within ``group_interval`` of its append
+      - "none":   leave flushing to the OS (fastest, loses recent events on power loss)
+
+    A snapshot is taken every ``snapshot_every`` records (0 disables). It
+    must see exactly the parks and leaves already logged, so it is captured
+    with no park or leave in flight: when the lot is shared by several gate
+    threads, attach() is given the controller's ``quiesced`` and a background
+    thread captures under it; otherwise the mutation path captures inline.
+    Either way capturing only starts a new segment and copies the lot's
+    vehicle references; the background thread encodes and writes the
+    snapshot, then deletes the segments it supersedes. Until then recovery
+    uses the previous snapshot and replays every segment since it. A reset of
+    the lot writes the new generation's snapshot before returning, so old-lot
+    records are never replayed against the new layout.
+    """
+
+    def __init__(self, directory: str, fsync: str = "group", group_size: int = 256,
+                 group_interval: float = 0.05, snapshot_every: int = 100000) -> None:
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unsupported fsync policy: {fsync}")
+        self.directory = directory
+        self.fsync = fsync
+        self.group_size = group_size
+        self.group_interval = group_interval
+        self.snapshot_every = snapshot_every
+        self.lot: Optional[ParkingLot] = None
+        self._file: Optional[BinaryIO] = None
+        self._segment = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._since_snapshot = 0
+        # Holds off every park and leave on the lot; see attach()
+        self._quiesce: Callable[[], ContextManager[object]] = nullcontext
+        # Bumped by each synchronous snapshot, so a background one captured before it is dropped
+        self._generation = 0
+        # Appends may come from both pools' gate threads, and from the background threads
+        self._lock = threading.Lock()
+        # Serializes snapshot file writes
+        self._write_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._syncer: Optional[threading.Thread] = None
+        self._snapshotter: Optional[threading.Thread] = None
+        # Last error of a background sync or snapshot
+        self.last_error: Optional[BaseException] = None
+        os.makedirs(directory, exist_ok=True)
+
+    def attach(self, lot: ParkingLot, quiesced: Optional[Callable[[], ContextManager[object]]] = None) -> None:
+        """Start logging a lot; an initial snapshot records its layout and current occupancy.
+
+        Pass ``quiesced`` (e.g. ConcurrentParkingController.quiesced) when
+        several threads park and leave on the lot: a context manager that
+        holds off every park and leave while it is entered.
+        """
+        self.lot = lot
+        self._quiesce = quiesced or nullcontext
+        existing = _segments(self.directory)
+        # Always start a fresh segment so appends never follow a torn tail
+        self._segment = (existing[-1] if existing else 0) + 1
+        self.snapshot()
+        lot.listeners.append(self)
+        if self.fsync == "group" and self._syncer is None:
+            self._closed.clear()
+            self._syncer = threading.Thread(target=self._sync_idle, name="wal-sync", daemon=True)
+            self._syncer.start()
+
+    def detach(self) -> None:
+        if self.lot is not None and self in self.lot.listeners:
+            self.lot.listeners.remove(self)
+        self.close()
+
+    def on_park(self, lot: ParkingLot, vehicle: Vehicle, is_ev: bool, slot_number: int) -> None:
+        self._append(_EVENT.pack(OP_PARK, is_ev, slot_number) + _encode_vehicle(vehicle))
+
+    def on_leave(self, lot: ParkingLot, vehicle: Vehicle, is_ev: bool, slot_number: int) -> None:
+        self._append(_EVENT.pack(OP_LEAVE, is_ev, slot_number))
+
+    def on_reset(self, lot: ParkingLot) -> None:
+        # Resets run with no park or leave in flight, so no quiescing here
+        self._snapshot_now()
+
+    def _append(self, payload: bytes) -> None:
+        with self._lock:
+            self._file.write(_frame(payload))  # type: ignore[union-attr]
+            self._unsynced += 1
+            if self.fsync == "always":
+                self._sync()
+            elif self.fsync == "group" and (
+                self._unsynced >= self.group_size or time.monotonic() - self._last_sync >= self.group_interval
+            ):
+                self._sync()
+            self._since_snapshot += 1
+            if (self.snapshot_every and self._since_snapshot >= self.snapshot_every
+                    and (self._snapshotter is None or not self._snapshotter.is_alive())):
+                if self._quiesce is nullcontext:
+                    # Single writer: the lot holds exactly what has been logged
+                    layout, parked = _capture(self.lot)  # type: ignore[arg-type]
+                    args: Tuple[object, ...] = (self._generation, layout, parked, self._next_segment())
+                else:
+                    # Another pool may be mid-park; capture once every pool is quiet
+                    args = (self._generation,)
+                self._snapshotter = threading.Thread(target=self._background_snapshot, args=args,
+                                                     name="wal-snapshot", daemon=True)
+                self._snapshotter.start()
+
+    def sync(self) -> None:
+        """Make every appended record durable."""
+        with self._lock:
+            self._sync()
+
+    def _sync(self) -> None:
+        if self._file is None:
+            return
+        self._file.flush()
+        if self.fsync != "none":
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _sync_idle(self) -> None:
+        """Sync the tail of a burst that no later append will sync."""
+        while not self._closed.wait(self.group_interval):
+            with self._lock:
+                if not self._unsynced or time.monotonic() - self._last_sync < self.group_interval:
+                    continue
+                try:
+                    self._sync()
+                except OSError as e:
+                    self.last_error = e
+
+    def _next_segment(self) -> int:
+        """Close the current segment and open the next one; the caller holds the lock."""
+        self._close_file()
+        self._segment += 1
+        self._file = open(os.path.join(self.directory, _segment_name(self._segment)), "ab")
+        self._since_snapshot = 0
+        return self._segment
+
+    def _background_snapshot(self, generation: int, layout: Optional[_Layout] = None,
+                             parked: Optional[List[_Parked]] = None, next_segment: int = 0) -> None:
+        try:
+            if layout is None:
+                with self._quiesce(), self._lock:
+                    if generation != self._generation or self._closed.is_set():
+                        return
+                    layout, parked = _capture(self.lot)  # type: ignore[arg-type]
+                    next_segment = self._next_segment()
+            self._write_generation(generation, layout, parked, next_segment)  # type: ignore[arg-type]
+        except (OSError, ValueError) as e:
+            # The previous snapshot and every segment since it still recover the lot
+            self.last_error = e
+
+    def _write_generation(self, generation: int, layout: _Layout, parked: Iterable[_Parked],
+                          next_segment: int) -> None:
+        with self._write_lock:
+            # A newer synchronous snapshot has been written; this one would replace it
+            if generation != self._generation:
+                return
+            _write_snapshot(self.directory, layout, parked, next_segment)
+            for segment in _segments(self.directory):
+                if segment < next_segment:
+                    os.remove(os.path.join(self.directory, _segment_name(segment)))
+
+    def snapshot(self) -> None:
+        """Write a snapshot of the lot now and start a new segment after it."""
+        with self._quiesce():
+            self._snapshot_now()
+
+    def _snapshot_now(self) -> None:
+        """snapshot(), for a caller that already holds off every park and leave."""
+        if self.lot is None:
+            raise ValueError("WriteAheadLog is not attached to a lot")
+        with self._lock:
+            if self._file is None and not self._file_exists(self._segment):
+                # Nothing was logged to the current segment yet; the snapshot covers it
+                next_segment = self._segment
+                self._file = open(os.path.join(self.directory, _segment_name(next_segment)), "ab")
+                self._since_snapshot = 0
+            else:
+                next_segment = self._next_segment()
+            self._generation += 1
+            generation = self._generation
+            layout, parked = _capture(self.lot)
+        self._write_generation(generation, layout, parked, next_segment)
+
+    def _file_exists(self, segment: int) -> bool:
+        return os.path.exists(os.path.join(self.directory, _segment_name(segment)))
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+            self._file = None
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._syncer is not None:
+            self._syncer.join()
+            self._syncer = None
+        if self._snapshotter is not None:
+            self._snapshotter.join()
+        with self._lock:
+            self._close_file()
@@ -0,0 +1,132 @@
+"""Arrival forecasting and EV/regular partition plans for convertible slots."""
+from __future__ import annotations
+import math
+import time
+from typing import Callable, Dict
+
+import numpy as np
+
+from ..models.electric_vehicle import ElectricVehicle
+from ..models.parking_listener import ParkingListener
+from ..models.parking_lot import ParkingLot
+from ..models.vehicle import Vehicle
+from ..strategies.allocation_strategy import PartitionPlan
+
+DAY = 86400.0
+REGULAR, EV = 0, 1
+
+
+class DemandForecaster(ParkingListener):
+    """Counts EV and other arrivals per period of the day and plans the convertible slots ahead of them.
+
+    Arrivals come from a lot's parks plus the rejections a
+    ConvertibleSlotsStrategy reports (``record_rejected``); the last ``days``
+    days are kept in a ring. plan() turns the smoothed forecast into a
+    PartitionPlan. Times are epoch seconds from ``clock``.
+    """
+
+    def __init__(self, period_seconds: float = 900.0, days: int = 28, alpha: float = 0.3,
+                 initial_stay_hours: float = 2.0, clock: Callable[[], float] = time.time) -> None:
+        if DAY % period_seconds:
+            raise ValueError("The period must divide a day evenly")
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        self.period_seconds = period_seconds
+        self.periods = int(DAY // period_seconds)
+        self.alpha = alpha
+        self.clock = clock
+        # Ring of past days: arrivals per (day, period, REGULAR/EV)
+        self._counts = np.zeros((days, self.periods, 2))
+        # Day number held by each ring row; -1 for a row never used
+        self._day_of = np.full(days, -1, dtype=np.int64)
+        self._today = -1
+        # Smoothed mean stay in hours per REGULAR/EV, updated per leave
+        self._stay = [initial_stay_hours, initial_stay_hours]
+        self._parked_at: Dict[str, float] = {}
+
+    def attach(self, lot: ParkingLot) -> None:
+        lot.listeners.append(self)
+
+    def _count(self, kind: int, at: float) -> None:
+        day = int(at // DAY)
+        ring = len(self._day_of)
+        if day > self._today:
+            self._today = day
+        elif day <= self._today - ring:
+            # Older than the window: its row already holds a newer day
+            return
+        row = day % ring
+        # A row is cleared only when a day it did not hold yet claims it, never by a late event
+        if self._day_of[row] != day:
+            self._counts[row] = 0.0
+            self._day_of[row] = day
+        self._counts[row, int(at % DAY // self.period_seconds), kind] += 1
+
+    def on_park(self, lot: ParkingLot, vehicle: Vehicle, is_ev: bool, slot_number: int) -> None:
+        now = self.clock()
+        self._count(EV if isinstance(vehicle, ElectricVehicle) else REGULAR, now)
+        self._parked_at[vehicle.registration_number] = now
+
+    def on_leave(self, lot: ParkingLot, vehicle: Vehicle, is_ev: bool, slot_number: int) -> None:
+        parked_at = self._parked_at.pop(vehicle.registration_number, None)
+        if parked_at is not None:
+            kind = EV if isinstance(vehicle, ElectricVehicle) else REGULAR
+            hours = (self.clock() - parked_at) / 3600
+            self._stay[kind] += 0.05 * (hours - self._stay[kind])
+
+    def record_rejected(self, vehicle: Vehicle) -> None:
+        """Count an arrival that found no slot; pass as a ConvertibleSlotsStrategy's ``on_reject``."""
+        self._count(EV if isinstance(vehicle, ElectricVehicle) else REGULAR, self.clock())
+
+    def mean_stay_hours(self, is_ev: bool) -> float:
+        return self._stay[EV if is_ev else REGULAR]
+
+    def arrivals(self) -> np.ndarray:
+        """Expected arrivals per (period, REGULAR/EV) of a day, from the completed days in the ring.
+
+        Yesterday weighs ``alpha``, the day before ``alpha * (1 - alpha)`` and so
+        on; the weights are rescaled to sum to one over the days on record.
+        """
+        age = self._today - self._day_of
+        # Rows of days skipped without arrivals still hold days from before the window
+        known = (self._day_of >= 0) & (age >= 1) & (age < len(self._day_of))
+        if not known.any():
+            return np.zeros((self.periods, 2))
+        weights = np.where(known, self.alpha * (1 - self.alpha) ** np.where(known, age - 1.0, 0.0), 0.0)
+        return np.tensordot(weights / weights.sum(), self._counts, axes=1)
+
+    def occupancy(self) -> np.ndarray:
+        """Expected occupied slots at the start of each (period, REGULAR/EV), assuming exponential stays.
+
+        Arrivals in period j are still parked k periods later with probability
+        exp(-(k + 1/2) * period / stay); the day repeats, so the tails of earlier
+        days fold into the same circular sum.
+        """
+        arrivals = self.arrivals()
+        lag = (np.arange(self.periods)[:, None] - np.arange(self.periods)[None, :]) % self.periods
+        occupied = np.empty_like(arrivals)
+        for kind in (REGULAR, EV):
+            step = self.period_seconds / 3600 / self._stay[kind]
+            kernel = np.exp(-(lag + 0.5) * step) / (1 - math.exp(-self.periods * step))
+            occupied[:, kind] = kernel @ arrivals[:, kind]
+        return occupied
+
+    def plan(self, lot: ParkingLot, convertible: int, headroom: float = 0.1, lead_periods: int = 4) -> PartitionPlan:
+        """Split ``convertible`` slots between EVs and other vehicles for every period of the day.
+
+        Each pool is sized for its expected peak over the period and the next
+        ``lead_periods``, plus ``headroom``. EVs get the convertible slots they
+        need beyond the EV pool; when both pools need more than there are,
+        the convertible slots are split in proportion to the shortfalls.
+        """
+        occupied = self.occupancy()
+        peak = occupied.copy()
+        for shift in range(1, lead_periods + 1):
+            np.maximum(peak, np.roll(occupied, -shift, axis=0), out=peak)
+        need = np.ceil(peak * (1 + headroom))
+        ev_short = np.clip(need[:, EV] - lot.ev_capacity, 0, convertible)
+        regular_short = np.clip(need[:, REGULAR] - (lot.regular_capacity - convertible), 0, convertible)
+        total = ev_short + regular_short
+        shared = np.floor(convertible * ev_short / np.maximum(total, 1) + 0.5)
+        ev_slots = np.where(total > convertible, shared, ev_short).astype(np.int64)
+        return PartitionPlan(self.period_seconds, tuple(ev_slots.tolist()))
@@ -0,0 +1,207 @@
+"""Headless asyncio front-end for ParkingController over newline-delimited JSON on TCP.
+
+Each request is one JSON object per line and gets one JSON response line, in
+order, on the same connection::
+
+    {"id": 1, "op": "create_lot", "level": 1, "regular": 100, "ev": 20, "small": 10, "large": 5}
+    {"id": 2, "op": "park", "reg": "ABC123", "make": "Toyota", "model": "Corolla", "color": "Blue",
+     "kind": "car", "ev": false}
+    {"id": 3, "op": "leave", "slot": 1, "ev": false}
+    {"id": 4, "op": "find", "reg": "ABC123"}
+    {"id": 5, "op": "query", "color": "Blue", "ev": false}
+    {"id": 6, "op": "status"}
+
+Mutations (create_lot, park, leave) are queued to a single writer task and
+applied strictly in arrival order; reads (find, query, status) are answered
+directly by the connection handler, so they never wait behind the queue.
+
+Run with ``python -m src.redesign.services.parking_service --port 8765``.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..controllers.parking_controller import ParkingController
+from ..factories.vehicle_factory import create_electric, create_vehicle
+from ..models.parking_lot import DuplicateRegistrationError, ParkingLot
+from ..strategies.allocation_strategy import VehicleTypeStrategy
+from .query_service import ParkingQueryService
+
+Request = Dict[str, Any]
+Response = Dict[str, Any]
+
+
+def _error(e: Exception) -> Response:
+    return {"ok": False, "error": f"Missing field: {e}" if isinstance(e, KeyError) else str(e)}
+
+
+class ParkingService:
+    def __init__(self, controller: ParkingController, queue_size: int = 10000) -> None:
+        self.controller = controller
+        self._queue: "asyncio.Queue[Tuple[Request, asyncio.Future]]" = asyncio.Queue(queue_size)
+        self._writer_task: Optional[asyncio.Task] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writes: Dict[str, Callable[[Request], Response]] = {
+            "create_lot": self._create_lot,
+            "park": self._park,
+            "leave": self._leave,
+        }
+        self._reads: Dict[str, Callable[[Request], Response]] = {
+            "find": self._find,
+            "query": self._query,
+            "status": self._status,
+        }
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.AbstractServer:
+        self._writer_task = asyncio.create_task(self._writer())
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        return self._server
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+
+    async def handle(self, request: Request) -> Response:
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "Request must be a JSON object"}
+        op = request.get("op")
+        try:
+            if op in self._reads:
+                response = self._reads[op](request)
+            elif op in self._writes:
+                response = await self._submit(request)
+            else:
+                response = {"ok": False, "error": f"Unknown op: {op}"}
+        except (KeyError, TypeError, ValueError) as e:
+            response = _error(e)
+        if "id" in request:
+            response["id"] = request["id"]
+        return response
+
+    async def _submit(self, request: Request) -> Response:
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        # A full queue makes producers wait here instead of growing without bound
+        await self._queue.put((request, future))
+        return await future
+
+    async def _writer(self) -> None:
+        # The only task that mutates the controller, so mutations need no locking.
+        # Any failure is reported on the request's own future; the loop must keep
+        # running or every later mutation would wait forever
+        while True:
+            request, future = await self._queue.get()
+            try:
+                result = self._writes[request["op"]](request)
+            except Exception as e:
+                result = _error(e)
+            if not future.cancelled():
+                future.set_result(result)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError:
+                    response: Response = {"ok": False, "error": "Invalid JSON"}
+                else:
+                    response = await self.handle(request)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    # Mutations, run only by the writer task
+
+    def _create_lot(self, request: Request) -> Response:
+        level, regular, ev = int(request["level"]), int(request["regular"]), int(request["ev"])
+        self.controller.create_lot(level, regular, ev, int(request.get("small", 0)), int(request.get("large", 0)))
+        return {"ok": True}
+
+    def _park(self, request: Request) -> Response:
+        reg, make, model, color = request["reg"], request["make"], request["model"], request["color"]
+        kind = request.get("kind", "car")
+        try:
+            if request.get("ev"):
+                slot = self.controller.park_ev(create_electric(kind, reg, make, model, color))
+            else:
+                slot = self.controller.park(create_vehicle(kind, reg, make, model, color))
+        except DuplicateRegistrationError as e:
+            return {"ok": False, "error": str(e)}
+        if slot is None:
+            return {"ok": False, "error": "Parking is full for that type"}
+        return {"ok": True, "slot": slot}
+
+    def _leave(self, request: Request) -> Response:
+        slot = int(request["slot"])
+        return {"ok": self.controller.leave(slot, is_ev=bool(request.get("ev")))}
+
+    # Reads, answered directly by connection handlers
+
+    def _find(self, request: Request) -> Response:
+        found = self.controller.lot.find_by_registration(request["reg"])
+        if found is None:
+            return {"ok": False, "error": "Not found"}
+        return {"ok": True, "ev": found[0], "slot": found[1]}
+
+    def _query(self, request: Request) -> Response:
+        filters = {k: request[k] for k in ("color", "make", "model") if k in request}
+        is_ev = request.get("ev")
+        matches = ParkingQueryService(self.controller.lot).find(is_ev=is_ev, **filters)
+        return {"ok": True, "slots": [{"ev": ev, "slot": slot} for ev, slot in matches]}
+
+    def _status(self, request: Request) -> Response:
+        lot = self.controller.lot
+        return {
+            "ok": True,
+            "level": lot.level,
+            "regular_capacity": len(lot.regular_slots),
+            "ev_capacity": len(lot.ev_slots),
+            "free_regular": lot.free_regular_count(),
+            "free_ev": lot.free_ev_count(),
+            "pending_writes": self._queue.qsize(),
+        }
+
+
+async def serve(host: str, port: int) -> None:
+    controller = ParkingController(
+        lot=ParkingLot(level=1, regular_capacity=0, ev_capacity=0),
+        allocation_strategy=VehicleTypeStrategy(),
+    )
+    service = ParkingService(controller)
+    server = await service.start(host, port)
+    print(f"Parking service listening on {host}:{port}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Headless JSON-over-TCP parking service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
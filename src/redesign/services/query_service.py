@@ -0,0 +1,61 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from ..models.parking_lot import INDEXED_ATTRIBUTES, ParkingLot
+
+
+@dataclass
+class ParkingQueryService:
+    """Read-side lookups over a lot's registration and attribute indexes.
+
+    Every query costs the size of its result, never the lot capacity.
+    """
+
+    lot: ParkingLot
+
+    def slot_number_by_registration(self, registration_number: str) -> Optional[Tuple[bool, int]]:
+        return self.lot.find_by_registration(registration_number)
+
+    def slot_numbers_by_color(self, color: str, is_ev: bool = False) -> List[int]:
+        return self._slot_numbers(is_ev, color=color)
+
+    def slot_numbers_by_make(self, make: str, is_ev: bool = False) -> List[int]:
+        return self._slot_numbers(is_ev, make=make)
+
+    def slot_numbers_by_model(self, model: str, is_ev: bool = False) -> List[int]:
+        return self._slot_numbers(is_ev, model=model)
+
+    def registrations_by_color(self, color: str, is_ev: bool = False) -> List[str]:
+        regs = []
+        for slot_number in self._slot_numbers(is_ev, color=color):
+            vehicle = self.lot.vehicle_at(slot_number, is_ev)
+            if vehicle is not None:
+                regs.append(vehicle.registration_number)
+        return regs
+
+    def find(self, is_ev: Optional[bool] = None, **filters: str) -> List[Tuple[bool, int]]:
+        """Return sorted (is_ev, slot_number) keys matching every filter, e.g. find(color="Red", make="Toyota").
+
+        Buckets are kept per pool, and in each pool searched the smallest
+        bucket is intersected with the others, so combined filters cost at
+        most the size of the most selective one.
+        """
+        unknown = set(filters) - set(INDEXED_ATTRIBUTES)
+        if unknown:
+            raise ValueError(f"Unsupported query attributes: {', '.join(sorted(unknown))}")
+        if not filters:
+            raise ValueError("At least one of color, make or model is required")
+        matches: List[Tuple[bool, int]] = []
+        for pool in ((False, True) if is_ev is None else (is_ev,)):
+            buckets = sorted((self.lot.slots_with(attr, value, pool) for attr, value in filters.items()), key=len)
+            found = set(buckets[0])
+            for bucket in buckets[1:]:
+                found.intersection_update(bucket)
+                if not found:
+                    break
+            matches.extend(found)
+        return sorted(matches)
+
+    def _slot_numbers(self, is_ev: bool, **filters: str) -> List[int]:
+        return [slot_number for _, slot_number in self.find(is_ev=is_ev, **filters)]
@@ -0,0 +1,465 @@
+"""Repositories that persist parking lots, occupied slots and tickets.
+
+ParkingController takes an optional repository: it saves the lot layout on
+create_lot and mirrors every park/leave into the repository through a
+RepositoryWriter listener. Two implementations share the interface:
+
+- InMemoryParkingLotRepository: dict-backed, for tests and single-process use
+- SqliteParkingLotRepository: SQLite in WAL mode with indexes on registration,
+  color, make and model, batched ``executemany`` writes and parameterized
+  statements (reused from sqlite3's statement cache)
+"""
+from __future__ import annotations
+import math
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from ..factories.vehicle_factory import create_from_kind, kind_of
+from ..models.parking_listener import ParkingListener
+from ..models.parking_lot import INDEXED_ATTRIBUTES, ParkingLot
+from ..models.vehicle import Vehicle
+
+# (level, is_ev, slot_number)
+SlotKey = Tuple[int, bool, int]
+
+
+@dataclass
+class Ticket:
+    level: int
+    is_ev: bool
+    slot_number: int
+    registration_number: str
+    entered_at: float
+    left_at: Optional[float] = None
+    # Persisted vehicle kind ("car", "ev_car", ...) and charging energy, for billing
+    kind: str = "car"
+    energy_kwh: float = 0.0
+
+
+class ParkingLotRepository(ABC):
+    @abstractmethod
+    def save_lot(self, lot: ParkingLot) -> None:
+        """Replace the stored layout and occupancy of ``lot.level`` with the lot's current state.
+
+        Open tickets on the level whose vehicle is not in that slot any more
+        (every one, after the lot is re-created) are closed.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def load_lot(self, level: int, compact: bool = False) -> Optional[ParkingLot]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def record_park(self, level: int, is_ev: bool, slot_number: int, vehicle: Vehicle, ts: float) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def record_leave(self, level: int, is_ev: bool, slot_number: int, registration_number: str, ts: float) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_by_registration(self, registration_number: str) -> Optional[SlotKey]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_slots(self, level: Optional[int] = None, is_ev: Optional[bool] = None, **filters: str) -> List[SlotKey]:
+        """Sorted slot keys whose vehicle matches every color/make/model filter."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def tickets(self, registration_number: str) -> List[Ticket]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def closed_tickets(self, since: float = -math.inf, until: float = math.inf) -> List[Ticket]:
+        """Tickets closed in [since, until), in the order they were opened."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def add_energy(self, registration_number: str, kwh: float) -> None:
+        """Add charging energy to the vehicle's latest ticket; fits ChargingEngine's ``on_session_end``."""
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        """Write out any buffered changes; a no-op for unbuffered repositories."""
+
+    def close(self) -> None:
+        self.flush()
+
+
+def _check_filters(filters: Dict[str, str]) -> None:
+    unknown = set(filters) - set(INDEXED_ATTRIBUTES)
+    if unknown:
+        raise ValueError(f"Unsupported query attributes: {', '.join(sorted(unknown))}")
+
+
+def _still_parked(lot: ParkingLot, ticket: Ticket) -> bool:
+    vehicle = lot.vehicle_at(ticket.slot_number, ticket.is_ev)
+    return vehicle is not None and vehicle.registration_number == ticket.registration_number
+
+
+class RepositoryWriter(ParkingListener):
+    """Mirrors a lot's park/leave events into a repository."""
+
+    def __init__(self, repository: ParkingLotRepository) -> None:
+        self.repository = repository
+
+    def on_park(self, lot: ParkingLot, vehicle: Vehicle, is_ev: bool, slot_number: int) -> None:
+        self.repository.record_park(lot.level, is_ev, slot_number, vehicle, time.time())
+
+    def on_leave(self, lot: ParkingLot, vehicle: Vehicle, is_ev: bool, slot_number: int) -> None:
+        self.repository.record_leave(lot.level, is_ev, slot_number, vehicle.registration_number, time.time())
+
+
+@dataclass
+class InMemoryParkingLotRepository(ParkingLotRepository):
+    # level -> (regular, ev, small, large) capacities
+    _lots: Dict[int, Tuple[int, int, int, int]] = field(default_factory=dict)
+    _slots: Dict[SlotKey, Vehicle] = field(default_factory=dict)
+    _by_registration: Dict[str, SlotKey] = field(default_factory=dict)
+    _by_attribute: Dict[str, Dict[str, Set[SlotKey]]] = field(
+        default_factory=lambda: {attr: {} for attr in INDEXED_ATTRIBUTES})
+    _tickets: Dict[str, List[Ticket]] = field(default_factory=dict)
+    # registration_number -> its open ticket
+    _open: Dict[str, Ticket] = field(default_factory=dict)
+
+    def save_lot(self, lot: ParkingLot) -> None:
+        for key in [k for k in self._slots if k[0] == lot.level]:
+            self._remove(key)
+        now = time.time()
+        for reg, ticket in list(self._open.items()):
+            if ticket.level == lot.level and not _still_parked(lot, ticket):
+                ticket.left_at = now
+                del self._open[reg]
+        self._lots[lot.level] = (len(lot.regular_slots), len(lot.ev_slots), *lot.size_capacities())
+        for is_ev in (False, True):
+            for slot_number, vehicle in lot.occupied(is_ev):
+                self._put((lot.level, is_ev, slot_number), vehicle)
+
+    def load_lot(self, level: int, compact: bool = False) -> Optional[ParkingLot]:
+        if level not in self._lots:
+            return None
+        regular, ev, small, large = self._lots[level]
+        lot = ParkingLot(level=level, regular_capacity=regular, ev_capacity=ev, compact=compact,
+                         small_capacity=small, large_capacity=large)
+        for (lvl, is_ev, slot_number), vehicle in self._slots.items():
+            if lvl == level:
+                (lot.ev_slots if is_ev else lot.regular_slots)[slot_number - 1].vehicle = vehicle
+        lot.__post_init__()
+        return lot
+
+    def record_park(self, level: int, is_ev: bool, slot_number: int, vehicle: Vehicle, ts: float) -> None:
+        key = (level, is_ev, slot_number)
+        self._put(key, vehicle)
+        ticket = Ticket(level, is_ev, slot_number, vehicle.registration_number, ts, kind=kind_of(vehicle))
+        self._tickets.setdefault(vehicle.registration_number, []).append(ticket)
+        self._open[vehicle.registration_number] = ticket
+
+    def record_leave(self, level: int, is_ev: bool, slot_number: int, registration_number: str, ts: float) -> None:
+        key = (level, is_ev, slot_number)
+        if key in self._slots:
+            self._remove(key)
+        ticket = self._open.pop(registration_number, None)
+        if ticket is not None:
+            ticket.left_at = ts
+
+    def find_by_registration(self, registration_number: str) -> Optional[SlotKey]:
+        return self._by_registration.get(registration_number)
+
+    def find_slots(self, level: Optional[int] = None, is_ev: Optional[bool] = None, **filters: str) -> List[SlotKey]:
+        _check_filters(filters)
+        buckets = sorted((self._by_attribute[a].get(v, set()) for a, v in filters.items()), key=len)
+        matches = set(buckets[0]) if buckets else set(self._slots)
+        for bucket in buckets[1:]:
+            matches &= bucket
+        return sorted(k for k in matches if (level is None or k[0] == level) and (is_ev is None or k[1] == is_ev))
+
+    def tickets(self, registration_number: str) -> List[Ticket]:
+        return list(self._tickets.get(registration_number, ()))
+
+    def closed_tickets(self, since: float = -math.inf, until: float = math.inf) -> List[Ticket]:
+        closed = [t for tickets in self._tickets.values() for t in tickets
+                  if t.left_at is not None and since <= t.left_at < until]
+        return sorted(closed, key=lambda t: t.entered_at)
+
+    def add_energy(self, registration_number: str, kwh: float) -> None:
+        tickets = self._tickets.get(registration_number)
+        if tickets:
+            tickets[-1].energy_kwh += kwh
+
+    def _put(self, key: SlotKey, vehicle: Vehicle) -> None:
+        self._slots[key] = vehicle
+        self._by_registration[vehicle.registration_number] = key
+        for attr in INDEXED_ATTRIBUTES:
+            self._by_attribute[attr].setdefault(getattr(vehicle, attr), set()).add(key)
+
+    def _remove(self, key: SlotKey) -> None:
+        vehicle = self._slots.pop(key)
+        del self._by_registration[vehicle.registration_number]
+        for attr in INDEXED_ATTRIBUTES:
+            self._by_attribute[attr][getattr(vehicle, attr)].discard(key)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS lots (
+    level INTEGER PRIMARY KEY,
+    regular_capacity INTEGER NOT NULL,
+    ev_capacity INTEGER NOT NULL,
+    small_capacity INTEGER NOT NULL DEFAULT 0,
+    large_capacity INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS slots (
+    level INTEGER NOT NULL,
+    is_ev INTEGER NOT NULL,
+    slot_number INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    registration_number TEXT NOT NULL,
+    make TEXT NOT NULL,
+    model TEXT NOT NULL,
+    color TEXT NOT NULL,
+    PRIMARY KEY (level, is_ev, slot_number)
+) WITHOUT ROWID;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_slots_registration ON slots (registration_number);
+CREATE INDEX IF NOT EXISTS idx_slots_color ON slots (color);
+CREATE INDEX IF NOT EXISTS idx_slots_make ON slots (make);
+CREATE INDEX IF NOT EXISTS idx_slots_model ON slots (model);
+CREATE TABLE IF NOT EXISTS tickets (
+    id INTEGER PRIMARY KEY,
+    level INTEGER NOT NULL,
+    is_ev INTEGER NOT NULL,
+    slot_number INTEGER NOT NULL,
+    registration_number TEXT NOT NULL,
+    entered_at REAL NOT NULL,
+    left_at REAL,
+    kind TEXT NOT NULL DEFAULT 'car',
+    energy_kwh REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_tickets_registration ON tickets (registration_number);
+CREATE INDEX IF NOT EXISTS idx_tickets_left ON tickets (left_at);
+CREATE INDEX IF NOT EXISTS idx_tickets_open_registration ON tickets (registration_number) WHERE left_at IS NULL;
+"""
+
+_INSERT_SLOT = (
+    "INSERT INTO slots (level, is_ev, slot_number, kind, registration_number, make, model, color)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_DELETE_SLOT = "DELETE FROM slots WHERE level = ? AND is_ev = ? AND slot_number = ?"
+_OPEN_TICKET = (
+    "INSERT INTO tickets (level, is_ev, slot_number, registration_number, entered_at, kind) VALUES (?, ?, ?, ?, ?, ?)"
+)
+_CLOSE_TICKET = "UPDATE tickets SET left_at = ? WHERE registration_number = ? AND left_at IS NULL"
+_ADD_ENERGY = (
+    "UPDATE tickets SET energy_kwh = energy_kwh + ?"
+    " WHERE id = (SELECT MAX(id) FROM tickets WHERE registration_number = ?)"
+)
+_SELECT_TICKETS = (
+    "SELECT level, is_ev, slot_number, registration_number, entered_at, left_at, kind, energy_kwh FROM tickets"
+)
+
+
+class SqliteParkingLotRepository(ParkingLotRepository):
+    """SQLite-backed repository.
+
+    Park/leave writes are buffered and flushed with ``executemany`` once
+    ``batch_size`` are pending, once the oldest has waited ``max_delay``
+    seconds (checked by a background thread, so a quiet lot is not left
+    stale), or before any read, so reads always see them. Consecutive writes
+    of the same statement go out as one batch and the statement order is
+    preserved. ``batch_size=1`` commits every event. A batch that fails on a
+    transient error (sqlite3.OperationalError, e.g. a locked database) stays
+    pending and is retried by the next flush. A write that violates a
+    constraint (sqlite3.IntegrityError) would fail on every retry, so the
+    rest of its batch is written without it and it is set aside in
+    ``dead_letters``. A lock serializes access so the concurrent controllers
+    can share one instance.
+    """
+
+    def __init__(self, path: str, batch_size: int = 512, max_delay: Optional[float] = 1.0) -> None:
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.RLock()
+        # (statement, params) in the order the events happened
+        self._pending: List[Tuple[str, tuple]] = []
+        # time.monotonic() of the oldest pending write
+        self._oldest = 0.0
+        # Last error of a background flush; the batch is retried, and fails again on the caller's flush
+        self.last_error: Optional[BaseException] = None
+        # (statement, params, error) of writes dropped because they violate a constraint
+        self.dead_letters: List[Tuple[str, tuple, str]] = []
+        self._closed = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if max_delay is not None:
+            self._flusher = threading.Thread(target=self._flush_stale, name="repository-flush", daemon=True)
+            self._flusher.start()
+
+    def save_lot(self, lot: ParkingLot) -> None:
+        rows = [
+            (lot.level, is_ev, slot_number, kind_of(v), v.registration_number, v.make, v.model, v.color)
+            for is_ev in (False, True)
+            for slot_number, v in lot.occupied(is_ev)
+        ]
+        with self._lock:
+            self.flush()
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO lots (level, regular_capacity, ev_capacity, small_capacity, large_capacity)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (lot.level, len(lot.regular_slots), len(lot.ev_slots), *lot.size_capacities()),
+                )
+                self._conn.execute("DELETE FROM slots WHERE level = ?", (lot.level,))
+                self._conn.executemany(_INSERT_SLOT, rows)
+                open_tickets = self._conn.execute(
+                    "SELECT id, is_ev, slot_number, registration_number FROM tickets"
+                    " WHERE level = ? AND left_at IS NULL", (lot.level,)).fetchall()
+                now = time.time()
+                self._conn.executemany("UPDATE tickets SET left_at = ? WHERE id = ?", [
+                    (now, ticket_id) for ticket_id, is_ev, slot_number, reg in open_tickets
+                    if not _still_parked(lot, Ticket(lot.level, bool(is_ev), slot_number, reg, 0.0))
+                ])
+
+    def load_lot(self, level: int, compact: bool = False) -> Optional[ParkingLot]:
+        layout = self._query(
+            "SELECT regular_capacity, ev_capacity, small_capacity, large_capacity FROM lots WHERE level = ?", (level,))
+        if not layout:
+            return None
+        regular, ev, small, large = layout[0]
+        lot = ParkingLot(level=level, regular_capacity=regular, ev_capacity=ev, compact=compact,
+                         small_capacity=small, large_capacity=large)
+        rows = self._query(
+            "SELECT is_ev, slot_number, kind, registration_number, make, model, color FROM slots WHERE level = ?",
+            (level,),
+        )
+        for is_ev, slot_number, kind, reg, make, model, color in rows:
+            slots = lot.ev_slots if is_ev else lot.regular_slots
+            slots[slot_number - 1].vehicle = create_from_kind(kind, reg, make, model, color)
+        lot.__post_init__()
+        return lot
+
+    def record_park(self, level: int, is_ev: bool, slot_number: int, vehicle: Vehicle, ts: float) -> None:
+        v = vehicle
+        with self._lock:
+            if not self._pending:
+                self._oldest = time.monotonic()
+            self._pending.append(
+                (_INSERT_SLOT, (level, is_ev, slot_number, kind_of(v), v.registration_number, v.make, v.model, v.color)))
+            self._pending.append((_OPEN_TICKET, (level, is_ev, slot_number, v.registration_number, ts, kind_of(v))))
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def record_leave(self, level: int, is_ev: bool, slot_number: int, registration_number: str, ts: float) -> None:
+        with self._lock:
+            if not self._pending:
+                self._oldest = time.monotonic()
+            self._pending.append((_DELETE_SLOT, (level, is_ev, slot_number)))
+            self._pending.append((_CLOSE_TICKET, (ts, registration_number)))
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            pending = self._pending
+            if not pending:
+                return
+            # On an error the transaction rolls back; anything but a constraint violation leaves the batch pending
+            try:
+                with self._conn:
+                    start = 0
+                    while start < len(pending):
+                        # Group the run of consecutive identical statements into one executemany
+                        sql = pending[start][0]
+                        end = start + 1
+                        while end < len(pending) and pending[end][0] == sql:
+                            end += 1
+                        self._conn.executemany(sql, [params for _, params in pending[start:end]])
+                        start = end
+            except sqlite3.IntegrityError:
+                self._flush_each(pending)
+            self._pending = []
+
+    def _flush_each(self, pending: List[Tuple[str, tuple]]) -> None:
+        """Write a batch one statement at a time, setting aside the ones that violate a constraint."""
+        rejected = []
+        with self._conn:
+            for sql, params in pending:
+                try:
+                    self._conn.execute(sql, params)
+                except sqlite3.IntegrityError as e:
+                    rejected.append((sql, params, str(e)))
+        self.dead_letters.extend(rejected)
+
+    def _flush_stale(self) -> None:
+        assert self.max_delay is not None
+        while True:
+            with self._lock:
+                due = self._oldest + self.max_delay if self._pending else None
+            wait = self.max_delay if due is None else max(due - time.monotonic(), 0.0)
+            if self._closed.wait(wait):
+                return
+            with self._lock:
+                if not self._pending or time.monotonic() < self._oldest + self.max_delay:
+                    continue
+                try:
+                    self.flush()
+                except sqlite3.Error as e:
+                    self.last_error = e
+                    # Retry after another max_delay instead of spinning on a failing batch
+                    self._oldest = time.monotonic()
+
+    def _query(self, sql: str, params: Sequence[object]) -> List[tuple]:
+        # Flush first so reads always observe every recorded event
+        with self._lock:
+            self.flush()
+            return self._conn.execute(sql, params).fetchall()
+
+    def find_by_registration(self, registration_number: str) -> Optional[SlotKey]:
+        rows = self._query(
+            "SELECT level, is_ev, slot_number FROM slots WHERE registration_number = ?", (registration_number,))
+        return (rows[0][0], bool(rows[0][1]), rows[0][2]) if rows else None
+
+    def find_slots(self, level: Optional[int] = None, is_ev: Optional[bool] = None, **filters: str) -> List[SlotKey]:
+        _check_filters(filters)
+        clauses = [f"{attr} = ?" for attr in sorted(filters)]
+        params: List[object] = [filters[attr] for attr in sorted(filters)]
+        if level is not None:
+            clauses.append("level = ?")
+            params.append(level)
+        if is_ev is not None:
+            clauses.append("is_ev = ?")
+            params.append(is_ev)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._query(
+            f"SELECT level, is_ev, slot_number FROM slots{where} ORDER BY level, is_ev, slot_number", params)
+        return [(lvl, bool(ev), slot) for lvl, ev, slot in rows]
+
+    def tickets(self, registration_number: str) -> List[Ticket]:
+        rows = self._query(_SELECT_TICKETS + " WHERE registration_number = ? ORDER BY id", (registration_number,))
+        return [Ticket(lvl, bool(ev), *rest) for lvl, ev, *rest in rows]
+
+    def closed_tickets(self, since: float = -math.inf, until: float = math.inf) -> List[Ticket]:
+        rows = self._query(_SELECT_TICKETS + " WHERE left_at >= ? AND left_at < ? ORDER BY id", (since, until))
+        return [Ticket(lvl, bool(ev), *rest) for lvl, ev, *rest in rows]
+
+    def add_energy(self, registration_number: str, kwh: float) -> None:
+        with self._lock:
+            if not self._pending:
+                self._oldest = time.monotonic()
+            self._pending.append((_ADD_ENERGY, (kwh, registration_number)))
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        with self._lock:
+            self.flush()
+            self._conn.close()
@@ -0,0 +1,222 @@
+"""Discrete-event simulation of lot traffic through ParkingController.
+
+Arrivals and departures are events in one heap ordered by (time, sequence).
+Each arrival creates a vehicle from the configured mix with
+create_vehicle/create_electric, parks it through the controller's strategy,
+and on success schedules its departure after a sampled dwell time. Times are
+in hours. Runs are deterministic for a given SimulationConfig, seed included.
+"""
+from __future__ import annotations
+import heapq
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Union
+
+from ..controllers.parking_controller import ParkingController
+from ..factories.vehicle_factory import create_electric, create_vehicle
+from ..models.parking_lot import ParkingLot
+from ..models.vehicle import Vehicle
+from ..strategies.registry import create_strategy
+
+ARRIVAL, DEPARTURE = 0, 1
+
+
+@dataclass(frozen=True)
+class Exponential:
+    mean: float
+
+    def sample(self, rng: random.Random) -> float:
+        return rng.expovariate(1 / self.mean)
+
+
+@dataclass(frozen=True)
+class LogNormal:
+    """Log-normal with the given mean (not median) and shape ``sigma``."""
+
+    mean: float
+    sigma: float
+
+    def sample(self, rng: random.Random) -> float:
+        return rng.lognormvariate(math.log(self.mean) - self.sigma ** 2 / 2, self.sigma)
+
+
+@dataclass(frozen=True)
+class Uniform:
+    low: float
+    high: float
+
+    def sample(self, rng: random.Random) -> float:
+        return rng.uniform(self.low, self.high)
+
+
+@dataclass(frozen=True)
+class Constant:
+    value: float
+
+    def sample(self, rng: random.Random) -> float:
+        return self.value
+
+
+Distribution = Union[Exponential, LogNormal, Uniform, Constant]
+
+_DISTRIBUTIONS = {"exp": Exponential, "lognormal": LogNormal, "uniform": Uniform, "const": Constant}
+
+
+def parse_distribution(text: str) -> Distribution:
+    """Parse ``exp:MEAN``, ``lognormal:MEAN:SIGMA``, ``uniform:LOW:HIGH`` or ``const:VALUE``."""
+    name, *params = text.split(":")
+    try:
+        return _DISTRIBUTIONS[name](*(float(p) for p in params))
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"Bad distribution: {text}") from None
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parse ``car=0.7,ev_car=0.2,...`` into a kind -> share mapping."""
+    mix: Dict[str, float] = {}
+    for part in text.split(","):
+        kind, _, share = part.partition("=")
+        if kind.strip() not in _KINDS:
+            raise ValueError(f"Unknown vehicle kind in mix: {kind}")
+        mix[kind.strip()] = float(share)
+    return mix
+
+
+# mix kind -> (electric, factory kind)
+_KINDS = {
+    "car": (False, "car"),
+    "motorcycle": (False, "motorcycle"),
+    "truck": (False, "truck"),
+    "ev_car": (True, "car"),
+    "ev_bike": (True, "bike"),
+}
+
+
+@dataclass(frozen=True)
+class SimulationConfig:
+    regular_capacity: int = 1000
+    ev_capacity: int = 100
+    small_capacity: int = 0
+    large_capacity: int = 0
+    strategy: str = "by_type"
+    # Time between arrivals and time parked, in hours
+    interarrival: Distribution = Exponential(1 / 400)
+    dwell: Distribution = LogNormal(2.5, 0.8)
+    mix: Tuple[Tuple[str, float], ...] = (
+        ("car", 0.65), ("motorcycle", 0.1), ("truck", 0.08), ("ev_car", 0.14), ("ev_bike", 0.03))
+    hours: float = 24 * 30
+    # Stop early once this many events ran; None runs for the full ``hours``
+    max_events: Optional[int] = None
+    seed: int = 0
+
+
+@dataclass
+class SimulationResult:
+    events: int = 0
+    arrivals: int = 0
+    rejected: int = 0
+    # Simulated hours covered and occupied slot-hours over them
+    hours: float = 0.0
+    slot_hours: float = 0.0
+    capacity: int = 0
+    peak_occupied: int = 0
+    rejected_by_kind: Dict[str, int] = field(default_factory=dict)
+    wall_seconds: float = 0.0
+
+    @property
+    def utilization(self) -> float:
+        return self.slot_hours / (self.capacity * self.hours) if self.capacity and self.hours else 0.0
+
+    @property
+    def rejection_rate(self) -> float:
+        return self.rejected / self.arrivals if self.arrivals else 0.0
+
+    @property
+    def ops_per_sec(self) -> float:
+        return self.events / self.wall_seconds if self.wall_seconds else 0.0
+
+    def summary(self) -> str:
+        kinds = ", ".join(f"{k} {v:,}" for k, v in sorted(self.rejected_by_kind.items()) if v)
+        return (
+            f"{self.events:,} events over {self.hours:,.1f} h in {self.wall_seconds:.2f} s "
+            f"({self.ops_per_sec:,.0f} events/s)\n"
+            f"utilization {self.utilization:.1%}, peak {self.peak_occupied:,}/{self.capacity:,} slots\n"
+            f"arrivals {self.arrivals:,}, rejected {self.rejected:,} ({self.rejection_rate:.2%})"
+            + (f": {kinds}" if kinds else "")
+        )
+
+
+def build_controller(config: SimulationConfig) -> ParkingController:
+    lot = ParkingLot(level=1, regular_capacity=config.regular_capacity, ev_capacity=config.ev_capacity,
+                     small_capacity=config.small_capacity, large_capacity=config.large_capacity)
+    return ParkingController(lot=lot, allocation_strategy=create_strategy(config.strategy))
+
+
+def simulate(config: SimulationConfig, controller: Optional[ParkingController] = None) -> SimulationResult:
+    """Run one simulation; ``controller`` defaults to a fresh one built from the config."""
+    controller = controller or build_controller(config)
+    lot = controller.lot
+    rng = random.Random(config.seed)
+    kinds = [kind for kind, _ in config.mix]
+    cum_weights: List[float] = []
+    total = 0.0
+    for _, share in config.mix:
+        total += share
+        cum_weights.append(total)
+    interarrival, dwell = config.interarrival, config.dwell
+    result = SimulationResult(capacity=len(lot.regular_slots) + len(lot.ev_slots),
+                              rejected_by_kind={kind: 0 for kind in kinds})
+    max_events = config.max_events if config.max_events is not None else math.inf
+
+    # (time, sequence, event, payload): the payload of a departure is the
+    # (is_ev, slot_number) it frees; arrivals have none
+    queue: List[Tuple[float, int, int, object]] = [(interarrival.sample(rng), 0, ARRIVAL, None)]
+    seq = 1
+    occupied = 0
+    now = 0.0
+    push, pop = heapq.heappush, heapq.heappop
+    start = time.perf_counter()
+    while queue and result.events < max_events:
+        at, _, event, payload = pop(queue)
+        if at > config.hours:
+            break
+        result.slot_hours += occupied * (at - now)
+        now = at
+        result.events += 1
+        if event == ARRIVAL:
+            result.arrivals += 1
+            kind = rng.choices(kinds, cum_weights=cum_weights)[0]
+            electric, factory_kind = _KINDS[kind]
+            reg = f"SIM{result.arrivals}"
+            vehicle: Vehicle
+            if electric:
+                vehicle = create_electric(factory_kind, reg, "Make", "Model", "White")  # type: ignore[arg-type]
+                slot = controller.park_ev(vehicle)  # type: ignore[arg-type]
+            else:
+                vehicle = create_vehicle(factory_kind, reg, "Make", "Model", "White")  # type: ignore[arg-type]
+                slot = controller.park(vehicle)
+            if slot is None:
+                result.rejected += 1
+                result.rejected_by_kind[kind] += 1
+            else:
+                occupied += 1
+                result.peak_occupied = max(result.peak_occupied, occupied)
+                # Strategies may put any vehicle in either pool, so ask the lot which one it took
+                key = lot.find_by_registration(reg)
+                push(queue, (now + dwell.sample(rng), seq, DEPARTURE, key))
+                seq += 1
+            push(queue, (now + interarrival.sample(rng), seq, ARRIVAL, None))
+            seq += 1
+        else:
+            is_ev, slot_number = payload  # type: ignore[misc]
+            controller.leave(slot_number, is_ev)
+            occupied -= 1
+    result.wall_seconds = time.perf_counter() - start
+    # A run cut short by max_events covers only the simulated time reached
+    if result.events < max_events:
+        result.slot_hours += occupied * (config.hours - now)
+        now = config.hours
+    result.hours = now
+    return result
@@ -0,0 +1,176 @@
+"""Incrementally maintained status report for a ParkingLot.
+
+StatusViewModel is a ParkingListener: it is seeded once from the lot and then
+updated on every park/leave (and re-seeded when create_lot replaces the
+layout), so counts are O(1) and a page of the occupied slot listing costs
+O(page) rows instead of a walk over every slot.
+"""
+from __future__ import annotations
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..models.parking_listener import ParkingListener
+from ..models.parking_lot import ParkingLot
+from ..models.vehicle import Vehicle
+
+PAGE_SIZE = 50
+
+# Same columns as the original status printout
+_HEADER = "Slot\tFloor\tReg No.\t\tColor \t\tMake \t\tModel\n"
+
+
+class _SortedSlots:
+    """Sorted slot numbers kept in buckets, so an insert or removal shifts one bucket, not the whole list."""
+
+    LOAD = 512
+
+    def __init__(self, slot_numbers: Iterable[int] = ()) -> None:
+        ordered = sorted(slot_numbers)
+        self._buckets = [ordered[i:i + self.LOAD] for i in range(0, len(ordered), self.LOAD)]
+        self._maxes = [bucket[-1] for bucket in self._buckets]
+        self._len = len(ordered)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def add(self, slot_number: int) -> None:
+        if not self._buckets:
+            self._buckets.append([slot_number])
+            self._maxes.append(slot_number)
+        else:
+            i = bisect_left(self._maxes, slot_number)
+            if i == len(self._maxes):
+                i -= 1
+                self._buckets[i].append(slot_number)
+                self._maxes[i] = slot_number
+            else:
+                insort(self._buckets[i], slot_number)
+            bucket = self._buckets[i]
+            if len(bucket) > 2 * self.LOAD:
+                self._buckets[i:i + 1] = [bucket[:self.LOAD], bucket[self.LOAD:]]
+                self._maxes[i:i + 1] = [bucket[self.LOAD - 1], bucket[-1]]
+        self._len += 1
+
+    def discard(self, slot_number: int) -> None:
+        i = bisect_left(self._maxes, slot_number)
+        if i == len(self._maxes):
+            return
+        bucket = self._buckets[i]
+        j = bisect_left(bucket, slot_number)
+        if j == len(bucket) or bucket[j] != slot_number:
+            return
+        del bucket[j]
+        self._len -= 1
+        if not bucket:
+            del self._buckets[i]
+            del self._maxes[i]
+        elif j == len(bucket):
+            self._maxes[i] = bucket[-1]
+
+    def slice(self, start: int, stop: int) -> List[int]:
+        """Slot numbers at sorted positions [start, stop)."""
+        out: List[int] = []
+        pos = 0
+        for bucket in self._buckets:
+            end = pos + len(bucket)
+            if end > start:
+                if pos >= stop:
+                    break
+                out.extend(bucket[max(0, start - pos):stop - pos])
+            pos = end
+        return out
+
+
+class StatusViewModel(ParkingListener):
+    """Occupancy counts, per-type counts and the ordered occupied-slot list of one lot.
+
+    The regular and EV pools keep separate state, so each pool's updates only
+    touch what that pool's lock guards in ConcurrentParkingController.
+    """
+
+    def __init__(self) -> None:
+        self.lot: Optional[ParkingLot] = None
+        self._slots: Dict[bool, _SortedSlots] = {False: _SortedSlots(), True: _SortedSlots()}
+        self._types: Dict[bool, Dict[str, int]] = {False: {}, True: {}}
+
+    def attach(self, lot: ParkingLot) -> None:
+        self.lot = lot
+        self.reset()
+        lot.listeners.append(self)
+
+    def detach(self) -> None:
+        if self.lot is not None and self in self.lot.listeners:
+            self.lot.listeners.remove(self)
+        self.lot = None
+
+    def reset(self) -> None:
+        """Re-seed from the lot, e.g. after its layout changed; O(occupied) once."""
+        for is_ev in (False, True):
+            types: Dict[str, int] = {}
+            occupied = []
+            if self.lot is not None:
+                for slot_number, vehicle in self.lot.occupied(is_ev):
+                    occupied.append(slot_number)
+                    types[vehicle.get_type()] = types.get(vehicle.get_type(), 0) + 1
+            self._slots[is_ev] = _SortedSlots(occupied)
+            self._types[is_ev] = types
+
+    def on_park(self, lot: ParkingLot, vehicle: Vehicle, is_ev: bool, slot_number: int) -> None:
+        self._slots[is_ev].add(slot_number)
+        types = self._types[is_ev]
+        types[vehicle.get_type()] = types.get(vehicle.get_type(), 0) + 1
+
+    def on_leave(self, lot: ParkingLot, vehicle: Vehicle, is_ev: bool, slot_number: int) -> None:
+        self._slots[is_ev].discard(slot_number)
+        self._types[is_ev][vehicle.get_type()] -= 1
+
+    def on_reset(self, lot: ParkingLot) -> None:
+        self.reset()
+
+    def occupied_count(self, is_ev: bool) -> int:
+        return len(self._slots[is_ev])
+
+    def type_counts(self, is_ev: Optional[bool] = None) -> Dict[str, int]:
+        """Parked vehicles per get_type() value, for one pool or both."""
+        counts: Dict[str, int] = {}
+        for pool in (False, True) if is_ev is None else (is_ev,):
+            for kind, n in self._types[pool].items():
+                if n:
+                    counts[kind] = counts.get(kind, 0) + n
+        return counts
+
+    def page_count(self, is_ev: bool, page_size: int = PAGE_SIZE) -> int:
+        return max(1, -(-len(self._slots[is_ev]) // page_size))
+
+    def rows(self, is_ev: bool, start: int, stop: int) -> List[Tuple[int, Vehicle]]:
+        """(slot_number, vehicle) at positions [start, stop) of the occupied listing."""
+        rows = []
+        for slot_number in self._slots[is_ev].slice(start, stop):
+            vehicle = self.lot.vehicle_at(slot_number, is_ev)  # type: ignore[union-attr]
+            if vehicle is not None:
+                rows.append((slot_number, vehicle))
+        return rows
+
+    def page(self, is_ev: bool, number: int = 1, page_size: int = PAGE_SIZE) -> List[Tuple[int, Vehicle]]:
+        """Rows of a 1-based page of the occupied listing."""
+        start = (number - 1) * page_size
+        return self.rows(is_ev, start, start + page_size)
+
+    def summary(self) -> str:
+        lot = self.lot
+        if lot is None:
+            return "No lot"
+        regular, ev = len(lot.regular_slots), len(lot.ev_slots)
+        types = ", ".join(f"{kind}: {n}" for kind, n in sorted(self.type_counts().items())) or "none"
+        return (
+            f"Level {lot.level}: {self.occupied_count(False)}/{regular} regular slots occupied, "
+            f"{self.occupied_count(True)}/{ev} ev slots occupied ({types})"
+        )
+
+    def render_page(self, is_ev: bool, number: int = 1, page_size: int = PAGE_SIZE) -> str:
+        title = "Electric Vehicles" if is_ev else "Vehicles"
+        level = self.lot.level if self.lot is not None else ""
+        lines = [f"{title} (page {number}/{self.page_count(is_ev, page_size)})\n", _HEADER]
+        for slot_number, v in self.page(is_ev, number, page_size):
+            lines.append(f"{slot_number}\t{level}\t{v.registration_number}\t\t{v.color}\t\t{v.make}\t\t{v.model}\n")
+        return "".join(lines)
@@ -1,21 +1,300 @@
+import bisect
+import time
 from abc import ABC, abstractmethod
-from typing import Optional
-from ..models.parking_lot import ParkingLot
-from ..models.vehicle import Vehicle
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+from ..models.parking_lot import DuplicateRegistrationError, ParkingLot, fitting_sizes
+from ..models.reservations import ReservationBook
+from ..models.vehicle import Motorcycle, Vehicle
 from ..models.electric_vehicle import ElectricVehicle
+from ..models.parking_listener import ParkingListener
+from .distance_index import DistanceIndex
 
 
 class AllocationStrategy(ABC):
+    # Whether allocate may park in either pool (or keeps state across pools) whatever
+    # the caller meant; a thread-safe controller then holds both pool locks around it
+    spans_pools = True
+
     @abstractmethod
     def allocate(self, lot: ParkingLot, vehicle: Vehicle) -> Optional[int]:
         raise NotImplementedError
 
+    def allocate_many(self, lot: ParkingLot, vehicles: Sequence[Vehicle]) -> List[Optional[int]]:
+        # Fallback for strategies without a batched path: one allocate per vehicle
+        results: List[Optional[int]] = []
+        for vehicle in vehicles:
+            try:
+                results.append(self.allocate(lot, vehicle))
+            except DuplicateRegistrationError:
+                results.append(None)
+        return results
+
 
 class RegularFirstStrategy(AllocationStrategy):
+    spans_pools = False
+
     def allocate(self, lot: ParkingLot, vehicle: Vehicle) -> Optional[int]:
         return lot.park_regular(vehicle)
 
+    def allocate_many(self, lot: ParkingLot, vehicles: Sequence[Vehicle]) -> List[Optional[int]]:
+        return lot.park_regular_many(vehicles)
+
 
 class ElectricOnlyStrategy(AllocationStrategy):
+    spans_pools = False
+
     def allocate(self, lot: ParkingLot, vehicle: ElectricVehicle) -> Optional[int]:
         return lot.park_ev(vehicle)
+
+    def allocate_many(self, lot: ParkingLot, vehicles: Sequence[ElectricVehicle]) -> List[Optional[int]]:  # type: ignore[override]
+        return lot.park_ev_many(vehicles)
+
+
+class VehicleTypeStrategy(AllocationStrategy):
+    """EVs go to the EV pool and everything else to the regular pool.
+
+    One instance serves both park and park_ev, so callers no longer swap
+    strategies per vehicle.
+    """
+
+    def allocate(self, lot: ParkingLot, vehicle: Vehicle) -> Optional[int]:
+        if isinstance(vehicle, ElectricVehicle):
+            return lot.park_ev(vehicle)
+        return lot.park_regular(vehicle)
+
+
+class EVSpilloverStrategy(VehicleTypeStrategy):
+    """Like VehicleTypeStrategy, but an EV takes a regular slot once the EV pool is full.
+
+    The slot number alone does not say which pool was used; callers that need
+    it ask ``lot.find_by_registration``.
+    """
+
+    def allocate(self, lot: ParkingLot, vehicle: Vehicle) -> Optional[int]:
+        if isinstance(vehicle, ElectricVehicle):
+            slot = lot.park_ev(vehicle)
+            return slot if slot is not None else lot.park_regular(vehicle)
+        return lot.park_regular(vehicle)
+
+
+class NearestEntranceStrategy(AllocationStrategy):
+    """Parks each vehicle in the free slot of its pool closest to the entrance.
+
+    ``distance(is_ev, slot_number)`` gives each slot's distance; by default the
+    slots are laid out in a row with the entrance beside slot ``entrance``.
+    Distances are computed once per slot into a DistanceIndex per lot and pool.
+    On a lot with size classes a regular vehicle takes the nearest slot of the
+    smallest class it fits, then of each larger class in turn.
+    """
+
+    def __init__(self, distance: Optional[Callable[[bool, int], float]] = None, entrance: int = 1) -> None:
+        self.distance = distance or (lambda is_ev, slot_number: abs(slot_number - entrance))
+        self._indexes: Dict[Tuple[int, bool, str], DistanceIndex] = {}
+
+    def _index(self, lot: ParkingLot, is_ev: bool, role: str = "all", **subset: Any) -> DistanceIndex:
+        key = (id(lot), is_ev, role)
+        index = self._indexes.get(key)
+        if index is None or index.lot is not lot or index.stale:
+            index = self._indexes[key] = DistanceIndex(lot, is_ev, partial(self.distance, is_ev), **subset)
+        return index
+
+    @staticmethod
+    def _park_nearest(lot: ParkingLot, vehicle: Vehicle, is_ev: bool, index: DistanceIndex) -> Optional[int]:
+        slot_number = index.peek()
+        if slot_number is None or not lot.park_at(vehicle, is_ev, slot_number):
+            return None
+        return slot_number
+
+    def allocate(self, lot: ParkingLot, vehicle: Vehicle) -> Optional[int]:
+        is_ev = isinstance(vehicle, ElectricVehicle)
+        if is_ev or not lot.has_size_classes():
+            return self._park_nearest(lot, vehicle, is_ev, self._index(lot, is_ev))
+        for size in fitting_sizes(vehicle):
+            slot = self._park_nearest(lot, vehicle, False, self._index(lot, False, size, size=size))
+            if slot is not None:
+                return slot
+        return None
+
+
+class MotorcyclePackingStrategy(NearestEntranceStrategy):
+    """Packs motorcycles into the designated compact regular slots.
+
+    Motorcycles take the nearest compact slot and fall back to a standard one;
+    cars and trucks never take a compact slot. EVs use the nearest EV slot.
+    Without ``compact_slots`` the last ``compact_share`` of each lot's regular
+    slots are the compact bays. On a lot with size classes the small slots are
+    the compact bays and ``compact_slots`` is ignored: smallest-fit placement
+    already packs them.
+    """
+
+    def __init__(self, compact_slots: Optional[Iterable[int]] = None,
+                 distance: Optional[Callable[[bool, int], float]] = None, entrance: int = 1,
+                 compact_share: float = 0.2) -> None:
+        super().__init__(distance, entrance)
+        self.compact_slots = None if compact_slots is None else frozenset(compact_slots)
+        self.compact_share = compact_share
+        # id(lot) -> (regular capacity, compact bays derived from it)
+        self._derived: Dict[int, Tuple[int, FrozenSet[int]]] = {}
+
+    def _compact(self, lot: ParkingLot) -> FrozenSet[int]:
+        if self.compact_slots is not None:
+            return self.compact_slots
+        regular = lot.regular_capacity
+        derived = self._derived.get(id(lot))
+        if derived is None or derived[0] != regular:
+            derived = self._derived[id(lot)] = (
+                regular, frozenset(range(regular - int(regular * self.compact_share) + 1, regular + 1)))
+        return derived[1]
+
+    def allocate(self, lot: ParkingLot, vehicle: Vehicle) -> Optional[int]:
+        if isinstance(vehicle, ElectricVehicle) or lot.has_size_classes():
+            return super().allocate(lot, vehicle)
+        # create_lot leaves these indexes stale, so they are rebuilt around the new size's bays
+        compact_slots = self._compact(lot)
+        standard = self._index(lot, False, "standard", exclude=compact_slots)
+        if isinstance(vehicle, Motorcycle):
+            compact = self._index(lot, False, "compact", candidates=compact_slots)
+            slot = self._park_nearest(lot, vehicle, False, compact)
+            if slot is not None:
+                return slot
+        return self._park_nearest(lot, vehicle, False, standard)
+
+
+class ReservationStrategy(AllocationStrategy):
+    """Honours a lot's ReservationBook when vehicles arrive.
+
+    A vehicle with a booking covering the arrival time (opened
+    ``early_seconds`` early) takes its booked slot; if that slot is still
+    occupied, the rest of the booking moves to a slot that is free now. Any
+    other vehicle is a walk-in and takes the lowest free slot of its pool with
+    no booking in the next ``walk_in_hold`` seconds, so it does not block an
+    upcoming reservation.
+    """
+
+    def __init__(self, book: ReservationBook, walk_in_hold: float = 2 * 3600.0, early_seconds: float = 900.0) -> None:
+        self.book = book
+        self.walk_in_hold = walk_in_hold
+        self.early_seconds = early_seconds
+
+    def allocate(self, lot: ParkingLot, vehicle: Vehicle) -> Optional[int]:
+        book = self.book
+        now = book.clock()
+        reservation = book.reservation_at(vehicle.registration_number, now, self.early_seconds)
+        if reservation is not None:
+            if not lot.park_at(vehicle, reservation.is_ev, reservation.slot_number):
+                moved = book.move(reservation, now, vehicle)
+                if moved is None or not lot.park_at(vehicle, moved.is_ev, moved.slot_number):
+                    return None
+                reservation = moved
+            book.check_in(reservation)
+            return reservation.slot_number
+        is_ev = isinstance(vehicle, ElectricVehicle)
+        slot_number = book.find_slot(vehicle, now, now + self.walk_in_hold, is_ev, free_now=True)
+        if slot_number is None or not lot.park_at(vehicle, is_ev, slot_number):
+            return None
+        return slot_number
+
+
+@dataclass(frozen=True)
+class PartitionPlan:
+    """How many convertible slots serve EVs in each period of a day, repeating daily.
+
+    Period i covers seconds ``i * period_seconds`` onward from midnight UTC.
+    """
+
+    period_seconds: float
+    ev_slots: Tuple[int, ...]
+
+    def ev_slots_at(self, at: float) -> int:
+        return self.ev_slots[int(at // self.period_seconds) % len(self.ev_slots)]
+
+
+class _FreeConvertible(ParkingListener):
+    """Ranks (positions in the convertible list) of a lot's free convertible slots, kept sorted."""
+
+    def __init__(self, lot: ParkingLot, convertible: Sequence[int]) -> None:
+        self.lot = lot
+        # Set when create_lot detaches the tracker; the strategy then builds a new one
+        self.stale = False
+        self.rank = {slot_number: i for i, slot_number in enumerate(convertible)}
+        self.free = [i for i, slot_number in enumerate(convertible) if lot.vehicle_at(slot_number, False) is None]
+        lot.listeners.append(self)
+
+    def on_park(self, lot: ParkingLot, vehicle: Vehicle, is_ev: bool, slot_number: int) -> None:
+        rank = self.rank.get(slot_number)
+        if not is_ev and rank is not None:
+            del self.free[bisect.bisect_left(self.free, rank)]
+
+    def on_leave(self, lot: ParkingLot, vehicle: Vehicle, is_ev: bool, slot_number: int) -> None:
+        rank = self.rank.get(slot_number)
+        if not is_ev and rank is not None:
+            bisect.insort(self.free, rank)
+
+    def on_reset(self, lot: ParkingLot) -> None:
+        self.stale = True
+        lot.listeners.remove(self)
+
+
+class ConvertibleSlotsStrategy(AllocationStrategy):
+    """Shares convertible regular slots (fitted with chargers) between EVs and other vehicles.
+
+    At each park the plan says how many of the ``convertible`` slots, counted
+    from the front of the list, are in EV mode for the current period; the
+    lookup is one index into the plan. EVs use the EV pool first, then a free
+    EV-mode convertible slot. Other vehicles use the ordinary regular slots
+    first, then a free convertible slot in regular mode, taken from the back
+    of the list. A vehicle already parked when its slot changes mode stays
+    until it leaves, which is why plans are built ahead of demand. With no
+    plan every convertible slot is in regular mode.
+
+    ``on_reject`` is called with every vehicle that finds no slot, so a
+    forecaster can count demand the park stream never shows.
+    """
+
+    def __init__(self, convertible: Iterable[int] = (), plan: Optional[PartitionPlan] = None,
+                 clock: Callable[[], float] = time.time,
+                 on_reject: Optional[Callable[[Vehicle], None]] = None) -> None:
+        self.convertible = list(convertible)
+        self.plan = plan
+        self.clock = clock
+        self.on_reject = on_reject
+        self._ordinary = NearestEntranceStrategy(lambda is_ev, slot_number: slot_number)
+        self._free: Dict[int, _FreeConvertible] = {}
+
+    def _free_ranks(self, lot: ParkingLot) -> List[int]:
+        tracker = self._free.get(id(lot))
+        if tracker is None or tracker.lot is not lot or tracker.stale:
+            tracker = self._free[id(lot)] = _FreeConvertible(lot, self.convertible)
+        return tracker.free
+
+    def _park_ordinary(self, lot: ParkingLot, vehicle: Vehicle) -> Optional[int]:
+        """Lowest free regular slot outside the convertible list, smallest fitting class first."""
+        sizes: Sequence[Optional[str]] = fitting_sizes(vehicle) if lot.has_size_classes() else (None,)
+        for size in sizes:
+            index = self._ordinary._index(lot, False, f"ordinary-{size}", exclude=self.convertible, size=size)
+            slot = self._ordinary._park_nearest(lot, vehicle, False, index)
+            if slot is not None:
+                return slot
+        return None
+
+    def allocate(self, lot: ParkingLot, vehicle: Vehicle) -> Optional[int]:
+        ev_mode = self.plan.ev_slots_at(self.clock()) if self.plan is not None else 0
+        free = self._free_ranks(lot)
+        slot: Optional[int]
+        if isinstance(vehicle, ElectricVehicle):
+            slot = lot.park_ev(vehicle)
+            if slot is None and free and free[0] < ev_mode:
+                slot = self.convertible[free[0]]
+                if not lot.park_at(vehicle, False, slot):
+                    slot = None
+        else:
+            slot = self._park_ordinary(lot, vehicle)
+            if slot is None and free and free[-1] >= ev_mode:
+                slot = self.convertible[free[-1]]
+                if not lot.park_at(vehicle, False, slot):
+                    slot = None
+        if slot is None and self.on_reject is not None:
+            self.on_reject(vehicle)
+        return slot
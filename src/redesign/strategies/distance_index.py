@@ -0,0 +1,75 @@
+from __future__ import annotations
+import heapq
+from typing import Callable, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from ..models.parking_listener import ParkingListener
+from ..models.parking_lot import ParkingLot, ParkingSlot
+from ..models.vehicle import Vehicle
+
+
+class DistanceIndex(ParkingListener):
+    """Free slots of one lot pool in a heap ordered by (distance, slot_number).
+
+    Built once from the lot, then kept current as a listener: a leave pushes its
+    slot back. Parks are not removed eagerly; a taken slot is dropped when it
+    reaches the top, so finding the nearest free slot is O(log n) amortized.
+    create_lot detaches the index and marks it ``stale``; its owner then builds
+    a new one for the new layout.
+    ``candidates``/``exclude`` restrict the index to a subset of the pool, and
+    ``size`` to the slots of one size class.
+    """
+
+    def __init__(self, lot: ParkingLot, is_ev: bool, distance: Callable[[int], float],
+                 candidates: Optional[Iterable[int]] = None, exclude: Iterable[int] = (),
+                 size: Optional[str] = None) -> None:
+        self.lot = lot
+        self.is_ev = is_ev
+        self.distance = distance
+        self.size = size
+        self._candidates: Optional[FrozenSet[int]] = None if candidates is None else frozenset(candidates)
+        self._exclude: FrozenSet[int] = frozenset(exclude)
+        self._slots: Optional[Sequence[ParkingSlot]] = None
+        self._heap: List[Tuple[float, int]] = []
+        self.stale = False
+        lot.listeners.append(self)
+
+    def _pool(self) -> Sequence[ParkingSlot]:
+        return self.lot.ev_slots if self.is_ev else self.lot.regular_slots
+
+    def _wanted(self, slot_number: int) -> bool:
+        if self._candidates is not None and slot_number not in self._candidates:
+            return False
+        if self.size is not None and self.lot.slot_size(slot_number, self.is_ev) != self.size:
+            return False
+        return slot_number not in self._exclude
+
+    def _rebuild(self) -> None:
+        slots = self._slots = self._pool()
+        taken = {n for n, _ in self.lot.occupied(self.is_ev)}
+        self._heap = [
+            (self.distance(n), n) for n in range(1, len(slots) + 1) if n not in taken and self._wanted(n)
+        ]
+        heapq.heapify(self._heap)
+
+    def peek(self) -> Optional[int]:
+        """Nearest free slot number, or None; the slot stays free until parked."""
+        slots = self._pool()
+        # Rebuild after create_lot swapped the slots, or once stale entries dominate
+        if slots is not self._slots or len(self._heap) > 2 * len(slots) + 64:
+            self._rebuild()
+        heap = self._heap
+        while heap:
+            slot_number = heap[0][1]
+            if slots[slot_number - 1].is_empty():
+                return slot_number
+            heapq.heappop(heap)
+        return None
+
+    def on_leave(self, lot: ParkingLot, vehicle: Vehicle, is_ev: bool, slot_number: int) -> None:
+        if is_ev == self.is_ev and self._slots is not None and self._wanted(slot_number):
+            heapq.heappush(self._heap, (self.distance(slot_number), slot_number))
+
+    def on_reset(self, lot: ParkingLot) -> None:
+        self.stale = True
+        self._heap = []
+        lot.listeners.remove(self)
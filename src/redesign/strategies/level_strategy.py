@@ -0,0 +1,107 @@
+from __future__ import annotations
+import heapq
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Set, Tuple
+
+from ..models.garage import Garage
+from ..models.parking_listener import ParkingListener
+from ..models.parking_lot import ParkingLot
+from ..models.vehicle import Vehicle
+
+
+class LevelAllocationStrategy(ABC):
+    """Chooses the level of a Garage a vehicle parks on; returns (level, slot_number) or None."""
+
+    @abstractmethod
+    def allocate(self, garage: Garage, vehicle: Vehicle, is_ev: bool) -> Optional[Tuple[int, int]]:
+        raise NotImplementedError
+
+
+class FirstFitLevelStrategy(LevelAllocationStrategy):
+    def allocate(self, garage: Garage, vehicle: Vehicle, is_ev: bool) -> Optional[Tuple[int, int]]:
+        return garage.park_ev(vehicle) if is_ev else garage.park_regular(vehicle)  # type: ignore[arg-type]
+
+
+def _free(lot: ParkingLot, is_ev: bool) -> int:
+    return lot.free_ev_count() if is_ev else lot.free_regular_count()
+
+
+class _LevelLoad(ParkingListener):
+    """Max-heap of (free slots, level) per pool, refreshed by listeners on every level's lot.
+
+    Each park/leave pushes the level's new count; entries whose count no longer
+    matches the lot are stale and corrected when they reach the top.
+    """
+
+    def __init__(self, garage: Garage) -> None:
+        self.garage = garage
+        self._heaps: Dict[bool, List[Tuple[int, int]]] = {False: [], True: []}
+        self._levels: Set[int] = set()
+
+    def sync(self) -> None:
+        """Start tracking levels added to the garage since the last call."""
+        if len(self._levels) == len(self.garage.levels):
+            return
+        for level, lot in self.garage.levels.items():
+            if level not in self._levels:
+                self._levels.add(level)
+                lot.listeners.append(self)
+                self._push(lot, False)
+                self._push(lot, True)
+
+    def _push(self, lot: ParkingLot, is_ev: bool) -> None:
+        heap = self._heaps[is_ev]
+        if len(heap) > 4 * len(self._levels) + 64:
+            heap[:] = [(-_free(self.garage.levels[lvl], is_ev), lvl) for lvl in self._levels]
+            heapq.heapify(heap)
+        else:
+            heapq.heappush(heap, (-_free(lot, is_ev), lot.level))
+
+    def on_park(self, lot: ParkingLot, vehicle: Vehicle, is_ev: bool, slot_number: int) -> None:
+        self._push(lot, is_ev)
+
+    def on_leave(self, lot: ParkingLot, vehicle: Vehicle, is_ev: bool, slot_number: int) -> None:
+        self._push(lot, is_ev)
+
+    def emptiest(self, is_ev: bool) -> Optional[int]:
+        """Level with the most free slots of the pool (lowest level on ties), or None if all are full."""
+        heap = self._heaps[is_ev]
+        while heap:
+            neg_free, level = heap[0]
+            free = _free(self.garage.levels[level], is_ev)
+            if -neg_free == free:
+                return level if free else None
+            heapq.heapreplace(heap, (-free, level))
+        return None
+
+
+class BalancedLevelsStrategy(LevelAllocationStrategy):
+    """Parks on the level with the most free slots of the needed type, spreading load evenly.
+
+    Choosing the level is O(log levels) and parking on it O(log slots). If the
+    emptiest level has no bay the vehicle fits, the other levels with free
+    slots are tried from the emptiest down.
+    """
+
+    def __init__(self) -> None:
+        self._loads: Dict[int, _LevelLoad] = {}
+
+    def allocate(self, garage: Garage, vehicle: Vehicle, is_ev: bool) -> Optional[Tuple[int, int]]:
+        load = self._loads.get(id(garage))
+        if load is None or load.garage is not garage:
+            load = self._loads[id(garage)] = _LevelLoad(garage)
+        load.sync()
+        level = load.emptiest(is_ev)
+        if level is None:
+            return None
+        slot = garage.park_on_level(level, vehicle, is_ev)
+        if slot is not None:
+            return level, slot
+        others = sorted((-_free(lot, is_ev), lvl) for lvl, lot in garage.levels.items() if lvl != level)
+        for neg_free, lvl in others:
+            if not neg_free:
+                break
+            slot = garage.park_on_level(lvl, vehicle, is_ev)
+            if slot is not None:
+                return lvl, slot
+        return None
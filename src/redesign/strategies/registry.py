@@ -0,0 +1,67 @@
+"""Name -> factory registry for allocation strategies.
+
+Views, the CLI and benchmarks pick strategies by name; new strategies are
+added with register_strategy instead of editing each caller.
+"""
+from typing import Any, Callable, Dict, List
+
+from .allocation_strategy import (
+    AllocationStrategy,
+    ElectricOnlyStrategy,
+    EVSpilloverStrategy,
+    MotorcyclePackingStrategy,
+    NearestEntranceStrategy,
+    RegularFirstStrategy,
+    VehicleTypeStrategy,
+)
+from .level_strategy import BalancedLevelsStrategy, FirstFitLevelStrategy, LevelAllocationStrategy
+
+_LOT_STRATEGIES: Dict[str, Callable[..., AllocationStrategy]] = {
+    "regular_first": RegularFirstStrategy,
+    "electric_only": ElectricOnlyStrategy,
+    "by_type": VehicleTypeStrategy,
+    "ev_spillover": EVSpilloverStrategy,
+    "nearest_entrance": NearestEntranceStrategy,
+    "motorcycle_packing": MotorcyclePackingStrategy,
+}
+
+_LEVEL_STRATEGIES: Dict[str, Callable[..., LevelAllocationStrategy]] = {
+    "first_fit": FirstFitLevelStrategy,
+    "balanced": BalancedLevelsStrategy,
+}
+
+
+def register_strategy(name: str, factory: Callable[..., AllocationStrategy]) -> None:
+    if name in _LOT_STRATEGIES:
+        raise ValueError(f"Strategy {name} is already registered")
+    _LOT_STRATEGIES[name] = factory
+
+
+def register_level_strategy(name: str, factory: Callable[..., LevelAllocationStrategy]) -> None:
+    if name in _LEVEL_STRATEGIES:
+        raise ValueError(f"Level strategy {name} is already registered")
+    _LEVEL_STRATEGIES[name] = factory
+
+
+def create_strategy(name: str, **kwargs: Any) -> AllocationStrategy:
+    try:
+        factory = _LOT_STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown strategy: {name}") from None
+    return factory(**kwargs)
+
+
+def create_level_strategy(name: str, **kwargs: Any) -> LevelAllocationStrategy:
+    try:
+        factory = _LEVEL_STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown level strategy: {name}") from None
+    return factory(**kwargs)
+
+
+def strategy_names() -> List[str]:
+    return sorted(_LOT_STRATEGIES)
+
+
+def level_strategy_names() -> List[str]:
+    return sorted(_LEVEL_STRATEGIES)
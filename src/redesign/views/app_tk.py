@@ -2,11 +2,19 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 
 from src.redesign.controllers.parking_controller import ParkingController
-from src.redesign.models.parking_lot import ParkingLot
-from src.redesign.strategies.allocation_strategy import RegularFirstStrategy, ElectricOnlyStrategy
+from src.redesign.models.parking_lot import DuplicateRegistrationError, ParkingLot
+from src.redesign.strategies.allocation_strategy import VehicleTypeStrategy
 from src.redesign.factories.vehicle_factory import create_vehicle, create_electric
 import os
-from typing import Tuple
+from itertools import zip_longest
+from typing import List, Tuple
+
+# Output pane updates are batched and applied once per tick of this interval
+FLUSH_MS = 16
+# The output pane keeps only this many most recent lines
+OUTPUT_MAX_LINES = 2000
+# Rows the occupied-slot listing materializes; scrolling rewrites these in place
+LISTING_ROWS = 15
 
 
 class App:
@@ -16,8 +24,14 @@ class App:
         self.suppress_dialogs = bool(os.environ.get("APP_SUPPRESS_DIALOGS"))
         self.controller = ParkingController(
             lot=ParkingLot(level=1, regular_capacity=0, ev_capacity=0),
-            allocation_strategy=RegularFirstStrategy(),
+            allocation_strategy=VehicleTypeStrategy(),
         )
+        # Created up front so park/leave keep it current from the first event
+        self.status = self.controller.status_view()
+        self._pending_output: List[str] = []
+        self._listing_dirty = False
+        self._flush_scheduled = False
+        self.listing_top = 0
         # Use a simpler UI on older Tk (macOS system Python ships 8.5)
         if tk.TkVersion < 8.6:
             self._build_ui_simple()
@@ -79,15 +93,18 @@ class App:
             self.leave_ev = tk.BooleanVar(value=False)
             ttk.Checkbutton(frm, text="EV Slot", variable=self.leave_ev).grid(row=3, column=2, padx=(0,8))
             ttk.Button(frm, text="Leave", command=self._leave).grid(row=3, column=3, padx=8)
+            ttk.Button(frm, text="Status", command=self._status).grid(row=3, column=4, padx=8)
+            ttk.Button(frm, text="Next Page", command=self._status_next).grid(row=3, column=5, padx=8)
 
             # Output
-            self.text = tk.Text(frm, width=100, height=20)
+            self.text = tk.Text(frm, width=100, height=10)
             self.text.grid(row=4, column=0, columnspan=11, pady=10, sticky="nsew")
             self.text.insert(tk.END, "Ready. Click 'Create Lot' to begin.\n")
+            self._build_listing(frm).grid(row=5, column=0, columnspan=11, sticky="nsew")
 
             for i in range(11):
                 frm.grid_columnconfigure(i, weight=1)
-            for r in range(5):
+            for r in range(6):
                 frm.grid_rowconfigure(r, weight=0)
             frm.grid_rowconfigure(4, weight=1)
             self.root.grid_rowconfigure(0, weight=1)
@@ -153,10 +170,34 @@ class App:
         self.leave_ev = tk.BooleanVar(value=False)
         tk.Checkbutton(leave, text="EV Slot", font=("Arial", 11), variable=self.leave_ev).grid(row=0, column=2, padx=(0,10))
         tk.Button(leave, text="Leave", font=("Arial", 11), command=self._leave).grid(row=0, column=3, padx=6)
+        tk.Button(leave, text="Status", font=("Arial", 11), command=self._status).grid(row=0, column=4, padx=6)
+        tk.Button(leave, text="Next Page", font=("Arial", 11), command=self._status_next).grid(row=0, column=5, padx=6)
 
-        self.text = tk.Text(cont, width=100, height=20)
+        self.text = tk.Text(cont, width=100, height=10)
         self.text.pack(fill="both", expand=True, pady=(10,0))
         self.text.insert(tk.END, "Ready. Click 'Create Lot' to begin.\n")
+        self._build_listing(cont).pack(fill="both", pady=(10,0))
+
+    def _build_listing(self, parent: tk.Misc) -> tk.Misc:
+        """Occupied-slot listing that only ever holds LISTING_ROWS Treeview items.
+
+        The scrollbar is driven by hand against the status view model, so
+        scrolling through thousands of vehicles re-renders one screen of rows.
+        """
+        frame = ttk.Frame(parent)
+        columns = ("slot", "pool", "floor", "reg", "color", "make", "model")
+        self.tree = ttk.Treeview(frame, columns=columns, show="headings", height=LISTING_ROWS)
+        for col, title in zip(columns, ("Slot", "Type", "Floor", "Reg No.", "Color", "Make", "Model")):
+            self.tree.heading(col, text=title)
+            self.tree.column(col, width=90)
+        self.listing_scroll = ttk.Scrollbar(frame, orient="vertical", command=self._scroll_listing)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.listing_scroll.pack(side="right", fill="y")
+        self._listing_items = [self.tree.insert("", tk.END, values=()) for _ in range(LISTING_ROWS)]
+        self.tree.bind("<MouseWheel>", lambda e: self._scroll_listing("scroll", -1 if e.delta > 0 else 1, "units"))
+        self.tree.bind("<Button-4>", lambda e: self._scroll_listing("scroll", -1, "units"))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_listing("scroll", 1, "units"))
+        return frame
 
     def _create_lot(self) -> None:
         try:
@@ -168,6 +209,7 @@ class App:
             level, reg, ev = 1, 10, 4
         try:
             self.controller.create_lot(level, reg, ev)
+            self._listing_changed()
             msg = f"Created lot on level {level} with {reg} regular and {ev} ev slots"
             self._println(msg)
             if not self.suppress_dialogs:
@@ -189,16 +231,21 @@ class App:
         model = (self.model_var.get().strip() or "Corolla")
         color = (self.color_var.get().strip() or "Blue")
 
-        if self.is_ev.get():
-            veh = create_electric("bike" if self.is_bike.get() else "car", reg, make, model, color)
-            # temporarily switch to EV-only strategy for explicit park_ev if needed
-            self.controller.allocation_strategy = ElectricOnlyStrategy()
-            slot = self.controller.park_ev(veh)
-            # switch back to regular-first as default
-            self.controller.allocation_strategy = RegularFirstStrategy()
-        else:
-            veh = create_vehicle("motorcycle" if self.is_bike.get() else "car", reg, make, model, color)
-            slot = self.controller.park(veh)
+        try:
+            if self.is_ev.get():
+                veh = create_electric("bike" if self.is_bike.get() else "car", reg, make, model, color)
+                slot = self.controller.park_ev(veh)
+            else:
+                veh = create_vehicle("motorcycle" if self.is_bike.get() else "car", reg, make, model, color)
+                slot = self.controller.park(veh)
+        except DuplicateRegistrationError as e:
+            self._println(str(e))
+            if not self.suppress_dialogs:
+                try:
+                    messagebox.showwarning("Park", str(e))
+                except Exception:
+                    pass
+            return
 
         if slot is None:
             self._println("Sorry, parking is full for that type")
@@ -210,6 +257,7 @@ class App:
         else:
             msg = f"Allocated slot number: {slot}"
             self._println(msg)
+            self._listing_changed()
             if not self.suppress_dialogs:
                 try:
                     messagebox.showinfo("Park", msg)
@@ -231,6 +279,7 @@ class App:
         if ok:
             msg = f"Slot number {slot} is free"
             self._println(msg)
+            self._listing_changed()
             if not self.suppress_dialogs:
                 try:
                     messagebox.showinfo("Leave", msg)
@@ -245,9 +294,73 @@ class App:
                 except Exception:
                     pass
 
+    def _status(self) -> None:
+        self._println(self.status.summary())
+        self.listing_top = 0
+        self._listing_changed()
+
+    def _status_next(self) -> None:
+        self._scroll_listing("scroll", 1, "pages")
+
+    def _listing_total(self) -> int:
+        return self.status.occupied_count(False) + self.status.occupied_count(True)
+
+    def _scroll_listing(self, action: str, amount: object, unit: str = "units") -> None:
+        if action == "moveto":
+            self.listing_top = int(float(amount) * self._listing_total())  # type: ignore[arg-type]
+        else:
+            self.listing_top += int(amount) * (LISTING_ROWS if unit == "pages" else 1)  # type: ignore[call-overload]
+        self._listing_changed()
+
+    def _listing_changed(self) -> None:
+        self._listing_dirty = True
+        self._schedule_flush()
+
+    def _render_listing(self) -> None:
+        # Regular rows first, then EV rows; only the visible window is fetched
+        self._listing_dirty = False
+        regular = self.status.occupied_count(False)
+        total = self._listing_total()
+        top = self.listing_top = max(0, min(self.listing_top, total - LISTING_ROWS))
+        bottom = top + LISTING_ROWS
+        level = self.controller.lot.level
+        rows = [(slot, "Regular", v) for slot, v in self.status.rows(False, top, min(bottom, regular))]
+        if bottom > regular:
+            rows += [(slot, "EV", v) for slot, v in self.status.rows(True, max(0, top - regular), bottom - regular)]
+        for item, row in zip_longest(self._listing_items, rows):
+            if row is None:
+                self.tree.item(item, values=())
+            else:
+                slot, pool, v = row
+                self.tree.item(item, values=(slot, pool, level, v.registration_number, v.color, v.make, v.model))
+        if total:
+            self.listing_scroll.set(top / total, min(1.0, bottom / total))
+        else:
+            self.listing_scroll.set(0.0, 1.0)
+
     def _println(self, s: str) -> None:
-        self.text.insert(tk.END, s + "\n")
-        self.text.see(tk.END)
+        # Queued and written by _flush_ui, so a burst of messages costs one insert
+        self._pending_output.append(s)
+        self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.root.after(FLUSH_MS, self._flush_ui)
+
+    def _flush_ui(self) -> None:
+        self._flush_scheduled = False
+        if self._pending_output:
+            lines = self._pending_output[-OUTPUT_MAX_LINES:]
+            self._pending_output.clear()
+            self.text.insert(tk.END, "\n".join(lines) + "\n")
+            # Trim from the top so the pane stays a ring of the latest lines
+            excess = int(self.text.index("end-1c").split(".")[0]) - 1 - OUTPUT_MAX_LINES
+            if excess > 0:
+                self.text.delete("1.0", f"{excess + 1}.0")
+            self.text.see(tk.END)
+        if self._listing_dirty:
+            self._render_listing()
 
 
 def run() -> None:
@@ -0,0 +1,37 @@
+import pytest
+
+from src.redesign.controllers.parking_controller import ParkingController
+from src.redesign.factories.vehicle_factory import create_electric, create_vehicle
+from src.redesign.models.parking_lot import ParkingLot
+from src.redesign.strategies.allocation_strategy import ConvertibleSlotsStrategy, MotorcyclePackingStrategy
+
+
+def _vehicle(kind, reg):
+    return create_vehicle(kind, reg, "Make", "Model", "Blue")
+
+
+def test_motorcycle_packing_follows_create_lot_without_piling_up_listeners():
+    ctl = ParkingController(lot=ParkingLot(level=1, regular_capacity=0, ev_capacity=0),
+                            allocation_strategy=MotorcyclePackingStrategy(compact_share=0.5))
+    counts = set()
+    for regular in (4, 6, 8, 6, 4) * 3:
+        ctl.create_lot(1, regular, 1)
+        # The back half of the regular slots are the compact bays
+        assert ctl.park(_vehicle("motorcycle", "M1")) == regular // 2 + 1
+        assert ctl.park(_vehicle("car", "C1")) == 1
+        counts.add(len(ctl.lot.listeners))
+    assert len(counts) == 1
+
+
+@pytest.mark.parametrize("regular", (3, 5))
+def test_convertible_slots_follow_create_lot_without_piling_up_listeners(regular):
+    ctl = ParkingController(lot=ParkingLot(level=1, regular_capacity=0, ev_capacity=0),
+                            allocation_strategy=ConvertibleSlotsStrategy(convertible=[regular]))
+    counts = set()
+    for i in range(5):
+        ctl.create_lot(1, regular, 0)
+        assert ctl.park_ev(create_electric("car", f"E{i}", "Tesla", "Model 3", "White")) is None
+        parked = [ctl.park(_vehicle("car", f"C{i}-{n}")) for n in range(regular + 1)]
+        assert parked == list(range(1, regular + 1)) + [None]
+        counts.add(len(ctl.lot.listeners))
+    assert len(counts) == 1
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.redesign.factories.vehicle_factory import PERSISTED_KINDS, create_electric, create_vehicle  # noqa: E402
+from src.redesign.services.billing import EnergyTariff, RatePlan, RatingEngine, TicketBatch  # noqa: E402
+from src.redesign.services.repository import (  # noqa: E402
+    InMemoryParkingLotRepository, SqliteParkingLotRepository)
+
+
+def _batch(stays, kinds, energy):
+    n = len(stays)
+    return TicketBatch(
+        registration=[f"R{i}" for i in range(n)],
+        level=np.ones(n, dtype=np.int64),
+        is_ev=np.array([kind.startswith("ev_") for kind in kinds]),
+        kind=np.array([PERSISTED_KINDS.index(kind) for kind in kinds], dtype=np.uint8),
+        entered_at=np.full(n, 1000.0),
+        left_at=1000.0 + np.asarray(stays, dtype=float),
+        energy_kwh=np.asarray(energy, dtype=float),
+    )
+
+
+def test_batch_rating_matches_the_per_ticket_loop():
+    rng = random.Random(3)
+    engine = RatingEngine(
+        plans={"motorcycle": RatePlan(tiers=((0.0, 1.0),), daily_cap=None),
+               "truck": RatePlan(tiers=((0.0, 4.0), (1.0, 6.0)), grace_minutes=0, increment_minutes=60)},
+        tariff=EnergyTariff(price_per_kwh=0.4, session_fee=0.5),
+    )
+    edges = [0, 599, 600, 601, 900, 901, 7200, 7201, 86400, 86401, 3 * 86400 + 1]
+    stays = edges + [rng.expovariate(1 / 14400) for _ in range(2000)]
+    kinds = [rng.choice(PERSISTED_KINDS) for _ in stays]
+    energy = [rng.choice((0.0, rng.uniform(0, 60))) if kind.startswith("ev_") else 0.0 for kind in kinds]
+    batch = _batch(stays, kinds, energy)
+    charges = engine.price(batch)
+    expected = [engine.price_ticket(kind, batch.entered_at[i], batch.left_at[i], energy[i])
+                for i, kind in enumerate(kinds)]
+    assert charges.total.tolist() == pytest.approx(expected, abs=1e-9)
+
+
+def test_rate_plan_edges():
+    plan = RatePlan()
+    # Free within the grace period, then whole 15-minute increments
+    assert plan.fee(600) == 0.0
+    assert plan.fee(601) == 0.5
+    assert plan.fee(2 * 3600) == 4.0
+    assert plan.fee(2 * 3600 + 1) == 4.75
+    # The daily cap applies per day, and every full day costs the capped day
+    assert plan.fee(10 * 3600) == 24.0
+    assert plan.fee(20 * 3600) == 30.0
+    assert plan.fee(86400) == 30.0
+    assert plan.fee(86400 + 3600) == 32.0
+    assert plan.fees(np.array([600.0, 601.0, 86400 + 3600])).tolist() == [0.0, 0.5, 32.0]
+    with pytest.raises(ValueError):
+        RatePlan(tiers=((1.0, 2.0),))
+
+
+@pytest.mark.parametrize("backend", ("memory", "sqlite"))
+def test_rates_the_repository_tickets_closed_in_a_window(backend, tmp_path):
+    if backend == "memory":
+        repo = InMemoryParkingLotRepository()
+    else:
+        repo = SqliteParkingLotRepository(str(tmp_path / "lots.db"), batch_size=100, max_delay=None)
+    truck = create_vehicle("truck", "T1", "Ford", "F-150", "Black")
+    ev = create_electric("car", "E1", "Tesla", "Model 3", "White")
+    repo.record_park(1, False, 1, truck, 0.0)
+    repo.record_park(1, True, 1, ev, 600.0)
+    repo.record_leave(1, False, 1, "T1", 3 * 3600.0)
+    repo.add_energy("E1", 12.5)
+    repo.record_leave(1, True, 1, "E1", 5 * 3600.0)
+    # A later visit of the same EV is still open and gets its own energy
+    repo.record_park(1, True, 1, ev, 6 * 3600.0)
+    repo.add_energy("E1", 4.0)
+    batch = TicketBatch.from_tickets(repo.closed_tickets(since=3600.0, until=86400.0))
+    assert batch.registration == ["T1", "E1"]
+    assert batch.kind.tolist() == [PERSISTED_KINDS.index("truck"), PERSISTED_KINDS.index("ev_car")]
+    assert batch.energy_kwh.tolist() == [0.0, 12.5]
+    engine = RatingEngine()
+    expected = [engine.price_ticket("truck", 0.0, 3 * 3600.0), engine.price_ticket("ev_car", 600.0, 5 * 3600.0, 12.5)]
+    assert engine.price(batch).total.tolist() == pytest.approx(expected)
+    assert [t.registration_number for t in repo.closed_tickets(until=4 * 3600.0)] == ["T1"]
+    assert [t.energy_kwh for t in repo.tickets("E1")] == [12.5, 4.0]
+    repo.close()
@@ -0,0 +1,141 @@
+import os
+import random
+import threading
+
+import pytest
+
+from src.redesign.controllers.concurrent_controller import ConcurrentParkingController
+from src.redesign.factories.vehicle_factory import create_electric, create_vehicle
+from src.redesign.models.parking_listener import ParkingListener
+from src.redesign.models.parking_lot import ParkingLot
+from src.redesign.services.event_log import WriteAheadLog, _segments, read_snapshot, recover
+from src.redesign.strategies.allocation_strategy import RegularFirstStrategy
+
+
+def _state(lot):
+    return {(is_ev, slot): (v.registration_number, v.get_type())
+            for is_ev in (False, True) for slot, v in lot.occupied(is_ev)}
+
+
+def _churn(lot, events, seed):
+    rng = random.Random(seed)
+    for i in range(events):
+        occupied = [(is_ev, slot) for is_ev in (False, True) for slot, _ in lot.occupied(is_ev)]
+        if occupied and rng.random() < 0.4:
+            is_ev, slot = rng.choice(occupied)
+            lot.leave(slot, is_ev)
+        elif rng.random() < 0.2:
+            lot.park_ev(create_electric("car", f"E{seed}-{i}", "Tesla", "Model 3", "White"))
+        else:
+            kind = rng.choice(("car", "motorcycle", "truck"))
+            lot.park_regular(create_vehicle(kind, f"R{seed}-{i}", "Toyota", "Corolla", "Blue"))
+
+
+def test_recover_replays_segments_after_the_snapshot(tmp_path):
+    lot = ParkingLot(level=2, regular_capacity=20, ev_capacity=5, small_capacity=4, large_capacity=3)
+    wal = WriteAheadLog(str(tmp_path), fsync="always", snapshot_every=0)
+    wal.attach(lot)
+    _churn(lot, 200, seed=1)
+    # Crash: no close(), the open segment is recovered as written
+    recovered = recover(str(tmp_path))
+    assert _state(recovered) == _state(lot)
+    assert (recovered.level, recovered.size_capacities()) == (2, (4, 3))
+    assert recovered.free_by_size() == lot.free_by_size()
+    wal.close()
+
+
+def test_recover_across_snapshots_and_segment_rollover(tmp_path):
+    lot = ParkingLot(level=1, regular_capacity=30, ev_capacity=10)
+    wal = WriteAheadLog(str(tmp_path), fsync="always", snapshot_every=25)
+    wal.attach(lot)
+    _churn(lot, 300, seed=2)
+    wal._snapshotter.join()
+    # Earlier segments were superseded by a later snapshot and removed
+    assert read_snapshot(str(tmp_path))[1] == _segments(str(tmp_path))[0] > 1
+    assert _state(recover(str(tmp_path))) == _state(lot)
+    # Records after the last snapshot, in a segment it does not cover
+    _churn(lot, 10, seed=3)
+    assert _state(recover(str(tmp_path))) == _state(lot)
+    wal.close()
+
+
+def test_recover_stops_at_a_torn_record(tmp_path):
+    lot = ParkingLot(level=1, regular_capacity=10, ev_capacity=2)
+    wal = WriteAheadLog(str(tmp_path), fsync="always", snapshot_every=0)
+    wal.attach(lot)
+    _churn(lot, 30, seed=4)
+    expected = _state(lot)
+    last = os.path.join(str(tmp_path), f"wal-{_segments(str(tmp_path))[-1]:06d}.log")
+    wal.close()
+    with open(last, "ab") as f:
+        f.write(b"\x20\x00\x01\x02")
+    assert _state(recover(str(tmp_path))) == expected
+    # A new log on the directory starts its own segment after the torn one
+    reopened = recover(str(tmp_path))
+    wal = WriteAheadLog(str(tmp_path), fsync="always", snapshot_every=0)
+    wal.attach(reopened)
+    _churn(reopened, 20, seed=5)
+    assert _state(recover(str(tmp_path))) == _state(reopened)
+    wal.close()
+
+
+def test_recover_after_reset_uses_the_new_layout(tmp_path):
+    lot = ParkingLot(level=1, regular_capacity=10, ev_capacity=2)
+    wal = WriteAheadLog(str(tmp_path), fsync="always", snapshot_every=0)
+    wal.attach(lot)
+    _churn(lot, 30, seed=6)
+    lot.reset(3, 4, 1)
+    lot.park_regular(create_vehicle("car", "N1", "Honda", "Civic", "Red"))
+    recovered = recover(str(tmp_path))
+    assert (recovered.level, len(recovered.regular_slots), len(recovered.ev_slots)) == (3, 4, 1)
+    assert _state(recovered) == {(False, 1): ("N1", "Car")}
+    wal.close()
+
+
+class _HoldEVParks(ParkingListener):
+    """Stalls an EV park after the slot is taken and before later listeners log it."""
+
+    def __init__(self):
+        self.held = threading.Event()
+        self.release = threading.Event()
+
+    def on_park(self, lot, vehicle, is_ev, slot_number):
+        if is_ev:
+            self.held.set()
+            assert self.release.wait(5)
+
+
+def test_snapshot_waits_for_a_park_in_flight_in_the_other_pool(tmp_path):
+    ctl = ConcurrentParkingController(lot=ParkingLot(level=1, regular_capacity=10, ev_capacity=2),
+                                      allocation_strategy=RegularFirstStrategy())
+    hold = _HoldEVParks()
+    ctl.lot.listeners.append(hold)
+    wal = WriteAheadLog(str(tmp_path), fsync="always", snapshot_every=3)
+    wal.attach(ctl.lot, quiesced=ctl.quiesced)
+    ctl.park(create_vehicle("car", "A1", "Toyota", "Corolla", "Blue"))
+    gate = threading.Thread(target=ctl.park_ev, args=(create_electric("car", "E1", "Tesla", "Model 3", "White"),))
+    gate.start()
+    assert hold.held.wait(5)
+    # The third record is due a snapshot while E1 holds a slot but is not logged yet
+    ctl.park(create_vehicle("car", "A2", "Toyota", "Corolla", "Blue"))
+    ctl.park(create_vehicle("car", "A3", "Toyota", "Corolla", "Blue"))
+    hold.release.set()
+    gate.join()
+    wal._snapshotter.join()
+    ctl.leave(1, True)
+    assert _state(recover(str(tmp_path))) == _state(ctl.lot)
+    wal.close()
+
+
+def test_replaying_a_leave_of_an_empty_slot_is_divergence(tmp_path):
+    lot = ParkingLot(level=1, regular_capacity=2, ev_capacity=0)
+    wal = WriteAheadLog(str(tmp_path), fsync="none", snapshot_every=0)
+    wal.attach(lot)
+    car = create_vehicle("car", "A1", "Toyota", "Corolla", "Blue")
+    lot.park_regular(car)
+    lot.leave(1, False)
+    # A second leave record for the same slot, as a diverged log would have
+    wal.on_leave(lot, car, False, 1)
+    wal.close()
+    with pytest.raises(ValueError, match="diverged"):
+        recover(str(tmp_path))
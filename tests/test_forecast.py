@@ -0,0 +1,45 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.redesign.factories.vehicle_factory import create_electric, create_vehicle  # noqa: E402
+from src.redesign.services.forecast import DAY, EV, REGULAR, DemandForecaster  # noqa: E402
+
+HOUR = 3600.0
+
+
+def test_late_events_count_on_their_own_day_and_never_clear_today():
+    now = [10 * DAY + 9 * HOUR]
+    forecaster = DemandForecaster(period_seconds=HOUR, days=3, alpha=1.0, clock=lambda: now[0])
+    car = create_vehicle("car", "A1", "Toyota", "Corolla", "Blue")
+    forecaster.record_rejected(car)
+    forecaster.record_rejected(create_electric("car", "E1", "Tesla", "Model 3", "White"))
+    # A late report from yesterday lands on yesterday's row, and today's counts survive it
+    now[0] = 9 * DAY + 8 * HOUR
+    forecaster.record_rejected(car)
+    # Older than the three-day window: dropped
+    now[0] = 7 * DAY + 8 * HOUR
+    forecaster.record_rejected(car)
+    now[0] = 11 * DAY
+    forecaster.record_rejected(car)
+    # With alpha 1 the forecast is yesterday (day 10) alone
+    arrivals = forecaster.arrivals()
+    assert arrivals[9].tolist() == [1.0, 1.0] and arrivals.sum() == 2.0
+    assert DemandForecaster(period_seconds=HOUR, days=3, alpha=1.0).arrivals().sum() == 0.0
+
+
+def test_days_skipped_without_arrivals_leave_the_window():
+    now = [0.0]
+    forecaster = DemandForecaster(period_seconds=HOUR, days=3, alpha=0.5, clock=lambda: now[0])
+    car = create_vehicle("car", "A1", "Toyota", "Corolla", "Blue")
+    for day in (0, 1):
+        now[0] = day * DAY + 8 * HOUR
+        forecaster.record_rejected(car)
+    now[0] = 6 * DAY + 8 * HOUR
+    forecaster.record_rejected(car)
+    # Days 0 and 1 are five and six days old; nothing in the last three days is complete
+    assert forecaster.arrivals().sum() == 0.0
+    now[0] = 5 * DAY + 10 * HOUR
+    forecaster.record_rejected(car)
+    arrivals = forecaster.arrivals()
+    assert arrivals[10, REGULAR] == 1.0 and arrivals[:, EV].sum() == 0.0
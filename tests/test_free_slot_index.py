@@ -0,0 +1,65 @@
+import random
+
+from src.redesign.factories.vehicle_factory import create_vehicle
+from src.redesign.models.free_slot_index import BitmapFreeIndex, FreeSlotIndex
+from src.redesign.models.parking_lot import ParkingLot
+
+
+def _linear_scan(taken, start, stop):
+    """The original allocation: first slot in range that is not taken."""
+    return next((i for i in range(start, stop) if not taken[i]), None)
+
+
+def test_indexes_match_linear_scan():
+    rng = random.Random(1)
+    for start, stop in ((0, 100), (3, 61), (8, 16), (5, 6)):
+        taken = [False] * 100
+        heap = FreeSlotIndex(range(start, stop))
+        bitmap = BitmapFreeIndex(bytearray(13), start, stop)
+        for _ in range(2000):
+            expected = _linear_scan(taken, start, stop)
+            assert heap.peek() == bitmap.peek() == expected
+            assert len(heap) == len(bitmap) == sum(not taken[i] for i in range(start, stop))
+            op = rng.random()
+            if op < 0.45 and expected is not None:
+                assert heap.pop() == bitmap.pop() == expected
+                taken[expected] = True
+            elif op < 0.6:
+                free = [i for i in range(start, stop) if not taken[i]]
+                if free:
+                    idx = rng.choice(free)
+                    heap.discard(idx)
+                    bitmap.discard(idx)
+                    taken[idx] = True
+            elif op < 0.7:
+                count = rng.randrange(5)
+                expected_run = [i for i in range(start, stop) if not taken[i]][:count]
+                assert heap.pop_many(count) == bitmap.pop_many(count) == expected_run
+                for idx in expected_run:
+                    taken[idx] = True
+            else:
+                used = [i for i in range(start, stop) if taken[i]]
+                if used:
+                    idx = rng.choice(used)
+                    heap.push(idx)
+                    bitmap.push(idx)
+                    taken[idx] = False
+
+
+def test_lot_parks_on_lowest_free_slot():
+    rng = random.Random(2)
+    for compact in (False, True):
+        lot = ParkingLot(level=1, regular_capacity=50, ev_capacity=0, compact=compact)
+        parked = {}
+        for i in range(1000):
+            if parked and rng.random() < 0.45:
+                slot = rng.choice(sorted(parked))
+                assert lot.leave(slot, False)
+                del parked[slot]
+                continue
+            expected = next((n for n in range(1, 51) if lot.regular_slots[n - 1].is_empty()), None)
+            slot = lot.park_regular(create_vehicle("car", f"C{i}", "Toyota", "Corolla", "Blue"))
+            assert slot == expected
+            if slot is not None:
+                parked[slot] = True
+        assert lot.free_regular_count() == 50 - len(parked)
@@ -0,0 +1,17 @@
+from src.redesign.factories.vehicle_factory import create_vehicle
+from src.redesign.models.garage import Garage
+from src.redesign.strategies.level_strategy import BalancedLevelsStrategy
+
+
+def test_balanced_falls_through_to_a_level_with_a_fitting_bay():
+    garage = Garage()
+    garage.add_level(1, 6, 0, small_capacity=5)
+    garage.add_level(2, 3, 0, large_capacity=1)
+    garage.add_level(3, 2, 0, large_capacity=1)
+    strategy = BalancedLevelsStrategy()
+    # Level 1 is the emptiest but has no large bay; level 2 is the next emptiest
+    assert strategy.allocate(garage, create_vehicle("truck", "T1", "Ford", "F-150", "Black"), False) == (2, 3)
+    assert strategy.allocate(garage, create_vehicle("truck", "T2", "Ford", "F-150", "Black"), False) == (3, 2)
+    assert strategy.allocate(garage, create_vehicle("truck", "T3", "Ford", "F-150", "Black"), False) is None
+    assert garage.find_by_registration("T3") is None
+    assert strategy.allocate(garage, create_vehicle("car", "C1", "Toyota", "Corolla", "Blue"), False) == (1, 6)
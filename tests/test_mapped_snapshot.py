@@ -0,0 +1,110 @@
+import random
+
+import pytest
+
+from src.redesign.factories.vehicle_factory import create_electric, create_vehicle
+from src.redesign.models.parking_lot import DuplicateRegistrationError, ParkingLot
+
+
+def _state(lot):
+    return {(is_ev, slot): (v.registration_number, v.get_type(), v.make, v.model, v.color)
+            for is_ev in (False, True) for slot, v in lot.occupied(is_ev)}
+
+
+def _filled_lot(compact):
+    lot = ParkingLot(level=4, regular_capacity=40, ev_capacity=9, compact=compact,
+                     small_capacity=6, large_capacity=5)
+    for i in range(30):
+        kind = ("car", "motorcycle", "truck")[i % 3]
+        lot.park_regular(create_vehicle(kind, f"R{i}", "Ford", f"M{i % 4}", ("Blue", "Red")[i % 2]))
+    lot.park_ev(create_electric("car", "E1", "Tesla", "Model 3", "Whîte"))
+    lot.park_ev(create_electric("bike", "E2", "Zero", "SR", "Black"))
+    for slot in (2, 9, 17):
+        lot.leave(slot, False)
+    lot.leave(1, True)
+    return lot
+
+
+@pytest.mark.parametrize("compact", (False, True))
+def test_open_snapshot_round_trips_the_lot(tmp_path, compact):
+    lot = _filled_lot(compact)
+    path = str(tmp_path / "lot.map")
+    lot.save_snapshot(path)
+    opened = ParkingLot.open_snapshot(path)
+    assert (opened.level, len(opened.regular_slots), len(opened.ev_slots)) == (4, 40, 9)
+    assert opened.size_capacities() == (6, 5)
+    assert _state(opened) == _state(lot)
+    assert opened.free_by_size() == lot.free_by_size()
+    assert (opened.free_regular_count(), opened.free_ev_count()) == (lot.free_regular_count(), lot.free_ev_count())
+    assert opened.find_by_registration("R4") == lot.find_by_registration("R4")
+    assert opened.slots_with("color", "Red") == lot.slots_with("color", "Red")
+    # Saving the opened lot again gives the same lot back
+    again = str(tmp_path / "again.map")
+    opened.save_snapshot(again)
+    assert _state(ParkingLot.open_snapshot(again)) == _state(lot)
+
+
+def test_opened_lot_keeps_parking_without_touching_the_file(tmp_path):
+    path = str(tmp_path / "lot.map")
+    _filled_lot(compact=True).save_snapshot(path)
+    with open(path, "rb") as f:
+        before = f.read()
+    opened = ParkingLot.open_snapshot(path)
+    with pytest.raises(DuplicateRegistrationError):
+        opened.park_regular(create_vehicle("car", "R5", "Ford", "M1", "Blue"))
+    assert opened.park_regular(create_vehicle("car", "N1", "Honda", "Civic", "Red")) == 9
+    assert opened.leave(1, False)
+    assert opened.park_ev(create_electric("car", "E3", "Kia", "EV6", "Grey")) == 1
+    with open(path, "rb") as f:
+        assert f.read() == before
+    assert _state(ParkingLot.open_snapshot(path)) == _state(_filled_lot(compact=True))
+
+
+def test_registration_lookups_on_an_opened_lot_decode_nothing(tmp_path):
+    path = str(tmp_path / "lot.map")
+    lot = _filled_lot(compact=True)
+    lot.save_snapshot(path)
+    opened = ParkingLot.open_snapshot(path)
+    assert opened.find_by_registration("R7") == lot.find_by_registration("R7")
+    assert opened.find_by_registration("E2") == (True, 2)
+    assert opened.find_by_registration("R4") is None
+    with pytest.raises(DuplicateRegistrationError):
+        opened.park_ev(create_electric("car", "R7", "Tesla", "Model 3", "White"))
+    # A vehicle that left the file's slot is gone, even when its slot is reused
+    assert opened.leave(1, False)
+    assert opened.find_by_registration("R1") is None
+    assert opened.park_regular(create_vehicle("motorcycle", "N1", "Honda", "CBR", "Red")) == 1
+    assert opened.find_by_registration("R1") is None
+    assert opened.find_by_registration("N1") == (False, 1)
+    assert opened.park_regular(create_vehicle("motorcycle", "R1", "Honda", "CBR", "Red")) == 2
+    assert opened.find_by_registration("R1") == (False, 2)
+    assert opened.park_regular_many([create_vehicle("car", reg, "Kia", "Rio", "Grey") for reg in ("R5", "N2", "N2")]) \
+        == [None, 9, None]
+    assert not opened._indexed
+    assert opened.leave(9, False) and opened.find_by_registration("N2") is None
+    # Building the attribute indexes keeps the registrations in step
+    red = opened.slots_with("color", "Red")
+    assert {(False, 1), (False, 2)} <= red
+    assert opened.find_by_registration("R1") == (False, 2)
+    assert opened.find_by_registration("R7") == lot.find_by_registration("R7")
+
+
+def test_opened_lot_matches_a_loaded_lot_under_churn(tmp_path):
+    rng = random.Random(8)
+    path = str(tmp_path / "lot.map")
+    _filled_lot(compact=True).save_snapshot(path)
+    opened, loaded = ParkingLot.open_snapshot(path), ParkingLot.open_snapshot(path)
+    loaded.ensure_indexes()
+    regs = [f"R{i}" for i in range(30)] + [f"N{i}" for i in range(30)] + ["E1", "E2"]
+    for _ in range(400):
+        reg = rng.choice(regs)
+        found = loaded.find_by_registration(reg)
+        assert opened.find_by_registration(reg) == found
+        if found is not None:
+            assert opened.leave(found[1], found[0]) == loaded.leave(found[1], found[0])
+        else:
+            kind = rng.choice(("car", "motorcycle", "truck"))
+            assert (opened.park_regular(create_vehicle(kind, reg, "Make", "Model", "Blue"))
+                    == loaded.park_regular(create_vehicle(kind, reg, "Make", "Model", "Blue")))
+    assert not opened._indexed
+    assert _state(opened) == _state(loaded)
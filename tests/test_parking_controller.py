@@ -0,0 +1,52 @@
+from src.redesign.controllers.concurrent_controller import ConcurrentParkingController
+from src.redesign.controllers.parking_controller import ParkingController
+from src.redesign.factories.vehicle_factory import create_electric, create_vehicle
+from src.redesign.models.parking_lot import ParkingLot
+from src.redesign.services.status_view import StatusViewModel
+from src.redesign.strategies.allocation_strategy import VehicleTypeStrategy
+
+
+def _controller(cls=ParkingController):
+    return cls(lot=ParkingLot(level=1, regular_capacity=0, ev_capacity=0), allocation_strategy=VehicleTypeStrategy())
+
+
+def test_create_lot_again_replaces_the_layout():
+    for cls in (ParkingController, ConcurrentParkingController):
+        ctl = _controller(cls)
+        ctl.create_lot(1, 5, 2)
+        ctl.park(create_vehicle("car", "A1", "Toyota", "Corolla", "Blue"))
+        ctl.park_ev(create_electric("car", "E1", "Tesla", "Model 3", "White"))
+
+        ctl.create_lot(2, 3, 1, small_capacity=1)
+        lot = ctl.lot
+        assert lot.level == 2
+        assert (len(lot.regular_slots), len(lot.ev_slots)) == (3, 1)
+        assert (lot.free_regular_count(), lot.free_ev_count()) == (3, 1)
+        assert lot.find_by_registration("A1") is None
+        assert not lot.slots_with("color", "Blue")
+        assert lot.free_by_size() == {"small": 1, "medium": 2, "large": 0}
+        assert [ctl.park(create_vehicle("car", f"B{i}", "Honda", "Civic", "Red")) for i in range(3)] == [2, 3, None]
+
+
+def test_create_lot_keeps_listeners():
+    ctl = _controller()
+    status = ctl.status_view()
+    ctl.create_lot(1, 4, 0)
+    ctl.create_lot(1, 2, 0)
+    ctl.park(create_vehicle("car", "A1", "Toyota", "Corolla", "Blue"))
+    assert status in ctl.lot.listeners
+    assert ctl.lot.find_by_registration("A1") == (False, 1)
+
+
+def test_status_view_follows_a_reset_of_its_lot():
+    lot = ParkingLot(level=1, regular_capacity=3, ev_capacity=1)
+    status = StatusViewModel()
+    status.attach(lot)
+    lot.park_regular(create_vehicle("car", "A1", "Toyota", "Corolla", "Blue"))
+    lot.park_ev(create_electric("car", "E1", "Tesla", "Model 3", "White"))
+    assert (status.occupied_count(False), status.occupied_count(True)) == (1, 1)
+    lot.reset(2, 2, 0)
+    assert (status.occupied_count(False), status.occupied_count(True)) == (0, 0)
+    assert status.type_counts() == {} and status.page(False) == []
+    lot.park_regular(create_vehicle("car", "B1", "Honda", "Civic", "Red"))
+    assert status.summary().startswith("Level 2: 1/2 regular slots occupied, 0/0 ev slots occupied")
@@ -0,0 +1,95 @@
+import sqlite3
+
+import pytest
+
+from src.redesign.controllers.parking_controller import ParkingController
+from src.redesign.factories.vehicle_factory import create_vehicle
+from src.redesign.models.parking_lot import ParkingLot
+from src.redesign.services.repository import InMemoryParkingLotRepository, SqliteParkingLotRepository
+from src.redesign.strategies.allocation_strategy import VehicleTypeStrategy
+
+
+def _car(reg):
+    return create_vehicle("car", reg, "Toyota", "Corolla", "Blue")
+
+
+def _controller(repo, level, regular=3):
+    ctl = ParkingController(lot=ParkingLot(level=level, regular_capacity=0, ev_capacity=0),
+                            allocation_strategy=VehicleTypeStrategy(), repository=repo)
+    ctl.create_lot(level, regular, 1)
+    return ctl
+
+
+@pytest.fixture(params=("memory", "sqlite"))
+def repo(request, tmp_path):
+    if request.param == "memory":
+        yield InMemoryParkingLotRepository()
+    else:
+        repo = SqliteParkingLotRepository(str(tmp_path / "lots.db"), batch_size=100, max_delay=None)
+        yield repo
+        repo.close()
+
+
+def test_recreating_the_lot_closes_its_open_tickets(repo):
+    ctl = _controller(repo, 1)
+    ctl.park(_car("A1"))
+    ctl.park(_car("A2"))
+    ctl.leave(2, False)
+    ctl.create_lot(1, 3, 1)
+    assert repo.tickets("A1")[0].left_at is not None
+    ctl.park(_car("B1"))
+    assert repo.tickets("B1")[0].left_at is None
+    ctl.leave(1, False)
+    assert [t.left_at is not None for t in repo.tickets("B1")] == [True]
+    # A1's ticket kept the time the lot was re-created
+    assert repo.tickets("A1")[0].left_at <= repo.tickets("B1")[0].left_at
+
+
+def test_saving_the_lot_keeps_tickets_of_vehicles_still_parked(repo):
+    ctl = _controller(repo, 1)
+    ctl.park(_car("A1"))
+    ctl.park(_car("A2"))
+    repo.save_lot(ctl.lot)
+    assert [t.left_at for t in repo.tickets("A1") + repo.tickets("A2")] == [None, None]
+    ctl.leave(1, False)
+    ctl.park(_car("A1"))
+    assert [t.left_at is None for t in repo.tickets("A1")] == [False, True]
+    assert repo.find_by_registration("A1") == (1, False, 1)
+
+
+def test_constraint_violation_is_set_aside_and_later_writes_go_through(tmp_path):
+    repo = SqliteParkingLotRepository(str(tmp_path / "lots.db"), batch_size=100, max_delay=None)
+    first, second = _controller(repo, 1), _controller(repo, 2)
+    first.park(_car("A1"))
+    # Each level's lot only knows its own plates, so the same plate reaches the UNIQUE index
+    second.park(_car("A1"))
+    second.park(_car("B1"))
+    repo.flush()
+    assert [(sql.split()[0], params[:3]) for sql, params, _ in repo.dead_letters] == [("INSERT", (2, False, 1))]
+    assert repo.find_by_registration("A1") == (1, False, 1)
+    assert repo.find_by_registration("B1") == (2, False, 2)
+    first.leave(1, False)
+    first.park(_car("C1"))
+    assert repo.find_by_registration("A1") is None
+    assert repo.find_by_registration("C1") == (1, False, 1)
+    assert len(repo.dead_letters) == 1
+    repo.close()
+
+
+def test_transient_failure_keeps_the_batch_pending(tmp_path):
+    path = str(tmp_path / "lots.db")
+    repo = SqliteParkingLotRepository(path, batch_size=100, max_delay=None)
+    ctl = _controller(repo, 1)
+    other = sqlite3.connect(path)
+    other.execute("ALTER TABLE tickets RENAME TO tickets_away")
+    other.commit()
+    ctl.park(_car("A1"))
+    with pytest.raises(sqlite3.OperationalError):
+        repo.flush()
+    other.execute("ALTER TABLE tickets_away RENAME TO tickets")
+    other.commit()
+    other.close()
+    assert repo.find_by_registration("A1") == (1, False, 1)
+    assert [t.slot_number for t in repo.tickets("A1")] == [1]
+    assert repo.dead_letters == []
+    repo.close()
@@ -0,0 +1,114 @@
+import random
+
+import pytest
+
+from src.redesign.factories.vehicle_factory import create_electric, create_vehicle
+from src.redesign.models.parking_lot import ParkingLot, fitting_sizes
+from src.redesign.models.reservations import ReservationBook
+
+HOUR = 3600.0
+
+
+def _car(reg):
+    return create_vehicle("car", reg, "Toyota", "Corolla", "Blue")
+
+
+def _book(regular=3, ev=1, **sizes):
+    return ReservationBook(ParkingLot(level=1, regular_capacity=regular, ev_capacity=ev, **sizes), clock=lambda: 0.0)
+
+
+def test_adjacent_windows_share_a_slot_and_overlaps_do_not():
+    book = _book()
+    assert book.reserve(_car("A"), 0, 2 * HOUR).slot_number == 1
+    # Half-open windows: ending when the next starts is no conflict
+    assert book.reserve(_car("B"), 2 * HOUR, 3 * HOUR).slot_number == 1
+    assert book.reserve(_car("C"), 3 * HOUR - 1, 4 * HOUR).slot_number == 2
+    assert book.reserve(_car("D"), 2 * HOUR - 1, 2 * HOUR).slot_number == 2
+    assert book.reserve(_car("E"), 2 * HOUR - 1, 3 * HOUR).slot_number == 3
+    assert book.reserve(_car("X"), 2 * HOUR - 1, 2 * HOUR + 1) is None
+    # Windows inside a bucket and across bucket boundaries
+    assert book.reserve(_car("F"), 4 * HOUR, 4 * HOUR + 60).slot_number == 1
+    assert book.reserve(_car("G"), 4 * HOUR + 60, 5 * HOUR + 1).slot_number == 1
+    with pytest.raises(ValueError):
+        book.reserve(_car("H"), HOUR, HOUR)
+
+
+def test_explicit_slot_must_fit_and_be_free():
+    book = _book(regular=4, small_capacity=1, large_capacity=1)
+    truck = create_vehicle("truck", "T", "Ford", "F-150", "Black")
+    assert book.reserve(truck, 0, HOUR, slot_number=2) is None
+    assert book.reserve(_car("A"), 0, HOUR, slot_number=1) is None
+    assert book.reserve(_car("B"), 0, HOUR, slot_number=9) is None
+    assert book.reserve(truck, 0, HOUR).slot_number == 4
+    assert book.reserve(create_vehicle("truck", "T2", "Ford", "F-150", "Black"), 0, HOUR) is None
+    assert book.reserve(_car("C"), 0, HOUR, slot_number=3).slot_number == 3
+    assert book.reserve(_car("D"), 0, HOUR, slot_number=3) is None
+    # EVs book the EV pool, whatever their size
+    assert book.reserve(create_electric("car", "E", "Tesla", "Model 3", "White"), 0, HOUR).slot_number == 1
+
+
+def test_cancel_and_prune_release_the_window():
+    book = _book(regular=1, ev=0)
+    first = book.reserve(_car("A"), 0, HOUR)
+    second = book.reserve(_car("B"), HOUR, 2 * HOUR)
+    assert book.reserve(_car("C"), 30 * 60, 90 * 60) is None
+    assert book.cancel(first.reservation_id) and not book.cancel(first.reservation_id)
+    assert book.reserve(_car("C"), 0, 30 * 60) is not None
+    # The remaining booking still blocks its bucket
+    assert book.reserve(_car("D"), HOUR + 60, HOUR + 120) is None
+    assert book.prune(before=2 * HOUR) == 2
+    assert book.get(second.reservation_id) is None and len(book) == 0
+    assert book.reserve(_car("D"), HOUR + 60, HOUR + 120).slot_number == 1
+
+
+def test_find_slot_matches_a_slot_by_slot_check():
+    rng = random.Random(5)
+    lot = ParkingLot(level=1, regular_capacity=12, ev_capacity=3, small_capacity=3, large_capacity=2)
+    book = ReservationBook(lot, bucket_seconds=600.0)
+    windows = {n: [] for n in range(1, 13)}
+    made = []
+    for i in range(600):
+        vehicle = create_vehicle(rng.choice(("car", "motorcycle", "truck")), f"V{i}", "Make", "Model", "Red")
+        start = rng.uniform(0, 24 * HOUR)
+        end = start + rng.choice((1.0, 600.0, rng.uniform(60, 4 * HOUR)))
+        if made and rng.random() < 0.2:
+            cancelled = made.pop(rng.randrange(len(made)))
+            assert book.cancel(cancelled.reservation_id)
+            windows[cancelled.slot_number].remove((cancelled.start, cancelled.end))
+        expected = next((n for size in fitting_sizes(vehicle) for n in range(1, 13)
+                         if lot.slot_size(n) == size and all(e <= start or end <= s for s, e in windows[n])), None)
+        reservation = book.reserve(vehicle, start, end)
+        assert (reservation.slot_number if reservation else None) == expected
+        if reservation is not None:
+            windows[expected].append((start, end))
+            made.append(reservation)
+
+
+def test_slots_past_the_first_mask_block_are_booked_and_found():
+    book = _book(regular=1200, ev=0)
+    for n in range(1, 1100):
+        assert book.reserve(_car(f"A{n}"), 0, HOUR, slot_number=n) is not None
+    assert book.reserve(_car("B"), 30 * 60, 2 * HOUR).slot_number == 1100
+    # Slots booked in a partly covered end bucket get the per-slot check, in every block
+    assert book.reserve(_car("C"), 0, 10 * 60).slot_number == 1100
+    assert book.reserve(_car("D"), 0, 40 * 60).slot_number == 1101
+    assert book.reserve(_car("E"), HOUR, 70 * 60).slot_number == 1
+    assert book.cancel(book.reservations_for("A1000")[0].reservation_id)
+    assert book.find_slot(_car("F"), 0, HOUR) == 1000
+    assert book.reserve(_car("G"), 0, HOUR, slot_number=1201) is None
+
+
+def test_create_lot_reads_the_new_layout_and_drops_bookings_past_it():
+    lot = ParkingLot(level=1, regular_capacity=4, ev_capacity=1)
+    book = ReservationBook(lot, clock=lambda: 0.0)
+    lot.park_regular(_car("P1"))
+    kept = book.reserve(_car("A"), 0, HOUR, slot_number=2)
+    dropped = book.reserve(_car("B"), 0, HOUR, slot_number=4)
+    assert book.find_slot(_car("W"), 2 * HOUR, 3 * HOUR, free_now=True) == 2
+    lot.reset(1, 3, 1, small_capacity=1)
+    assert book.get(kept.reservation_id) == kept and book.get(dropped.reservation_id) is None
+    # The parked car went with the old layout, and motorcycles now take the small bay first
+    assert book.find_slot(_car("W"), 2 * HOUR, 3 * HOUR, free_now=True) == 2
+    assert book.find_slot(create_vehicle("motorcycle", "M", "Honda", "CBR", "Red"), 0, HOUR) == 1
+    assert book.find_slot(_car("X"), 0, HOUR) == 3
+    assert book.reserve(_car("Y"), 0, HOUR, slot_number=4) is None
@@ -0,0 +1,17 @@
+import pytest
+
+from src.redesign.services.simulator import Constant, SimulationConfig, build_controller, simulate
+
+
+@pytest.mark.parametrize("strategy", ("regular_first", "electric_only", "ev_spillover"))
+def test_departures_free_the_pool_the_vehicle_was_parked_in(strategy):
+    # One arrival an hour staying 1.5 h never needs more than two slots, so nothing is
+    # rejected as long as each departure frees the slot the vehicle actually took
+    config = SimulationConfig(regular_capacity=2, ev_capacity=2, strategy=strategy, interarrival=Constant(1.0),
+                              dwell=Constant(1.5), mix=(("car", 0.5), ("ev_car", 0.5)), hours=50, seed=3)
+    controller = build_controller(config)
+    result = simulate(config, controller)
+    assert (result.arrivals, result.rejected, result.peak_occupied) == (50, 0, 2)
+    lot = controller.lot
+    # The arrivals at hours 49 and 50 are still parked when the run ends
+    assert lot.free_regular_count() + lot.free_ev_count() == 2
@@ -0,0 +1,61 @@
+import pytest
+
+from src.redesign.factories.vehicle_factory import create_electric, create_vehicle
+from src.redesign.models.parking_lot import ParkingLot
+
+
+def _vehicle(kind, reg):
+    return create_vehicle(kind, reg, "Make", "Model", "Blue")
+
+
+@pytest.mark.parametrize("compact", (False, True))
+def test_each_class_takes_the_smallest_bay_it_fits(compact):
+    # Slots 1-2 small, 3-5 medium, 6-7 large
+    lot = ParkingLot(level=1, regular_capacity=7, ev_capacity=1, compact=compact,
+                     small_capacity=2, large_capacity=2)
+    assert [lot.slot_size(n) for n in range(1, 8)] == ["small"] * 2 + ["medium"] * 3 + ["large"] * 2
+    assert lot.park_regular(_vehicle("truck", "T1")) == 6
+    assert lot.park_regular(_vehicle("car", "C1")) == 3
+    assert lot.park_regular(_vehicle("motorcycle", "M1")) == 1
+    # An electric bike is small too, even on the regular pool
+    assert lot.park_regular(create_electric("bike", "B1", "Make", "Model", "Blue")) == 2
+    assert lot.free_by_size() == {"small": 0, "medium": 2, "large": 1}
+
+
+@pytest.mark.parametrize("compact", (False, True))
+def test_full_classes_overflow_upwards_only(compact):
+    lot = ParkingLot(level=1, regular_capacity=4, ev_capacity=0, compact=compact,
+                     small_capacity=1, large_capacity=1)
+    assert [lot.park_regular(_vehicle("motorcycle", f"M{i}")) for i in range(4)] == [1, 2, 3, 4]
+    lot.leave(1, False)
+    lot.leave(2, False)
+    # A car never takes a small bay, a truck never a medium one
+    assert lot.park_regular(_vehicle("truck", "T1")) is None
+    assert lot.park_regular(_vehicle("car", "C1")) == 2
+    assert lot.park_regular(_vehicle("car", "C2")) is None
+    assert lot.free_by_size() == {"small": 1, "medium": 0, "large": 0}
+    assert lot.free_regular_count() == 1
+
+
+def test_park_at_checks_the_bay_size():
+    lot = ParkingLot(level=1, regular_capacity=5, ev_capacity=0, small_capacity=2, large_capacity=1)
+    assert not lot.park_at(_vehicle("car", "C1"), False, 1)
+    assert not lot.park_at(_vehicle("truck", "T1"), False, 4)
+    assert lot.park_at(_vehicle("motorcycle", "M1"), False, 5)
+    assert lot.free_by_size() == {"small": 2, "medium": 2, "large": 0}
+    # The class index no longer hands out the slot park_at took
+    assert lot.park_regular(_vehicle("truck", "T2")) is None
+
+
+def test_batch_parking_uses_the_size_classes():
+    lot = ParkingLot(level=1, regular_capacity=6, ev_capacity=0, small_capacity=2, large_capacity=1)
+    kinds = ["truck", "car", "motorcycle", "truck", "car", "motorcycle", "motorcycle"]
+    slots = lot.park_regular_many([_vehicle(kind, f"V{i}") for i, kind in enumerate(kinds)])
+    assert slots == [6, 3, 1, None, 4, 2, 5]
+    assert lot.free_by_size() == {"small": 0, "medium": 0, "large": 0}
+
+
+def test_unsized_lot_takes_any_vehicle_in_slot_order():
+    lot = ParkingLot(level=1, regular_capacity=3, ev_capacity=0)
+    assert not lot.has_size_classes() and lot.free_by_size() == {}
+    assert [lot.park_regular(_vehicle(kind, kind)) for kind in ("truck", "motorcycle", "car")] == [1, 2, 3]